@@ -0,0 +1,76 @@
+"""Add partial indexes matching the dashboard metric predicates
+
+Revision ID: j7k8l9m0n1o2
+Revises: i6j7k8l9m0n1
+Create Date: 2026-10-17
+
+Changes:
+- documents: partial indexes whose WHERE clauses mirror the status filters
+  used by DashboardService, so the metric COUNTs can be answered from a small
+  index instead of scanning the whole table:
+    * processed_at for COMPLETED/FAILED rows (success rates)
+    * processed_at for COMPLETED rows (24h throughput, completion trends)
+    * created_at for PENDING rows (queue depth)
+    * created_at for QUEUED rows (oldest queued document)
+    * id for COMPLETED rows with ai_analysis / search_vector populated
+      (AI analysis and embedding coverage rates)
+- ANALYZE documents so the planner picks the new indexes up immediately.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "j7k8l9m0n1o2"
+down_revision = "i6j7k8l9m0n1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_terminal_processed_at",
+        "documents",
+        ["processed_at"],
+        postgresql_where=sa.text("status IN ('COMPLETED', 'FAILED')"),
+    )
+    op.create_index(
+        "idx_completed_processed_at",
+        "documents",
+        ["processed_at"],
+        postgresql_where=sa.text("status = 'COMPLETED'"),
+    )
+    op.create_index(
+        "idx_pending_created_at",
+        "documents",
+        ["created_at"],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+    op.create_index(
+        "idx_queued_created_at",
+        "documents",
+        ["created_at"],
+        postgresql_where=sa.text("status = 'QUEUED'"),
+    )
+    op.create_index(
+        "idx_completed_with_analysis",
+        "documents",
+        ["id"],
+        postgresql_where=sa.text("status = 'COMPLETED' AND ai_analysis IS NOT NULL"),
+    )
+    op.create_index(
+        "idx_completed_with_embedding",
+        "documents",
+        ["id"],
+        postgresql_where=sa.text("status = 'COMPLETED' AND search_vector IS NOT NULL"),
+    )
+    op.execute("ANALYZE documents")
+
+
+def downgrade() -> None:
+    op.drop_index("idx_completed_with_embedding", table_name="documents")
+    op.drop_index("idx_completed_with_analysis", table_name="documents")
+    op.drop_index("idx_queued_created_at", table_name="documents")
+    op.drop_index("idx_pending_created_at", table_name="documents")
+    op.drop_index("idx_completed_processed_at", table_name="documents")
+    op.drop_index("idx_terminal_processed_at", table_name="documents")
@@ -0,0 +1,34 @@
+"""Add GIN index on documents.ai_analysis
+
+Revision ID: k8l9m0n1o2p3
+Revises: j7k8l9m0n1o2
+Create Date: 2026-10-17
+
+Changes:
+- documents: GIN index (default jsonb_ops) on ai_analysis so key-existence
+  checks such as ai_analysis ? 'error' can be answered from the index.
+  ai_analysis and keywords are already JSONB (see the initial squashed
+  migration) and keywords already has idx_documents_keywords, so no column
+  type change is needed.
+"""
+
+from alembic import op
+
+
+revision = "k8l9m0n1o2p3"
+down_revision = "j7k8l9m0n1o2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_documents_ai_analysis",
+        "documents",
+        ["ai_analysis"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_documents_ai_analysis", table_name="documents")
@@ -0,0 +1,38 @@
+"""Add pg_trgm trigram index for filename substring search
+
+Revision ID: l9m0n1o2p3q4
+Revises: k8l9m0n1o2p3
+Create Date: 2026-10-17
+
+Changes:
+- Enable the pg_trgm extension.
+- documents: GIN trigram index on lower(filename) so
+  DocumentService.search_documents_by_text's LIKE '%term%' filename match
+  uses an index instead of scanning every row. Document text is matched
+  through ts_vector (idx_documents_ts_vector), so no trigram index is built
+  over search_content.
+  Built CONCURRENTLY (outside the migration transaction) so writes are not
+  blocked while the index is created on a populated table.
+"""
+
+from alembic import op
+
+
+revision = "l9m0n1o2p3q4"
+down_revision = "k8l9m0n1o2p3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_filename_trgm
+            ON documents USING gin (lower(filename) gin_trgm_ops)
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_documents_filename_trgm")
@@ -0,0 +1,38 @@
+"""Add partial index for failed-document listings
+
+Revision ID: m0n1o2p3q4r5
+Revises: l9m0n1o2p3q4
+Create Date: 2026-10-17
+
+Changes:
+- documents: partial index on updated_at for FAILED rows, serving
+  DocumentService.get_failed_documents (status = 'FAILED' ORDER BY
+  updated_at DESC LIMIT n). Failed documents are a small slice of the table,
+  so this index stays far smaller than idx_status_updated.
+- get_stuck_documents (status = 'PROCESSING' AND updated_at < cutoff ORDER BY
+  updated_at DESC) is already served by idx_status_updated on
+  (status, updated_at), which btree can scan backwards, so no new composite
+  index is added for it.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "m0n1o2p3q4r5"
+down_revision = "l9m0n1o2p3q4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_failed_updated_at",
+        "documents",
+        [sa.text("updated_at DESC")],
+        postgresql_where=sa.text("status = 'FAILED'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_failed_updated_at", table_name="documents")
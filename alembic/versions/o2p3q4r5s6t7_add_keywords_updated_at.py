@@ -0,0 +1,45 @@
+"""Add keywords_updated_at to documents
+
+Revision ID: o2p3q4r5s6t7
+Revises: m0n1o2p3q4r5
+Create Date: 2026-10-17
+
+Changes:
+- documents: add keywords_updated_at (nullable DateTime with timezone). It is
+  set to the database's now() whenever Document.set_keywords /
+  set_keywords_data write keywords, replacing the Python-side
+  extraction_timestamp string that was stored inside the keywords JSON.
+- Backfill keywords_updated_at from keywords->>'extraction_timestamp'
+  (naive UTC isoformat strings) for existing rows. The legacy key is left in
+  place inside the JSON.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "o2p3q4r5s6t7"
+down_revision = "m0n1o2p3q4r5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "documents",
+        sa.Column(
+            "keywords_updated_at",
+            sa.DateTime(timezone=True),
+            nullable=True,
+        ),
+    )
+    op.execute("""
+        UPDATE documents
+        SET keywords_updated_at =
+            (keywords->>'extraction_timestamp')::timestamp AT TIME ZONE 'UTC'
+        WHERE keywords ? 'extraction_timestamp'
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column("documents", "keywords_updated_at")
@@ -0,0 +1,32 @@
+"""Make documents.file_path unique
+
+Revision ID: p3q4r5s6t7u8
+Revises: o2p3q4r5s6t7
+Create Date: 2026-10-17
+
+Changes:
+- documents: unique constraint on file_path. DocumentService.create_document
+  inserts with ON CONFLICT (file_path) DO UPDATE so a retried upload of the
+  same stored file returns the existing row; the conflict target needs a
+  unique index. Stored paths are uuid4-based (StorageService.save_file,
+  Dropbox ingest), so existing rows are not expected to collide.
+  The name matches Postgres' default for Column(unique=True).
+"""
+
+from alembic import op
+
+
+revision = "p3q4r5s6t7u8"
+down_revision = "o2p3q4r5s6t7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_unique_constraint(
+        "documents_file_path_key", "documents", ["file_path"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("documents_file_path_key", "documents", type_="unique")
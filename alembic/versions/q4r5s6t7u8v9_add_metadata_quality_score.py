@@ -0,0 +1,45 @@
+"""Add documents.metadata_quality_score generated column
+
+Revision ID: q4r5s6t7u8v9
+Revises: p3q4r5s6t7u8
+Create Date: 2026-10-17
+
+Changes:
+- documents.metadata_quality_score: STORED generated column holding the mean
+  of date/client/state confidence (HIGH=1.0, MEDIUM=0.5, otherwise 0.0).
+  DashboardService.get_data_quality used to evaluate three CASE expressions
+  per row on every request; it now averages this column. Postgres keeps it
+  current whenever a confidence column changes.
+- Adding a STORED generated column rewrites the documents table once.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "q4r5s6t7u8v9"
+down_revision = "p3q4r5s6t7u8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "documents",
+        sa.Column(
+            "metadata_quality_score",
+            sa.Float(),
+            sa.Computed(
+                "(CASE date_confidence WHEN 'HIGH' THEN 1.0 WHEN 'MEDIUM' THEN 0.5 ELSE 0.0 END"
+                " + CASE client_confidence WHEN 'HIGH' THEN 1.0 WHEN 'MEDIUM' THEN 0.5 ELSE 0.0 END"
+                " + CASE state_confidence WHEN 'HIGH' THEN 1.0 WHEN 'MEDIUM' THEN 0.5 ELSE 0.0 END"
+                ") / 3.0",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("documents", "metadata_quality_score")
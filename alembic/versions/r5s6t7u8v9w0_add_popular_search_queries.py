@@ -0,0 +1,42 @@
+"""Add popular_search_queries materialized view for top search terms
+
+Revision ID: r5s6t7u8v9w0
+Revises: q4r5s6t7u8v9
+Create Date: 2026-10-17
+
+Changes:
+- popular_search_queries: materialized view holding the 500 most frequent
+  search_queries.query values with their counts. SearchService.get_top_queries
+  reads from here instead of grouping the whole search_queries log on every
+  cache miss. The view is refreshed every five minutes by the refresh-rollups
+  Render cron job (jobs/refresh_rollups.py).
+- A unique index on query is required for REFRESH MATERIALIZED VIEW CONCURRENTLY.
+"""
+
+from alembic import op
+
+
+revision = "r5s6t7u8v9w0"
+down_revision = "q4r5s6t7u8v9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE MATERIALIZED VIEW popular_search_queries AS
+        SELECT query, COUNT(*) AS count
+        FROM search_queries
+        GROUP BY query
+        ORDER BY count DESC
+        LIMIT 500
+    """)
+    op.execute(
+        "CREATE UNIQUE INDEX idx_popular_search_queries_query "
+        "ON popular_search_queries (query)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_popular_search_queries_query")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS popular_search_queries")
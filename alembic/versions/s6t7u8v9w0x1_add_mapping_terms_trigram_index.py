@@ -0,0 +1,47 @@
+"""Add a trigram index over keyword mapping terms
+
+Revision ID: s6t7u8v9w0x1
+Revises: r5s6t7u8v9w0
+Create Date: 2026-10-17
+
+Changes:
+- documents: GIN trigram index on the lower-cased JSON text of every
+  keywords.keyword_mappings entry's verbatim_term and mapped_canonical_term
+  (search_service.KEYWORD_MAPPING_TERMS_TEXT; the two expressions must stay
+  identical for the planner to use it). The canonical-term filter in
+  SearchService.search and search_by_verbatim_term prefilter with
+  LIKE '%term%' on this expression, then confirm the field-level match with
+  jsonb_path_exists, instead of evaluating like_regex against every
+  COMPLETED document's keywords.
+- Built CONCURRENTLY (outside the migration transaction) so writes are not
+  blocked. pg_trgm is already enabled by l9m0n1o2p3q4.
+"""
+
+from alembic import op
+
+
+revision = "s6t7u8v9w0x1"
+down_revision = "r5s6t7u8v9w0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_mapping_terms_trgm
+            ON documents USING gin (
+                lower(
+                    (
+                        jsonb_path_query_array(keywords, '$.keyword_mappings[*].verbatim_term'::jsonpath)
+                        || jsonb_path_query_array(keywords, '$.keyword_mappings[*].mapped_canonical_term'::jsonpath)
+                    )::text
+                ) gin_trgm_ops
+            )
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_documents_mapping_terms_trgm")
@@ -0,0 +1,48 @@
+"""Add documents.mapping_count generated column
+
+Revision ID: t7u8v9w0x1y2
+Revises: s6t7u8v9w0x1
+Create Date: 2026-10-17
+
+Changes:
+- documents.mapping_count: STORED generated column holding the length of
+  keywords.keyword_mappings (0 when absent). Search can now sort by it with
+  sort_by=mapping_count, and DashboardService's keyword mapping success rate
+  compares it instead of casting keywords->>'mapping_count' on every row.
+- idx_status_mapping_count on (status, mapping_count) serves the sort within
+  the COMPLETED filter.
+- Adding a STORED generated column rewrites the documents table once.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "t7u8v9w0x1y2"
+down_revision = "s6t7u8v9w0x1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "documents",
+        sa.Column(
+            "mapping_count",
+            sa.Integer(),
+            sa.Computed(
+                "CASE WHEN jsonb_typeof(keywords -> 'keyword_mappings') = 'array'"
+                " THEN jsonb_array_length(keywords -> 'keyword_mappings') ELSE 0 END",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "idx_status_mapping_count", "documents", ["status", "mapping_count"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_status_mapping_count", table_name="documents")
+    op.drop_column("documents", "mapping_count")
@@ -0,0 +1,39 @@
+"""Add a trigram index on lower(client_canonical)
+
+Revision ID: u8v9w0x1y2z3
+Revises: t7u8v9w0x1y2
+Create Date: 2026-10-17
+
+Changes:
+- documents: GIN trigram index on lower(client_canonical). The review
+  screen's document lookup (/review/search) matches '%q%' against
+  lower(filename) and lower(client_canonical); with this index and the
+  existing idx_documents_filename_trgm both sides of the OR are index scans
+  instead of a sequential scan of documents.
+- Built CONCURRENTLY (outside the migration transaction) so writes are not
+  blocked. pg_trgm is already enabled by l9m0n1o2p3q4.
+"""
+
+from alembic import op
+
+
+revision = "u8v9w0x1y2z3"
+down_revision = "t7u8v9w0x1y2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_client_canonical_trgm
+            ON documents USING gin (lower(client_canonical) gin_trgm_ops)
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS idx_documents_client_canonical_trgm"
+        )
@@ -90,11 +90,13 @@ async def search_documents(
         if doc_id:
             query = query.filter(Document.id == doc_id)
         else:
-            like = f"%{q}%"
+            # lower(col) LIKE rather than ILIKE: it matches the expressions
+            # the pg_trgm GIN indexes are built on, so '%q%' needs no seq scan
+            like = f"%{q.lower()}%"
             query = query.filter(
                 or_(
-                    Document.filename.ilike(like),
-                    Document.client_canonical.ilike(like),
+                    sa_func.lower(Document.filename).like(like),
+                    sa_func.lower(Document.client_canonical).like(like),
                 )
             )
 
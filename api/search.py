@@ -56,6 +56,7 @@ async def search_documents(
 
         allowed_sort_fields = [
             "relevance", "created_at", "updated_at", "filename", "file_size",
+            "mapping_count",
         ]
         if sort_by not in allowed_sort_fields:
             sort_by = "relevance"
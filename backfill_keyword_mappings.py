@@ -21,8 +21,19 @@ async def backfill_keyword_mappings():
     try:
         logger.info("Starting backfill process for keyword mappings...")
 
-        # Get all documents that might need backfilling
-        documents_to_process = db.query(Document).all()
+        # Only the two mapping lists are needed, so project them instead of
+        # hydrating every Document (extracted_text, embeddings, ...). Fetched
+        # up front rather than streamed with yield_per: update_document_content
+        # commits, which would invalidate a server-side cursor.
+        documents_to_process = (
+            db.query(
+                Document.id,
+                Document.keywords["keyword_mappings"].label("existing_mappings"),
+                Document.ai_analysis["keyword_mappings"].label("keyword_mappings"),
+            )
+            .filter(Document.ai_analysis.has_key("keyword_mappings"))
+            .all()
+        )
 
         if not documents_to_process:
             logger.info("No documents found to process.")
@@ -33,21 +44,18 @@ async def backfill_keyword_mappings():
         processed_count = 0
         for doc in documents_to_process:
             # Check if mappings are already present
-            if doc.keywords and doc.keywords.get("keyword_mappings"):
+            if doc.existing_mappings:
                 continue
 
             # Extract mappings from ai_analysis
-            if doc.ai_analysis and "keyword_mappings" in doc.ai_analysis:
-                keyword_mappings = doc.ai_analysis.get("keyword_mappings", [])
-
-                if keyword_mappings:
-                    # Update the document with the extracted mappings
-                    await doc_service.update_document_content(
-                        document_id=doc.id,
-                        keyword_mappings=keyword_mappings,
-                    )
-                    processed_count += 1
-                    logger.info(f"Backfilled mappings for document ID: {doc.id}")
+            if doc.keyword_mappings:
+                # Update the document with the extracted mappings
+                await doc_service.update_document_content(
+                    document_id=doc.id,
+                    keyword_mappings=doc.keyword_mappings,
+                )
+                processed_count += 1
+                logger.info(f"Backfilled mappings for document ID: {doc.id}")
 
         logger.info(
             f"Backfill process completed. {processed_count} documents were updated."
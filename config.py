@@ -21,6 +21,10 @@ class Settings(BaseSettings):
 
     # Database settings
     database_url: str = "sqlite:///./documents.db"
+    # psycopg server-side prepare threshold (executions before a statement is
+    # prepared). 0 prepares on first use; set to None when running behind a
+    # transaction-pooling PgBouncer, which cannot share prepared statements.
+    database_prepare_threshold: int | None = 0
 
     # Celery and Redis
     redis_url: str = "redis://localhost:6379/0"
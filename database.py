@@ -11,6 +11,18 @@ from config import get_settings
 
 settings = get_settings()
 
+
+def _engine_url(database_url: str) -> str:
+    """
+    Route plain PostgreSQL URLs through psycopg (v3) so statements can be
+    prepared server-side. URLs that already name a driver are left untouched.
+    """
+    for scheme in ("postgres://", "postgresql://"):
+        if database_url.startswith(scheme):
+            return "postgresql+psycopg://" + database_url[len(scheme) :]
+    return database_url
+
+
 # Create engine based on database URL
 if settings.database_url.startswith("sqlite"):
     # SQLite specific configuration
@@ -22,9 +34,17 @@ if settings.database_url.startswith("sqlite"):
     )
 else:
     # PostgreSQL or other databases with optimized connection pooling
+    engine_url = _engine_url(settings.database_url)
+    connect_args = {}
+    if engine_url.startswith("postgresql+psycopg://"):
+        # psycopg keeps prepared plans per connection, so pooled connections
+        # reuse them across requests instead of re-planning identical SQL.
+        connect_args["prepare_threshold"] = settings.database_prepare_threshold
+
     engine = create_engine(
-        settings.database_url,
+        engine_url,
         echo=settings.debug,
+        connect_args=connect_args,
         pool_size=15,  # Number of connections to maintain in pool
         max_overflow=25,  # Additional connections beyond pool_size
         pool_pre_ping=True,  # Verify connections before use
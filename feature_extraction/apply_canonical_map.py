@@ -18,8 +18,10 @@ Usage:
 
 import re
 import csv
+import heapq
 import argparse
 from collections import defaultdict
+from operator import itemgetter
 
 # ---------------------------------------------------------------------------
 # STATE LOOKUP (for party normalization)
@@ -280,7 +282,7 @@ def run(csv_path, map_path, db_url=None, push=False):
     print(f"  (vs {sum(1 for r in rows if r.get('client_clean_v1'))} unique clean names)")
 
     print(f"\n  Top 15 canonical clients by document count:")
-    for name, count in sorted(canonical_freq.items(), key=lambda x: -x[1])[:15]:
+    for name, count in heapq.nlargest(15, canonical_freq.items(), key=itemgetter(1)):
         print(f"    [{count:4d}]  {name}")
 
     # Preview CSV
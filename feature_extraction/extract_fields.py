@@ -460,13 +460,31 @@ HEADER_STATE_PATTERNS = [
 ]
 
 
+# All state names in one alternation, so the text is scanned once rather than
+# once per state. Longest first: "West Virginia" must win over "Virginia".
+STATE_NAME_REGEX = re.compile(
+    r'\b(?:'
+    + '|'.join(re.escape(name) for name in sorted(STATE_NAME_TO_ABBR, key=len, reverse=True))
+    + r')\b',
+    re.IGNORECASE,
+)
+
+
 def state_frequency_count(text):
     """Returns the most frequently mentioned state name abbreviation in the document."""
-    counts = {}
-    for state_name, abbr in STATE_NAME_TO_ABBR.items():
-        count = len(re.findall(rf'\b{re.escape(state_name)}\b', text, re.IGNORECASE))
-        if count > 0:
-            counts[abbr] = counts.get(abbr, 0) + count
+    hits = {}
+    for match in STATE_NAME_REGEX.finditer(text):
+        name = match.group(0).casefold()
+        hits[name] = hits.get(name, 0) + 1
+    # Every "West Virginia" also mentions "Virginia"
+    if "west virginia" in hits:
+        hits["virginia"] = hits.get("virginia", 0) + hits["west virginia"]
+    # Keep STATE_NAME_TO_ABBR order so max() breaks ties the same way
+    counts = {
+        abbr: hits[state_name.casefold()]
+        for state_name, abbr in STATE_NAME_TO_ABBR.items()
+        if state_name.casefold() in hits
+    }
     return (max(counts, key=counts.get), counts) if counts else (None, {})
 
 
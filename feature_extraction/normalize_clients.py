@@ -189,16 +189,18 @@ def run(csv_path, output_dir, db_url=None, push=False):
 
     # --- Output 2: Canonical map template ---
     # Sorted by frequency descending — top entries are highest leverage for manual mapping
+    # One sort serves both the template and the top-10 summary below
+    ranked = sorted(freq.items(), key=lambda x: -x[1])
     map_path = f"{output_dir}/canonical_map_template.csv"
     with open(map_path, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         writer.writerow(["client_clean_v1", "count", "client_canonical"])
-        for name, count in sorted(freq.items(), key=lambda x: -x[1]):
+        for name, count in ranked:
             writer.writerow([name, count, ""])  # client_canonical blank for manual fill
     print(f"Canonical map template written to: {map_path}")
     print(f"  {len(freq)} unique names — fill in client_canonical for top entries first")
     print(f"  Top 10 by frequency:")
-    for name, count in sorted(freq.items(), key=lambda x: -x[1])[:10]:
+    for name, count in ranked[:10]:
         print(f"    [{count:4d}]  {name}")
 
     # --- Optional: Push to DB ---
@@ -0,0 +1,46 @@
+"""
+Materialized view refresh job — run as a Render cron job.
+
+Refreshes the daily_metrics rollup behind the dashboard trend charts and the
+popular_search_queries rollup behind top search terms. Nothing in the
+deployment runs Celery beat, so the refreshes are scheduled here instead.
+"""
+
+import logging
+import sys
+
+from database import SessionLocal
+from services.dashboard_service import DashboardService
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [refresh_rollups] %(levelname)s %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def run() -> None:
+    db = SessionLocal()
+    dashboard = DashboardService(db)
+    failed = False
+
+    # Refresh each view independently so one failure doesn't leave the other stale
+    for name, refresh in (
+        ("daily_metrics", dashboard.refresh_daily_metrics),
+        ("popular_search_queries", dashboard.refresh_popular_search_queries),
+    ):
+        try:
+            refresh()
+            logger.info("Refreshed %s rollup.", name)
+        except Exception as exc:
+            db.rollback()
+            logger.error("Refreshing %s failed: %s", name, exc)
+            failed = True
+
+    db.close()
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run()
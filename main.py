@@ -94,9 +94,13 @@ async def lifespan(app: FastAPI):
         logger.info("Initializing taxonomy from CSV...")
         # Create a temporary service instance for initialization
         db_session = next(get_db())
-        taxonomy_service = TaxonomyService(db_session)
-        success, message = await taxonomy_service.initialize_from_csv(taxonomy_csv_path)
-        db_session.close()
+        try:
+            taxonomy_service = TaxonomyService(db_session)
+            success, message = await taxonomy_service.initialize_from_csv(
+                taxonomy_csv_path
+            )
+        finally:
+            db_session.close()
         if success:
             logger.info(f"Taxonomy initialization: {message}")
         else:
@@ -752,35 +756,39 @@ async def upload_documents(
         tasks = []
         delay_seconds = 30  # 30 seconds between each document
 
-        for i, file in enumerate(files):
-            if not file.filename:
-                continue
+        # Publish through one pooled producer instead of one per apply_async.
+        # Each document is dispatched right after its record is created, so a
+        # failure later in the batch can't strand earlier QUEUED documents.
+        with process_document_task.app.producer_or_acquire() as producer:
+            for file in files:
+                if not file.filename:
+                    continue
 
-            # Basic filename sanitization only
-            safe_filename = security_service.sanitize_filename(file.filename)
+                # Basic filename sanitization only
+                safe_filename = security_service.sanitize_filename(file.filename)
 
-            # Save file to storage
-            file_path = await storage_service.save_file(file)
+                # Save file to storage
+                file_path = await storage_service.save_file(file)
 
-            # Create document record
-            document = await document_service.create_document(
-                filename=safe_filename, file_path=file_path, file_size=file.size or 0
-            )
+                # Create document record
+                document = await document_service.create_document(
+                    filename=safe_filename, file_path=file_path, file_size=file.size or 0
+                )
 
-            # Dispatch Celery task for processing with a staggered delay
-            countdown = i * delay_seconds
-            task = process_document_task.apply_async(
-                args=[document.id], countdown=countdown
-            )
+                # Dispatch Celery task for processing with a staggered delay
+                countdown = len(tasks) * delay_seconds
+                task = process_document_task.apply_async(
+                    args=[document.id], countdown=countdown, producer=producer
+                )
 
-            tasks.append(
-                {
-                    "document_id": document.id,
-                    "filename": document.filename,
-                    "task_id": task.id,
-                    "processing_starts_in_seconds": countdown,
-                }
-            )
+                tasks.append(
+                    {
+                        "document_id": document.id,
+                        "filename": document.filename,
+                        "task_id": task.id,
+                        "processing_starts_in_seconds": countdown,
+                    }
+                )
 
         # Return results
         response = {
@@ -831,13 +839,36 @@ async def get_document_preview(
     document_service: DocumentService = Depends(get_document_service),
     preview_service: PreviewService = Depends(get_preview_service),
 ):
-    """Get document preview"""
+    """
+    Get document preview.
+
+    200 {"success": true, "preview_url": ..., "filename": ...} once the preview
+    exists, and 200 with a null preview_url when there will be none (the file
+    type has no renderer, or rendering failed). While it is still being
+    rendered the response is 202
+    {"success": true, "preview_url": null, "status": "pending", "filename": ...};
+    clients should retry after a short delay. Repeated polls do not queue
+    additional renders.
+    """
     try:
         document = await document_service.get_document(document_id)
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
 
         preview_url = await preview_service.get_preview_url(document.file_path)
+        if not preview_url and not preview_service.preview_unavailable(
+            document.file_path
+        ):
+            # Preview is being rendered by the worker; the client should retry.
+            return JSONResponse(
+                status_code=202,
+                content={
+                    "success": True,
+                    "preview_url": None,
+                    "status": "pending",
+                    "filename": document.filename,
+                },
+            )
 
         return {
             "success": True,
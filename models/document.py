@@ -14,7 +14,7 @@ from sqlalchemy import (
     Index,
     Computed,
 )
-from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.orm import relationship, deferred, column_property
 from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -28,6 +28,18 @@ from models.document_taxonomy_map import document_taxonomy_map
 from models.taxonomy import TaxonomyTerm
 from models.schemas import AIAnalysis, KeywordsData, FileMetadata, EmbeddingProvenance
 
+METADATA_QUALITY_SCORE_SQL = (
+    "(CASE date_confidence WHEN 'HIGH' THEN 1.0 WHEN 'MEDIUM' THEN 0.5 ELSE 0.0 END"
+    " + CASE client_confidence WHEN 'HIGH' THEN 1.0 WHEN 'MEDIUM' THEN 0.5 ELSE 0.0 END"
+    " + CASE state_confidence WHEN 'HIGH' THEN 1.0 WHEN 'MEDIUM' THEN 0.5 ELSE 0.0 END"
+    ") / 3.0"
+)
+
+MAPPING_COUNT_SQL = (
+    "CASE WHEN jsonb_typeof(keywords -> 'keyword_mappings') = 'array'"
+    " THEN jsonb_array_length(keywords -> 'keyword_mappings') ELSE 0 END"
+)
+
 
 class Document(Base):
     """
@@ -40,7 +52,7 @@ class Document(Base):
     # Core fields
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String(255), nullable=False, index=True)
-    file_path = Column(String(500), nullable=False)
+    file_path = Column(String(500), nullable=False, unique=True)
     file_size = Column(Integer, nullable=False)
 
     # Status and processing
@@ -64,11 +76,19 @@ class Document(Base):
     )  # Raw extracted text
     ai_analysis = Column(JSONB, nullable=True)  # All AI analysis results
     keywords = Column(JSONB, nullable=True, index=True)  # Keywords and categories
+    # Set to the database's now() whenever keywords are written.
+    keywords_updated_at = Column(DateTime(timezone=True), nullable=True)
+    # Number of keyword_mappings, maintained by Postgres so searches can sort
+    # and filter on it without reading the keywords document
+    mapping_count = Column(Integer, Computed(MAPPING_COUNT_SQL, persisted=True))
     file_metadata = Column(JSONB, nullable=True)  # File metadata, page count, etc.
 
     # Search and embeddings
     search_content = Column(Text, nullable=True)
     search_vector = Column(Vector(1536), nullable=True)
+    # Evaluated by Postgres in the SELECT, so list views can report whether a
+    # document is embedded without loading the 1536-float vector itself
+    has_embeddings = column_property(search_vector.isnot(None))
     embedding_model = Column(String(100), nullable=True)
     embedding_version = Column(Integer, nullable=True)
     embedding_provenance = Column(JSONB, nullable=True)
@@ -99,6 +119,11 @@ class Document(Base):
     date_confidence = Column(Text, nullable=True)
     client_confidence = Column(Text, nullable=True)
     state_confidence = Column(Text, nullable=True)
+    # Mean of the three confidences (HIGH=1, MEDIUM=0.5, else 0), maintained
+    # by Postgres so the dashboard's data-quality leaderboard just averages it
+    metadata_quality_score = Column(
+        Float, Computed(METADATA_QUALITY_SCORE_SQL, persisted=True)
+    )
     needs_review = Column(Boolean, nullable=True, default=False)
     needs_date_review = Column(Boolean, nullable=True, default=False)
 
@@ -142,6 +167,7 @@ class Document(Base):
     def set_keywords_data(self, data: KeywordsData) -> None:
         """Validate and store keywords via the typed schema, then refresh search content."""
         self.keywords = data.to_storage()
+        self.keywords_updated_at = func.now()
         self._update_search_content()
 
     def set_file_metadata(self, meta: FileMetadata) -> None:
@@ -150,7 +176,7 @@ class Document(Base):
 
     def get_summary(self) -> Optional[str]:
         """Get document summary from AI analysis, handling all historical schema shapes."""
-        return self.get_ai_analysis().get_summary()
+        return AIAnalysis.summary_from_raw(self.ai_analysis)
 
     def get_categories(self) -> List[str]:
         """Get document categories from keywords"""
@@ -186,8 +212,8 @@ class Document(Base):
                 keyword_mappings if isinstance(keyword_mappings, list) else []
             ),
             "mapping_count": len(keyword_mappings) if keyword_mappings else 0,
-            "extraction_timestamp": datetime.utcnow().isoformat(),
         }
+        self.keywords_updated_at = func.now()
 
         # Update search content dynamically based on all available text fields
         self._update_search_content()
@@ -226,9 +252,11 @@ class Document(Base):
                 ]
                 search_parts.extend(verbatim_terms)
 
-        # Join all parts, ensuring they are strings and removing duplicates
+        # Join all parts, ensuring they are strings and removing duplicates.
+        # Order is irrelevant to the full-text/trigram indexes, so dedup in
+        # first-seen order instead of sorting (extracted_text can be large).
         self.search_content = " ".join(
-            sorted(list(set(str(p) for p in search_parts if p)))
+            dict.fromkeys(str(p) for p in search_parts if p)
         )
 
     def set_metadata(self, **metadata):
@@ -380,7 +408,7 @@ class Document(Base):
             "download_url": self.get_download_url(
                 storage_service
             ),  # Generate download URL on-demand with storage service
-            "has_embeddings": self.search_vector is not None,
+            "has_embeddings": bool(self.has_embeddings),
             "client_canonical": self.client_canonical,
             "state": self.state.strip() if self.state else None,
             "date_created": self.date_created.isoformat() if self.date_created else None,
@@ -416,6 +444,11 @@ class Document(Base):
 
 # Add indexes for FTS and vector search
 Index("idx_documents_keywords", Document.keywords, postgresql_using="gin")
+Index("idx_documents_ai_analysis", Document.ai_analysis, postgresql_using="gin")
+# The trigram index on lower(filename) for LIKE '%term%' search is created by
+# migration l9m0n1o2p3q4 only, since it needs pg_trgm. Likewise the trigram
+# indexes over keyword mapping terms (migration s6t7u8v9w0x1) and
+# lower(client_canonical) (migration u8v9w0x1y2z3).
 Index(
     "idx_documents_ts_vector",
     Document.ts_vector,
@@ -434,11 +467,49 @@ Index("idx_status_created", Document.status, Document.created_at)
 Index("idx_status_updated", Document.status, Document.updated_at)
 Index("idx_status_processed", Document.status, Document.processed_at)
 Index("idx_filename_status", Document.filename, Document.status)
+Index("idx_status_mapping_count", Document.status, Document.mapping_count)
 # Filter-path indexes: state/client filters and review-queue queries
 Index("idx_state_status", Document.state, Document.status)
 Index("idx_client_canonical_status", Document.client_canonical, Document.status)
 Index("idx_needs_review_status", Document.needs_review, Document.status)
 Index("idx_needs_date_review_status", Document.needs_date_review, Document.status)
+# Partial indexes mirroring the dashboard metric predicates
+Index(
+    "idx_terminal_processed_at",
+    Document.processed_at,
+    postgresql_where=Document.status.in_(["COMPLETED", "FAILED"]),
+)
+Index(
+    "idx_completed_processed_at",
+    Document.processed_at,
+    postgresql_where=Document.status == "COMPLETED",
+)
+Index(
+    "idx_pending_created_at",
+    Document.created_at,
+    postgresql_where=Document.status == "PENDING",
+)
+Index(
+    "idx_queued_created_at",
+    Document.created_at,
+    postgresql_where=Document.status == "QUEUED",
+)
+Index(
+    "idx_completed_with_analysis",
+    Document.id,
+    postgresql_where=(Document.status == "COMPLETED") & Document.ai_analysis.isnot(None),
+)
+Index(
+    "idx_completed_with_embedding",
+    Document.id,
+    postgresql_where=(Document.status == "COMPLETED") & Document.search_vector.isnot(None),
+)
+# Failed-document listing (get_failed_documents orders by updated_at DESC)
+Index(
+    "idx_failed_updated_at",
+    Document.updated_at.desc(),
+    postgresql_where=Document.status == "FAILED",
+)
 
 
 # Status constants
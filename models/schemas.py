@@ -63,6 +63,22 @@ class AIAnalysis(BaseModel):
             return self.document_analysis.get("summary")
         return None
 
+    @staticmethod
+    def summary_from_raw(raw: Optional[Dict[str, Any]]) -> Optional[str]:
+        """
+        Same result as ``from_raw(raw).get_summary()`` without validating the
+        whole document (every keyword mapping included) — for list views that
+        only need the summary.
+        """
+        if not raw or not isinstance(raw, dict):
+            return None
+        if raw.get("summary"):
+            return raw["summary"]
+        document_analysis = raw.get("document_analysis")
+        if isinstance(document_analysis, dict):
+            return document_analysis.get("summary")
+        return None
+
     @classmethod
     def from_raw(cls, raw: Optional[Dict[str, Any]]) -> "AIAnalysis":
         """
@@ -113,6 +129,7 @@ class KeywordsData(BaseModel):
     categories: List[str] = Field(default_factory=list)
     keyword_mappings: List[KeywordMapping] = Field(default_factory=list)
     mapping_count: int = 0
+    # Legacy: rows written before Document.keywords_updated_at existed.
     extraction_timestamp: Optional[str] = None
 
     @classmethod
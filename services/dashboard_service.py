@@ -4,37 +4,64 @@ Dashboard service - handles calculating and aggregating dashboard metrics
 
 import logging
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, case, Integer, text, cast, Float
-from datetime import datetime, timedelta
+from sqlalchemy import (
+    func,
+    desc,
+    case,
+    text,
+    cast,
+    Float,
+    DateTime,
+    literal,
+    and_,
+    or_,
+)
+from datetime import datetime, timedelta, timezone
 
 from models.document import Document, DocumentStatus
 from models.search_query import SearchQuery
-from services.document_service import DocumentService
 from services.search_service import SearchService
 
 logger = logging.getLogger(__name__)
 
 
+def _percentage(numerator, denominator):
+    """SQL expression for numerator / denominator * 100, NULL when denominator is 0."""
+    return cast(numerator, Float) / func.nullif(denominator, 0) * 100
+
+
 class DashboardService:
     """Service for calculating dashboard metrics"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, search_service: SearchService | None = None):
         self.db = db
-        self.document_service = DocumentService(db)
-        self.search_service = SearchService(
-            db, None
-        )  # Preview service not needed for metrics
+        self._search_service = search_service
+        self._document_aggregates = None
+
+    @property
+    def search_service(self) -> SearchService:
+        """
+        SearchService used for top queries. Built on first use since only the
+        main dashboard endpoint needs it.
+        """
+        if self._search_service is None:
+            # Preview service not needed for metrics
+            self._search_service = SearchService(self.db, None)
+        return self._search_service
 
     async def get_dashboard_data(self) -> dict:
         """
         Gathers all data for the admin dashboard.
         """
 
-        core_processing_metrics = await self._get_core_processing_metrics()
+        # One reference timestamp so every time-windowed metric agrees on "now"
+        now = datetime.utcnow()
+
+        core_processing_metrics = await self._get_core_processing_metrics(now)
         ai_analysis_metrics = await self._get_ai_analysis_metrics()
-        user_engagement_metrics = await self._get_user_engagement_metrics()
-        key_metrics = await self._get_key_metrics()
-        trends = await self._get_trend_data()
+        user_engagement_metrics = await self._get_user_engagement_metrics(now)
+        key_metrics = await self._get_key_metrics(now)
+        trends = await self._get_trend_data(now)
         status_breakdown = await self._get_status_breakdown()
         recent_documents = await self._get_recent_documents()
 
@@ -48,137 +75,128 @@ class DashboardService:
             "recent_documents": recent_documents,
         }
 
-    async def _get_core_processing_metrics(self) -> dict:
+    async def _get_core_processing_metrics(self, now: datetime | None = None) -> dict:
         """Calculate core processing metrics."""
+        now = now or datetime.utcnow()
         try:
-            total_processed = (
-                self.db.query(func.count(Document.id))
-                .filter(
-                    Document.status.in_(
-                        [DocumentStatus.COMPLETED, DocumentStatus.FAILED]
-                    )
-                )
-                .scalar()
-                or 0
-            )
+            completed = Document.status == DocumentStatus.COMPLETED
+            one_day_ago = now - timedelta(days=1)
 
-            successful_docs = (
-                self.db.query(func.count(Document.id))
-                .filter(Document.status == DocumentStatus.COMPLETED)
-                .scalar()
-                or 0
+            metrics = (
+                self.db.query(
+                    _percentage(
+                        func.count().filter(completed),
+                        func.count().filter(
+                            Document.status.in_(
+                                [DocumentStatus.COMPLETED, DocumentStatus.FAILED]
+                            )
+                        ),
+                    ).label("success_rate"),
+                    func.avg(Document.processed_at - Document.created_at)
+                    .filter(completed, Document.processed_at.isnot(None))
+                    .label("avg_processing_time"),
+                    func.count()
+                    .filter(Document.status == DocumentStatus.PENDING)
+                    .label("queue_depth"),
+                    func.count()
+                    .filter(completed, Document.processed_at >= one_day_ago)
+                    .label("throughput_24h"),
+                )
+                .select_from(Document)
+                .one()
             )
 
             success_rate = (
-                (successful_docs / total_processed * 100)
-                if total_processed > 0
-                else 100
-            )
-
-            avg_processing_time = self.db.query(
-                func.avg(Document.processed_at - Document.created_at)
-            ).filter(
-                Document.status == DocumentStatus.COMPLETED,
-                Document.processed_at.isnot(None),
-            ).scalar() or timedelta(
-                seconds=0
-            )
-
-            queue_depth = (
-                self.db.query(func.count(Document.id))
-                .filter(Document.status == DocumentStatus.PENDING)
-                .scalar()
-                or 0
-            )
-
-            one_day_ago = datetime.utcnow() - timedelta(days=1)
-            throughput_24h = (
-                self.db.query(func.count(Document.id))
-                .filter(
-                    Document.status == DocumentStatus.COMPLETED,
-                    Document.processed_at >= one_day_ago,
-                )
-                .scalar()
-                or 0
+                metrics.success_rate if metrics.success_rate is not None else 100
             )
+            avg_processing_time = metrics.avg_processing_time or timedelta(seconds=0)
 
             return {
                 "processing_success_rate": round(success_rate, 2),
                 "average_processing_time_seconds": avg_processing_time.total_seconds(),
-                "queue_depth": queue_depth,
-                "processing_throughput_24h": throughput_24h,
+                "queue_depth": metrics.queue_depth or 0,
+                "processing_throughput_24h": metrics.throughput_24h or 0,
             }
         except Exception as e:
             logger.error(f"Error calculating core processing metrics: {e}")
             return {}
 
-    async def _get_ai_analysis_metrics(self) -> dict:
-        """Calculate AI analysis quality metrics."""
-        try:
-            completed_docs = (
-                self.db.query(func.count(Document.id))
-                .filter(Document.status == DocumentStatus.COMPLETED)
-                .scalar()
-                or 0
-            )
-
-            if completed_docs == 0:
-                return {
-                    "analysis_completion_rate": 0,
-                    "keyword_mapping_success_rate": 0,
-                    "embedding_generation_rate": 0,
-                }
-
-            with_analysis = (
-                self.db.query(func.count(Document.id))
-                .filter(
-                    Document.status == DocumentStatus.COMPLETED,
-                    Document.ai_analysis.isnot(None),
+    def _get_document_aggregates(self) -> dict:
+        """
+        Status counts and AI coverage rates from a single pass over documents.
+        Shared by _get_status_breakdown and _get_ai_analysis_metrics; computed
+        once per service instance (i.e. once per request).
+        """
+        if self._document_aggregates is None:
+            completed = Document.status == DocumentStatus.COMPLETED
+            completed_docs = func.count().filter(completed)
+            # Rates are NULL when there are no completed documents
+            aggregates = (
+                self.db.query(
+                    func.count()
+                    .filter(Document.status == DocumentStatus.PENDING)
+                    .label("pending"),
+                    func.count()
+                    .filter(Document.status == DocumentStatus.PROCESSING)
+                    .label("processing"),
+                    completed_docs.label("completed"),
+                    func.count()
+                    .filter(Document.status == DocumentStatus.FAILED)
+                    .label("failed"),
+                    _percentage(
+                        func.count().filter(
+                            completed, Document.ai_analysis.isnot(None)
+                        ),
+                        completed_docs,
+                    ).label("analysis_completion_rate"),
+                    _percentage(
+                        func.count().filter(
+                            completed, Document.mapping_count > 0
+                        ),
+                        completed_docs,
+                    ).label("keyword_mapping_success_rate"),
+                    _percentage(
+                        func.count().filter(
+                            completed, Document.search_vector.isnot(None)
+                        ),
+                        completed_docs,
+                    ).label("embedding_generation_rate"),
                 )
-                .scalar()
-                or 0
+                .select_from(Document)
+                .one()
             )
+            self._document_aggregates = dict(aggregates._mapping)
+        return self._document_aggregates
 
-            with_mappings = (
-                self.db.query(func.count(Document.id))
-                .filter(
-                    Document.status == DocumentStatus.COMPLETED,
-                    Document.keywords["mapping_count"].astext.cast(Integer) > 0,
+    async def _get_ai_analysis_metrics(self) -> dict:
+        """Calculate AI analysis quality metrics."""
+        try:
+            aggregates = self._get_document_aggregates()
+            return {
+                name: (
+                    round(aggregates[name], 2)
+                    if aggregates[name] is not None
+                    else 0
                 )
-                .scalar()
-                or 0
-            )
-
-            with_embeddings = (
-                self.db.query(func.count(Document.id))
-                .filter(
-                    Document.status == DocumentStatus.COMPLETED,
-                    Document.search_vector.isnot(None),
+                for name in (
+                    "analysis_completion_rate",
+                    "keyword_mapping_success_rate",
+                    "embedding_generation_rate",
                 )
-                .scalar()
-                or 0
-            )
-
-            analysis_completion_rate = with_analysis / completed_docs * 100
-            keyword_mapping_rate = with_mappings / completed_docs * 100
-            embedding_generation_rate = with_embeddings / completed_docs * 100
-
-            return {
-                "analysis_completion_rate": round(analysis_completion_rate, 2),
-                "keyword_mapping_success_rate": round(keyword_mapping_rate, 2),
-                "embedding_generation_rate": round(embedding_generation_rate, 2),
             }
         except Exception as e:
             logger.error(f"Error calculating AI analysis metrics: {e}")
             return {}
 
-    async def _get_user_engagement_metrics(self) -> dict:
+    async def _get_user_engagement_metrics(self, now: datetime | None = None) -> dict:
         """Calculate user engagement metrics."""
+        now = now or datetime.utcnow()
         try:
-            one_week_ago = datetime.utcnow() - timedelta(days=7)
+            one_week_ago = now - timedelta(days=7)
 
             search_query_volume_7d = (
-                self.db.query(func.count(SearchQuery.id))
+                self.db.query(func.count())
+                .select_from(SearchQuery)
                 .filter(SearchQuery.timestamp >= one_week_ago)
                 .scalar()
                 or 0
@@ -187,7 +205,8 @@ class DashboardService:
             top_queries = await self.search_service.get_top_queries(limit=10)
 
             upload_volume_7d = (
-                self.db.query(func.count(Document.id))
+                self.db.query(func.count())
+                .select_from(Document)
                 .filter(Document.created_at >= one_week_ago)
                 .scalar()
                 or 0
@@ -202,13 +221,14 @@ class DashboardService:
             logger.error(f"Error calculating user engagement metrics: {e}")
             return {}
 
-    async def get_queue_health_data(self) -> dict:
+    async def get_queue_health_data(self, now: datetime | None = None) -> dict:
         """
         Gathers all data for the queue health dashboard.
         """
+        now = now or datetime.utcnow()
         try:
             status_counts = (
-                self.db.query(Document.status, func.count(Document.status))
+                self.db.query(Document.status, func.count())
                 .group_by(Document.status)
                 .all()
             )
@@ -223,19 +243,28 @@ class DashboardService:
             failed_count = status_map.get(DocumentStatus.FAILED, 0)
             completed_count = status_map.get(DocumentStatus.COMPLETED, 0)
 
-            # Get the oldest queued document
-            oldest_queued_doc = (
-                self.db.query(Document)
+            # Age of the oldest queued document, computed in SQL from a single
+            # lookup on idx_queued_created_at. NULL when nothing is queued.
+            # `now` is naive UTC; bind it as such against the timestamptz column.
+            oldest_queued_seconds = (
+                self.db.query(
+                    func.extract(
+                        "epoch",
+                        literal(
+                            now.replace(tzinfo=timezone.utc),
+                            DateTime(timezone=True),
+                        )
+                        - func.min(Document.created_at),
+                    )
+                )
                 .filter(Document.status == DocumentStatus.QUEUED)
-                .order_by(Document.created_at.asc())
-                .first()
+                .scalar()
+            )
+            oldest_queued_time = (
+                float(oldest_queued_seconds)
+                if oldest_queued_seconds is not None
+                else None
             )
-
-            oldest_queued_time = None
-            if oldest_queued_doc:
-                oldest_queued_time = (
-                    datetime.utcnow() - oldest_queued_doc.created_at
-                ).total_seconds()
 
             return {
                 "queued": queued_count,
@@ -262,62 +291,87 @@ class DashboardService:
         """
         Identifies documents that are missing critical data (summary, extracted text, keywords, embeddings).
         This is particularly useful for identifying documents that failed during AI processing due to quota issues.
+
+        All four categories come from a single scan: each row carries one boolean
+        per category plus a running per-category count, so the 100 most recent
+        documents of every category are selected without querying four times.
         """
+        per_category_limit = 100
         try:
-            # Find documents missing summary (in ai_analysis).
-            # Includes FAILED docs and COMPLETED docs where AI silently produced
-            # placeholder values ("No summary available") instead of real content.
             incomplete_statuses = ["COMPLETED", "FAILED"]
-            missing_summary = (
-                self.db.query(Document)
-                .filter(Document.status.in_(incomplete_statuses))
-                .filter(
+            missing_flags = {
+                # Missing summary (in ai_analysis). Includes FAILED docs and
+                # COMPLETED docs where AI silently produced placeholder values
+                # ("No summary available") instead of real content.
+                "summary": (
                     (Document.ai_analysis.is_(None))
                     | (Document.ai_analysis["summary"].astext.is_(None))
                     | (Document.ai_analysis["summary"].astext == "")
                     | (Document.ai_analysis["summary"].astext.ilike("%no summary available%"))
-                    | (Document.ai_analysis["error"].astext.isnot(None))
-                )
-                .order_by(desc(Document.created_at))
-                .limit(100)
-                .all()
-            )
-
-            # Find documents missing extracted text
-            missing_text = (
-                self.db.query(Document)
-                .filter(Document.status.in_(incomplete_statuses))
-                .filter(
+                    | (Document.ai_analysis.has_key("error"))
+                ),
+                # Missing extracted text
+                "extracted_text": (
                     (Document.extracted_text.is_(None))
                     | (Document.extracted_text == "")
+                ),
+                # Missing keywords — NULL or where AI analysis failed (error key
+                # present means analysis was never actually completed). The
+                # ? operator is answered by the GIN index on ai_analysis.
+                "keywords": (
+                    (Document.keywords.is_(None))
+                    | (Document.ai_analysis.has_key("error"))
+                ),
+                # Missing embeddings
+                "embeddings": Document.search_vector.is_(None),
+            }
+            newest_first = (desc(Document.created_at), desc(Document.id))
+
+            # Project only the columns doc_to_dict reads so the heavy
+            # extracted_text / ai_analysis / search_vector payloads are never
+            # transferred or hydrated.
+            flagged = (
+                self.db.query(
+                    Document.id,
+                    Document.filename,
+                    Document.status,
+                    Document.created_at,
+                    Document.processed_at,
+                    Document.processing_error,
+                    *[
+                        flag.label(f"missing_{name}")
+                        for name, flag in missing_flags.items()
+                    ],
+                    *[
+                        func.count()
+                        .filter(flag)
+                        .over(order_by=newest_first)
+                        .label(f"rank_{name}")
+                        for name, flag in missing_flags.items()
+                    ],
                 )
-                .order_by(desc(Document.created_at))
-                .limit(100)
-                .all()
+                .filter(Document.status.in_(incomplete_statuses))
+                .filter(or_(*missing_flags.values()))
+                .subquery()
             )
 
-            # Find documents missing keywords — NULL or where AI analysis failed
-            # (error key present means analysis was never actually completed).
-            missing_keywords = (
-                self.db.query(Document)
-                .filter(Document.status.in_(incomplete_statuses))
+            # Streamed through a server-side cursor in batches of 100 so only
+            # the trimmed dicts are held in memory, not the full result set.
+            rows = (
+                self.db.query(flagged)
                 .filter(
-                    (Document.keywords.is_(None))
-                    | (Document.ai_analysis["error"].astext.isnot(None))
+                    or_(
+                        *[
+                            and_(
+                                flagged.c[f"missing_{name}"],
+                                flagged.c[f"rank_{name}"] <= per_category_limit,
+                            )
+                            for name in missing_flags
+                        ]
+                    )
                 )
-                .order_by(desc(Document.created_at))
-                .limit(100)
-                .all()
-            )
-
-            # Find documents missing embeddings
-            missing_embeddings = (
-                self.db.query(Document)
-                .filter(Document.status.in_(incomplete_statuses))
-                .filter(Document.search_vector.is_(None))
-                .order_by(desc(Document.created_at))
-                .limit(100)
-                .all()
+                .order_by(desc(flagged.c.created_at), desc(flagged.c.id))
+                .yield_per(per_category_limit)
             )
 
             # Helper function to convert document to dict
@@ -335,32 +389,26 @@ class DashboardService:
                     "processing_error": doc.processing_error,
                 }
 
-            return {
-                "summary": {
-                    "count": len(missing_summary),
-                    "documents": [doc_to_dict(doc) for doc in missing_summary],
-                },
-                "extracted_text": {
-                    "count": len(missing_text),
-                    "documents": [doc_to_dict(doc) for doc in missing_text],
-                },
-                "keywords": {
-                    "count": len(missing_keywords),
-                    "documents": [doc_to_dict(doc) for doc in missing_keywords],
-                },
-                "embeddings": {
-                    "count": len(missing_embeddings),
-                    "documents": [doc_to_dict(doc) for doc in missing_embeddings],
-                },
-                "total_unique_incomplete": len(
-                    set(
-                        [doc.id for doc in missing_summary]
-                        + [doc.id for doc in missing_text]
-                        + [doc.id for doc in missing_keywords]
-                        + [doc.id for doc in missing_embeddings]
-                    )
-                ),
+            # Partition into the four categories in a single pass
+            buckets = {name: [] for name in missing_flags}
+            total_unique_incomplete = 0
+            for row in rows:
+                total_unique_incomplete += 1
+                doc = doc_to_dict(row)
+                for name, documents in buckets.items():
+                    if (
+                        row._mapping[f"missing_{name}"]
+                        and row._mapping[f"rank_{name}"] <= per_category_limit
+                    ):
+                        documents.append(doc)
+
+            result = {
+                name: {"count": len(documents), "documents": documents}
+                for name, documents in buckets.items()
             }
+            # Every returned row belongs to at least one category
+            result["total_unique_incomplete"] = total_unique_incomplete
+            return result
         except Exception as e:
             logger.error(f"Error getting incomplete documents: {e}", exc_info=True)
             return {
@@ -371,72 +419,60 @@ class DashboardService:
                 "total_unique_incomplete": 0,
             }
 
-    async def _get_key_metrics(self) -> dict:
+    async def _get_key_metrics(self, now: datetime | None = None) -> dict:
         """Calculate key dashboard metrics."""
+        now = now or datetime.utcnow()
         try:
-            # Completed documents only — excludes pending/processing/failed uploads
-            completed_docs = (
-                self.db.query(func.count(Document.id))
-                .filter(Document.status == DocumentStatus.COMPLETED)
-                .scalar()
-                or 0
-            )
-
-            # Success rate (7 days)
-            seven_days_ago = datetime.utcnow() - timedelta(days=7)
-            total_processed_7d = (
-                self.db.query(func.count(Document.id))
-                .filter(
-                    Document.processed_at >= seven_days_ago,
-                    Document.status.in_(
-                        [DocumentStatus.COMPLETED, DocumentStatus.FAILED]
-                    ),
-                )
-                .scalar()
-                or 0
-            )
+            completed = Document.status == DocumentStatus.COMPLETED
+            seven_days_ago = now - timedelta(days=7)
+            processed_7d = Document.processed_at >= seven_days_ago
 
-            successful_7d = (
-                self.db.query(func.count(Document.id))
-                .filter(
-                    Document.processed_at >= seven_days_ago,
-                    Document.status == DocumentStatus.COMPLETED,
+            metrics = (
+                self.db.query(
+                    # Completed documents only — excludes pending/processing/failed uploads
+                    func.count().filter(completed).label("completed_docs"),
+                    # Success rate (7 days)
+                    _percentage(
+                        func.count().filter(completed, processed_7d),
+                        func.count().filter(
+                            processed_7d,
+                            Document.status.in_(
+                                [DocumentStatus.COMPLETED, DocumentStatus.FAILED]
+                            ),
+                        ),
+                    ).label("success_rate_7d"),
+                    # Worker processing time: processing_started_at → processed_at.
+                    # Legacy rows without processing_started_at are excluded.
+                    func.avg(Document.processed_at - Document.processing_started_at)
+                    .filter(
+                        completed,
+                        Document.processed_at.isnot(None),
+                        Document.processing_started_at.isnot(None),
+                    )
+                    .label("avg_processing_time"),
+                    # Queue depth
+                    func.count()
+                    .filter(Document.status == DocumentStatus.PENDING)
+                    .label("queue_depth"),
                 )
-                .scalar()
-                or 0
+                .select_from(Document)
+                .one()
             )
 
             success_rate_7d = (
-                round((successful_7d / total_processed_7d * 100), 2)
-                if total_processed_7d > 0
+                round(metrics.success_rate_7d, 2)
+                if metrics.success_rate_7d is not None
                 else 100.0
             )
-
-            # Worker processing time: processing_started_at → processed_at.
-            # Falls back to created_at → processed_at for legacy rows without the new column.
-            avg_processing_time = self.db.query(
-                func.avg(Document.processed_at - Document.processing_started_at)
-            ).filter(
-                Document.status == DocumentStatus.COMPLETED,
-                Document.processed_at.isnot(None),
-                Document.processing_started_at.isnot(None),
-            ).scalar() or timedelta(seconds=0)
-
-            # Queue depth
-            queue_depth = (
-                self.db.query(func.count(Document.id))
-                .filter(Document.status == DocumentStatus.PENDING)
-                .scalar()
-                or 0
-            )
+            avg_processing_time = metrics.avg_processing_time or timedelta(seconds=0)
 
             return {
-                "completed_documents": completed_docs,
+                "completed_documents": metrics.completed_docs or 0,
                 "success_rate_7d": success_rate_7d,
                 "avg_processing_time_seconds": round(
                     avg_processing_time.total_seconds(), 2
                 ),
-                "queue_depth": queue_depth,
+                "queue_depth": metrics.queue_depth or 0,
             }
         except Exception as e:
             logger.error(f"Error calculating key metrics: {e}")
@@ -447,59 +483,72 @@ class DashboardService:
                 "queue_depth": 0,
             }
 
-    async def _get_trend_data(self) -> dict:
-        """Calculate 30-day trend data for uploads, completions, and searches."""
-        try:
-            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-
-            # Daily uploads
-            daily_uploads = (
-                self.db.query(
-                    func.date(Document.created_at).label("date"),
-                    func.count(Document.id).label("count"),
-                )
-                .filter(Document.created_at >= thirty_days_ago)
-                .group_by(func.date(Document.created_at))
-                .order_by(func.date(Document.created_at))
-                .all()
-            )
-
-            # Daily completions
-            daily_completions = (
-                self.db.query(
-                    func.date(Document.processed_at).label("date"),
-                    func.count(Document.id).label("count"),
-                )
-                .filter(
-                    Document.processed_at >= thirty_days_ago,
-                    Document.status == DocumentStatus.COMPLETED,
-                )
-                .group_by(func.date(Document.processed_at))
-                .order_by(func.date(Document.processed_at))
-                .all()
-            )
-
-            # Daily searches
-            daily_searches = (
-                self.db.query(
-                    func.date(SearchQuery.timestamp).label("date"),
-                    func.count(SearchQuery.id).label("count"),
-                )
-                .filter(SearchQuery.timestamp >= thirty_days_ago)
-                .group_by(func.date(SearchQuery.timestamp))
-                .order_by(func.date(SearchQuery.timestamp))
-                .all()
-            )
+    async def _get_trend_data(self, now: datetime | None = None) -> dict:
+        """
+        Calculate 30-day trend data for uploads, completions, and searches.
 
-            # Convert to lists of dicts
+        Completed days are read from the daily_metrics materialized view
+        (refreshed by the refresh_rollups cron job). Days from the view's
+        latest row onwards are computed live, so today, a partially captured
+        day and any days a missed refresh left out never show as zero.
+        """
+        now = now or datetime.utcnow()
+        try:
+            thirty_days_ago = now - timedelta(days=30)
+
+            rows = self.db.execute(
+                text("""
+                    WITH live_days AS (
+                        SELECT gs::date AS day
+                        FROM generate_series(
+                            GREATEST(
+                                (SELECT MAX(day) FROM daily_metrics
+                                 WHERE day < CURRENT_DATE),
+                                CAST(:start_day AS date)
+                            ),
+                            CURRENT_DATE,
+                            interval '1 day'
+                        ) AS gs
+                    )
+                    SELECT day, uploads, completions, searches
+                    FROM daily_metrics
+                    WHERE day >= :start_day
+                      AND day < (SELECT MIN(day) FROM live_days)
+                    UNION ALL
+                    SELECT
+                        d.day,
+                        (SELECT COUNT(*) FROM documents
+                         WHERE created_at >= d.day
+                           AND created_at < d.day + 1) AS uploads,
+                        (SELECT COUNT(*) FROM documents
+                         WHERE status = 'COMPLETED'
+                           AND processed_at >= d.day
+                           AND processed_at < d.day + 1) AS completions,
+                        (SELECT COUNT(*) FROM search_queries
+                         WHERE "timestamp" >= d.day
+                           AND "timestamp" < d.day + 1) AS searches
+                    FROM live_days d
+                    ORDER BY day
+                """),
+                {"start_day": thirty_days_ago.date()},
+            ).fetchall()
+
+            # Days with no activity are omitted, matching the GROUP BY shape
+            # the dashboard charts were built against.
             uploads_data = [
-                {"date": str(row.date), "count": row.count} for row in daily_uploads
+                {"date": str(row.day), "count": row.uploads}
+                for row in rows
+                if row.uploads
             ]
             completions_data = [
-                {"date": str(row.date), "count": row.count} for row in daily_completions
+                {"date": str(row.day), "count": row.completions}
+                for row in rows
+                if row.completions
             ]
             searches_data = [
-                {"date": str(row.date), "count": row.count} for row in daily_searches
+                {"date": str(row.day), "count": row.searches}
+                for row in rows
+                if row.searches
             ]
 
             return {
@@ -509,28 +558,32 @@ class DashboardService:
             }
         except Exception as e:
             logger.error(f"Error calculating trend data: {e}")
+            self.db.rollback()
             return {
                 "daily_uploads": [],
                 "daily_completions": [],
                 "daily_searches": [],
             }
 
+    def refresh_daily_metrics(self) -> None:
+        """Refresh the daily_metrics rollup without blocking dashboard reads."""
+        self.db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY daily_metrics"))
+        self.db.commit()
+
+    def refresh_popular_search_queries(self) -> None:
+        """Refresh the top search queries rollup without blocking readers."""
+        self.db.execute(
+            text("REFRESH MATERIALIZED VIEW CONCURRENTLY popular_search_queries")
+        )
+        self.db.commit()
+
     async def _get_status_breakdown(self) -> dict:
         """Get document status breakdown."""
         try:
-            status_counts = (
-                self.db.query(Document.status, func.count(Document.status))
-                .group_by(Document.status)
-                .all()
-            )
-
-            status_map = dict(status_counts)
-
+            aggregates = self._get_document_aggregates()
             return {
-                "pending": status_map.get(DocumentStatus.PENDING, 0),
-                "processing": status_map.get(DocumentStatus.PROCESSING, 0),
-                "completed": status_map.get(DocumentStatus.COMPLETED, 0),
-                "failed": status_map.get(DocumentStatus.FAILED, 0),
+                status: aggregates[status] or 0
+                for status in ("pending", "processing", "completed", "failed")
             }
         except Exception as e:
             logger.error(f"Error calculating status breakdown: {e}")
@@ -540,7 +593,13 @@ class DashboardService:
         """Get the 10 most recent documents."""
         try:
             recent_docs = (
-                self.db.query(Document)
+                self.db.query(
+                    Document.id,
+                    Document.filename,
+                    Document.status,
+                    Document.created_at,
+                    Document.processed_at,
+                )
                 .order_by(desc(Document.created_at))
                 .limit(10)
                 .all()
@@ -569,76 +628,54 @@ class DashboardService:
     async def get_review_queue(self) -> dict:
         """Breakdown of documents needing review, by reason."""
         try:
-            needs_review_flagged = (
-                self.db.query(func.count(Document.id))
-                .filter(Document.needs_review == True)
-                .scalar() or 0
-            )
-            missing_embeddings = (
-                self.db.query(func.count(Document.id))
-                .filter(
-                    Document.status == DocumentStatus.COMPLETED,
-                    Document.search_vector.is_(None),
-                )
-                .scalar() or 0
-            )
-            missing_text = (
-                self.db.query(func.count(Document.id))
-                .filter(
-                    Document.status == DocumentStatus.COMPLETED,
-                    (Document.extracted_text.is_(None)) | (Document.extracted_text == ""),
-                )
-                .scalar() or 0
-            )
-            missing_keywords = (
-                self.db.query(func.count(Document.id))
-                .filter(
-                    Document.status == DocumentStatus.COMPLETED,
-                    Document.keywords.is_(None),
+            completed = Document.status == DocumentStatus.COMPLETED
+
+            # Every reason counted in one pass over documents
+            counts = (
+                self.db.query(
+                    func.count()
+                    .filter(Document.needs_review == True)
+                    .label("needs_review_flagged"),
+                    func.count()
+                    .filter(completed, Document.search_vector.is_(None))
+                    .label("missing_embeddings"),
+                    func.count()
+                    .filter(
+                        completed,
+                        (Document.extracted_text.is_(None))
+                        | (Document.extracted_text == ""),
+                    )
+                    .label("missing_text"),
+                    func.count()
+                    .filter(completed, Document.keywords.is_(None))
+                    .label("missing_keywords"),
+                    func.count()
+                    .filter(Document.processing_error.isnot(None))
+                    .label("has_errors"),
+                    func.count()
+                    .filter(Document.date_confidence == "LOW")
+                    .label("low_date_confidence"),
+                    func.count()
+                    .filter(Document.client_confidence == "LOW")
+                    .label("low_client_confidence"),
+                    func.count()
+                    .filter(Document.state_confidence == "LOW")
+                    .label("low_state_confidence"),
                 )
-                .scalar() or 0
+                .select_from(Document)
+                .one()
             )
-            has_errors = (
-                self.db.query(func.count(Document.id))
-                .filter(Document.processing_error.isnot(None))
-                .scalar() or 0
-            )
-            low_date_conf = (
-                self.db.query(func.count(Document.id))
-                .filter(Document.date_confidence == "LOW")
-                .scalar() or 0
-            )
-            low_client_conf = (
-                self.db.query(func.count(Document.id))
-                .filter(Document.client_confidence == "LOW")
-                .scalar() or 0
-            )
-            low_state_conf = (
-                self.db.query(func.count(Document.id))
-                .filter(Document.state_confidence == "LOW")
-                .scalar() or 0
-            )
-            return {
-                "needs_review_flagged": needs_review_flagged,
-                "missing_embeddings": missing_embeddings,
-                "missing_text": missing_text,
-                "missing_keywords": missing_keywords,
-                "has_errors": has_errors,
-                "low_date_confidence": low_date_conf,
-                "low_client_confidence": low_client_conf,
-                "low_state_confidence": low_state_conf,
-            }
+            return {key: value or 0 for key, value in counts._mapping.items()}
         except Exception as e:
             logger.error(f"Error getting review queue: {e}")
             return {}
 
     async def get_data_quality(self) -> dict:
         """Confidence distributions and bad-data leaderboard."""
-        _CONF_SCORE = {"high": 1.0, "medium": 0.5, "low": 0.0}
 
         def _dist(column):
             rows = (
-                self.db.query(column, func.count(Document.id))
+                self.db.query(column, func.count())
                 .filter(column.isnot(None))
                 .group_by(column)
                 .all()
@@ -650,17 +687,13 @@ class DashboardService:
             client_dist = _dist(Document.client_confidence)
             state_dist = _dist(Document.state_confidence)
 
-            # Composite quality score per client_canonical
-            # Pull raw counts per (client_canonical, each confidence level)
+            # Composite quality score per client_canonical, averaged from the
+            # per-document metadata_quality_score generated column
             rows = self.db.execute(text("""
                 SELECT
                     client_canonical,
                     COUNT(*) AS doc_count,
-                    AVG(
-                        CASE date_confidence   WHEN 'HIGH' THEN 1.0 WHEN 'MEDIUM' THEN 0.5 ELSE 0.0 END +
-                        CASE client_confidence WHEN 'HIGH' THEN 1.0 WHEN 'MEDIUM' THEN 0.5 ELSE 0.0 END +
-                        CASE state_confidence  WHEN 'HIGH' THEN 1.0 WHEN 'MEDIUM' THEN 0.5 ELSE 0.0 END
-                    ) / 3.0 AS avg_quality
+                    AVG(metadata_quality_score) AS avg_quality
                 FROM documents
                 WHERE client_canonical IS NOT NULL
                 GROUP BY client_canonical
@@ -692,7 +725,7 @@ class DashboardService:
         """Top clients by volume and dirty-client (normalization) analysis."""
         try:
             top_clients = (
-                self.db.query(Document.client_canonical, func.count(Document.id).label("doc_count"))
+                self.db.query(Document.client_canonical, func.count().label("doc_count"))
                 .filter(Document.client_canonical.isnot(None))
                 .group_by(Document.client_canonical)
                 .order_by(desc("doc_count"))
@@ -827,28 +860,31 @@ class DashboardService:
         - Filter-only searches (no text query, just filters — power-user pattern)
         """
         try:
-            total_logged = self.db.query(func.count(SearchQuery.id)).scalar() or 0
+            total_logged = self.db.query(func.count()).select_from(SearchQuery).scalar() or 0
 
             # Counts of searches that used each filter dimension
             used_client = (
-                self.db.query(func.count(SearchQuery.id))
+                self.db.query(func.count())
+                .select_from(SearchQuery)
                 .filter(SearchQuery.filter_client.isnot(None))
                 .scalar() or 0
             )
             used_state = (
-                self.db.query(func.count(SearchQuery.id))
+                self.db.query(func.count())
+                .select_from(SearchQuery)
                 .filter(SearchQuery.filter_state.isnot(None))
                 .scalar() or 0
             )
             used_date_year = (
-                self.db.query(func.count(SearchQuery.id))
+                self.db.query(func.count())
+                .select_from(SearchQuery)
                 .filter(SearchQuery.filter_date_year.isnot(None))
                 .scalar() or 0
             )
 
             # Top filter values per dimension
             top_clients = (
-                self.db.query(SearchQuery.filter_client, func.count(SearchQuery.id).label("cnt"))
+                self.db.query(SearchQuery.filter_client, func.count().label("cnt"))
                 .filter(SearchQuery.filter_client.isnot(None))
                 .group_by(SearchQuery.filter_client)
                 .order_by(desc("cnt"))
@@ -856,7 +892,7 @@ class DashboardService:
                 .all()
             )
             top_states = (
-                self.db.query(SearchQuery.filter_state, func.count(SearchQuery.id).label("cnt"))
+                self.db.query(SearchQuery.filter_state, func.count().label("cnt"))
                 .filter(SearchQuery.filter_state.isnot(None))
                 .group_by(SearchQuery.filter_state)
                 .order_by(desc("cnt"))
@@ -864,7 +900,7 @@ class DashboardService:
                 .all()
             )
             top_years = (
-                self.db.query(SearchQuery.filter_date_year, func.count(SearchQuery.id).label("cnt"))
+                self.db.query(SearchQuery.filter_date_year, func.count().label("cnt"))
                 .filter(SearchQuery.filter_date_year.isnot(None))
                 .group_by(SearchQuery.filter_date_year)
                 .order_by(desc("cnt"))
@@ -874,12 +910,13 @@ class DashboardService:
 
             # Zero-result searches (result_count == 0, not null)
             zero_results = (
-                self.db.query(func.count(SearchQuery.id))
+                self.db.query(func.count())
+                .select_from(SearchQuery)
                 .filter(SearchQuery.result_count == 0)
                 .scalar() or 0
             )
             top_zero_result_queries = (
-                self.db.query(SearchQuery.query, func.count(SearchQuery.id).label("cnt"))
+                self.db.query(SearchQuery.query, func.count().label("cnt"))
                 .filter(SearchQuery.result_count == 0)
                 .group_by(SearchQuery.query)
                 .order_by(desc("cnt"))
@@ -889,7 +926,8 @@ class DashboardService:
 
             # Filter-only searches (empty / placeholder query, at least one filter set)
             filter_only = (
-                self.db.query(func.count(SearchQuery.id))
+                self.db.query(func.count())
+                .select_from(SearchQuery)
                 .filter(
                     SearchQuery.query == "(filter only)",
                     (
@@ -3,9 +3,11 @@ Document service - handles document CRUD operations and management
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, asc, update as sa_update
+from sqlalchemy import func, desc, asc, literal, update as sa_update
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 from typing import List, Optional, Dict, Any
 import logging
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 import redis
@@ -22,6 +24,11 @@ settings = get_settings()
 class DocumentService:
     """Service for managing documents"""
 
+    # get_statistics scans the whole table, so its result is shared across
+    # instances in this process as (expires_at, stats) for a few seconds.
+    STATISTICS_CACHE_TTL_SECONDS = 10
+    _statistics_cache: Optional[tuple] = None
+
     def __init__(self, db: Session):
         self.db = db
         try:
@@ -37,22 +44,37 @@ class DocumentService:
     async def create_document(
         self, filename: str, file_path: str, file_size: int, **metadata
     ) -> Document:
-        """Create a new document record and queue it for processing."""
-        try:
-            document = Document(
-                filename=filename,
-                file_path=file_path,
-                file_size=file_size,
-                status=DocumentStatus.QUEUED,  # Set status to QUEUED
-            )
+        """
+        Create a new document record and queue it for processing.
 
+        Inserted with ON CONFLICT (file_path) DO UPDATE, so a retried upload of
+        the same stored file returns the existing row instead of a duplicate.
+        """
+        try:
+            values = {
+                "filename": filename,
+                "file_path": file_path,
+                "file_size": file_size,
+                "status": DocumentStatus.QUEUED,  # Set status to QUEUED
+            }
             # Set metadata if provided
             if metadata:
-                document.set_metadata(**metadata)
-
-            self.db.add(document)
+                values["file_metadata"] = dict(metadata)
+
+            stmt = (
+                pg_insert(Document)
+                .values(**values)
+                .on_conflict_do_update(
+                    index_elements=[Document.file_path],
+                    set_={"updated_at": func.now()},
+                )
+                .returning(Document)
+            )
+            document = self.db.scalars(
+                stmt, execution_options={"populate_existing": True}
+            ).one()
             self.db.commit()
-            self.db.refresh(document)
+            self._invalidate_statistics_cache()
 
             logger.info(f"Created and queued document: {filename} (ID: {document.id})")
             return document
@@ -64,19 +86,7 @@ class DocumentService:
 
     async def get_document(self, document_id: int) -> Optional[Document]:
         """Get document by ID, ensuring heavyweight columns are loaded."""
-        from sqlalchemy.orm import undefer
-
-        try:
-            # Explicitly undefer extracted_text to ensure it's loaded
-            return (
-                self.db.query(Document)
-                .filter(Document.id == document_id)
-                .options(undefer(Document.extracted_text))
-                .first()
-            )
-        except Exception as e:
-            logger.error(f"Error getting document {document_id}: {str(e)}")
-            return None
+        return self.get_document_sync(document_id, include_heavy_fields=True)
 
     async def get_documents(
         self,
@@ -110,28 +120,8 @@ class DocumentService:
     async def update_document_status(
         self, document_id: int, status: str, progress: int = None, error: str = None
     ) -> bool:
-        """Update document processing status via targeted UPDATE (no full-row fetch)."""
-        try:
-            values: dict = {"status": status}
-            if progress is not None:
-                values["processing_progress"] = max(0, min(100, progress))
-            if error:
-                values["processing_error"] = error
-            if status == DocumentStatus.PROCESSING:
-                values["processing_started_at"] = datetime.utcnow()
-            if status == DocumentStatus.COMPLETED:
-                values["processing_progress"] = 100
-                values["processed_at"] = datetime.utcnow()
-
-            self.db.execute(sa_update(Document).where(Document.id == document_id).values(**values))
-            self.db.commit()
-            logger.info(f"Updated document {document_id} status to {status}")
-            return True
-
-        except Exception as e:
-            self.db.rollback()
-            logger.error(f"Error updating document {document_id} status: {str(e)}")
-            return False
+        """Update document processing status"""
+        return self.update_document_status_sync(document_id, status, progress, error)
 
     async def update_document_content(
         self,
@@ -144,44 +134,15 @@ class DocumentService:
         **metadata,
     ) -> bool:
         """Update document content and analysis with rich keyword mappings"""
-        try:
-            document = await self.get_document(document_id)
-            if not document:
-                return False
-
-            # Update extracted text
-            if extracted_text:
-                document.extracted_text = extracted_text
-
-            # Update AI analysis
-            if ai_analysis:
-                document.ai_analysis = ai_analysis
-
-            # Set keywords, categories, and mappings using the new model method
-            if keywords or categories or keyword_mappings:
-                document.set_keywords(
-                    keywords=keywords,
-                    categories=categories,
-                    keyword_mappings=keyword_mappings,
-                )
-
-            # Update metadata
-            if metadata:
-                document.set_metadata(**metadata)
-
-            # Update taxonomy mappings
-            self._update_document_taxonomy_mappings(document, keyword_mappings)
-
-            self.db.commit()
-            logger.info(
-                f"Updated document {document_id} content with {len(keyword_mappings or [])} keyword mappings"
-            )
-            return True
-
-        except Exception as e:
-            self.db.rollback()
-            logger.error(f"Error updating document {document_id} content: {str(e)}")
-            return False
+        return self.update_document_content_sync(
+            document_id,
+            extracted_text=extracted_text,
+            ai_analysis=ai_analysis,
+            keywords=keywords,
+            categories=categories,
+            keyword_mappings=keyword_mappings,
+            **metadata,
+        )
 
     async def delete_document(self, document_id: int, storage_service=None) -> Dict[str, Any]:
         """
@@ -237,6 +198,7 @@ class DocumentService:
                 result["database_deleted"] = True
                 result["success"] = True
                 logger.info(f"Successfully deleted document {document_id} ({filename})")
+                self._invalidate_statistics_cache()
                 
                 # Invalidate Redis cache after successful deletion
                 self._invalidate_search_cache()
@@ -301,48 +263,64 @@ class DocumentService:
         
         return results
 
+    @classmethod
+    def _invalidate_statistics_cache(cls):
+        """Drop the cached get_statistics result after a write that changes it."""
+        cls._statistics_cache = None
+
     async def get_statistics(self) -> Dict[str, Any]:
-        """Get document statistics"""
-        try:
-            total_docs = self.db.query(func.count(Document.id)).scalar()
+        """Get document statistics (cached for STATISTICS_CACHE_TTL_SECONDS)"""
+        cached = DocumentService._statistics_cache
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
 
-            # Count by status
-            status_counts = {}
-            for status in [
+        try:
+            # Total, status counts, recent activity and storage in one pass
+            statuses = [
                 DocumentStatus.PENDING,
                 DocumentStatus.PROCESSING,
                 DocumentStatus.COMPLETED,
                 DocumentStatus.FAILED,
-            ]:
-                count = (
-                    self.db.query(func.count(Document.id))
-                    .filter(Document.status == status)
-                    .scalar()
-                )
-                status_counts[status.lower()] = count
-
-            # Recent activity (last 7 days)
+            ]
             week_ago = datetime.utcnow() - timedelta(days=7)
-            recent_uploads = (
-                self.db.query(func.count(Document.id))
-                .filter(Document.created_at >= week_ago)
-                .scalar()
+            row = (
+                self.db.query(
+                    func.count().label("total"),
+                    *(
+                        func.count()
+                        .filter(Document.status == status)
+                        .label(status.lower())
+                        for status in statuses
+                    ),
+                    func.count()
+                    .filter(Document.created_at >= week_ago)
+                    .label("recent_uploads"),
+                    func.avg(Document.file_size).label("avg_size"),
+                    func.sum(Document.file_size).label("total_size"),
+                )
+                .select_from(Document)
+                .one()
             )
+            status_counts = {
+                status.lower(): row._mapping[status.lower()] for status in statuses
+            }
+            recent_uploads = row.recent_uploads
+            avg_size = row.avg_size or 0
+            total_size = row.total_size or 0
 
-            # Average file size
-            avg_size = self.db.query(func.avg(Document.file_size)).scalar() or 0
-
-            # Total storage used
-            total_size = self.db.query(func.sum(Document.file_size)).scalar() or 0
-
-            return {
-                "total_documents": total_docs,
+            stats = {
+                "total_documents": row.total,
                 "status_counts": status_counts,
                 "recent_uploads": recent_uploads,
                 "average_file_size": int(avg_size),
                 "total_storage_bytes": int(total_size),
                 "total_storage_mb": round(total_size / (1024 * 1024), 2),
             }
+            DocumentService._statistics_cache = (
+                time.monotonic() + self.STATISTICS_CACHE_TTL_SECONDS,
+                stats,
+            )
+            return stats
 
         except Exception as e:
             logger.error(f"Error getting statistics: {str(e)}")
@@ -387,14 +365,17 @@ class DocumentService:
     ) -> List[Document]:
         """Simple text search in documents"""
         try:
-            # Simple text search in filename and search_content
-            search_term = f"%{query}%"
+            # Document text is matched through the generated ts_vector column
+            # (GIN index); filenames keep substring matching, where lower(col)
+            # LIKE matches the expression the pg_trgm GIN index is built on.
+            search_term = f"%{query.lower()}%"
+            ts_query = func.plainto_tsquery("english", query)
 
             return (
                 self.db.query(Document)
                 .filter(
-                    (Document.filename.ilike(search_term))
-                    | (Document.search_content.ilike(search_term))
+                    (func.lower(Document.filename).like(search_term))
+                    | (Document.ts_vector.bool_op("@@")(ts_query))
                 )
                 .filter(Document.status == DocumentStatus.COMPLETED)
                 .order_by(desc(Document.created_at))
@@ -406,10 +387,114 @@ class DocumentService:
             logger.error(f"Error searching documents: {str(e)}")
             return []
 
-    def get_document_sync(self, document_id: int) -> Optional[Document]:
-        """Get document by ID (synchronous)"""
+    @staticmethod
+    def _status_values(
+        status: Optional[str], progress: int = None, error: str = None
+    ) -> Dict[str, Any]:
+        """Column values for a status/progress transition."""
+        values: Dict[str, Any] = {}
+        if status is not None:
+            values["status"] = status
+        if progress is not None:
+            values["processing_progress"] = max(0, min(100, progress))
+        if error:
+            values["processing_error"] = error
+        if status == DocumentStatus.PROCESSING:
+            values["processing_started_at"] = datetime.utcnow()
+        if status == DocumentStatus.COMPLETED:
+            values["processing_progress"] = 100
+            values["processed_at"] = datetime.utcnow()
+        return values
+
+    def update_document_bulk_sync(
+        self,
+        document_id: int,
+        status: str = None,
+        progress: int = None,
+        error: str = None,
+        metadata: Dict[str, Any] = None,
+        **fields,
+    ) -> bool:
+        """
+        Apply several column updates to one document in a single UPDATE and commit.
+
+        `status`/`progress`/`error` follow update_document_status_sync; `metadata`
+        is merged into file_metadata server-side (jsonb ||); any other keyword is
+        written to the column of the same name.
+        """
+        try:
+            values = self._status_values(status, progress, error)
+            if metadata:
+                values["file_metadata"] = func.coalesce(
+                    Document.file_metadata, literal({}, JSONB)
+                ).op("||", return_type=JSONB)(literal(metadata, JSONB))
+            values.update(fields)
+            if not values:
+                return True
+
+            self.db.execute(
+                sa_update(Document).where(Document.id == document_id).values(**values)
+            )
+            self.db.commit()
+            if status is not None:
+                self._invalidate_statistics_cache()
+            return True
+
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error updating document {document_id}: {str(e)}")
+            return False
+
+    def bulk_update_status_sync(
+        self,
+        document_ids: List[int],
+        status: str,
+        progress: int = None,
+        error: str = None,
+        **fields,
+    ) -> int:
+        """
+        Move many documents to a new status with one UPDATE ... WHERE id IN (...)
+        and a single commit. Returns the number of rows updated.
+        """
+        if not document_ids:
+            return 0
+
+        try:
+            values = self._status_values(status, progress, error)
+            values.update(fields)
+            result = self.db.execute(
+                sa_update(Document)
+                .where(Document.id.in_(document_ids))
+                .values(**values)
+            )
+            self.db.commit()
+            self._invalidate_statistics_cache()
+            logger.info(f"Updated {result.rowcount} document(s) to status {status}")
+            return result.rowcount
+
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error bulk updating document status to {status}: {str(e)}")
+            return 0
+
+    def get_document_sync(
+        self, document_id: int, include_heavy_fields: bool = False
+    ) -> Optional[Document]:
+        """
+        Get document by ID (synchronous). The async methods of this service
+        delegate here: Session I/O blocks either way.
+
+        Session.get consults the identity map first, so repeated lookups of the
+        same document within one request or task don't re-SELECT the row
+        (after a commit the instance is expired and refreshed by primary key).
+        """
+        from sqlalchemy.orm import undefer
+
         try:
-            return self.db.query(Document).filter(Document.id == document_id).first()
+            # Explicitly undefer extracted_text to ensure it's loaded
+            options = [undefer(Document.extracted_text)] if include_heavy_fields else []
+            return self.db.get(Document, document_id, options=options)
         except Exception as e:
             logger.error(f"Error getting document {document_id}: {str(e)}")
             return None
@@ -419,19 +504,17 @@ class DocumentService:
     ) -> bool:
         """Update document processing status via targeted UPDATE (no full-row fetch)."""
         try:
-            values: dict = {"status": status}
-            if progress is not None:
-                values["processing_progress"] = max(0, min(100, progress))
-            if error:
-                values["processing_error"] = error
-            if status == DocumentStatus.PROCESSING:
-                values["processing_started_at"] = datetime.utcnow()
-            if status == DocumentStatus.COMPLETED:
-                values["processing_progress"] = 100
-                values["processed_at"] = datetime.utcnow()
-
-            self.db.execute(sa_update(Document).where(Document.id == document_id).values(**values))
+            values = self._status_values(status, progress, error)
+            updated_id = self.db.execute(
+                sa_update(Document)
+                .where(Document.id == document_id)
+                .values(**values)
+                .returning(Document.id)
+            ).scalar()
             self.db.commit()
+            if updated_id is None:
+                return False
+            self._invalidate_statistics_cache()
             logger.info(f"Updated document {document_id} status to {status}")
             return True
 
@@ -495,27 +578,13 @@ class DocumentService:
         embedding_provenance: dict = None,
     ) -> bool:
         """Update document search vector (embeddings)"""
-        try:
-            document = await self.get_document(document_id)
-            if not document:
-                return False
-
-            document.search_vector = embeddings
-            if embedding_model is not None:
-                document.embedding_model = embedding_model
-            if embedding_version is not None:
-                document.embedding_version = embedding_version
-            if embedding_provenance is not None:
-                document.embedding_provenance = embedding_provenance
-            self.db.commit()
-            logger.info(f"Updated embeddings for document {document_id}")
-            return True
-        except Exception as e:
-            self.db.rollback()
-            logger.error(
-                f"Error updating embeddings for document {document_id}: {str(e)}"
-            )
-            return False
+        return self.update_document_embeddings_sync(
+            document_id,
+            embeddings,
+            embedding_model=embedding_model,
+            embedding_version=embedding_version,
+            embedding_provenance=embedding_provenance,
+        )
 
     def update_document_embeddings_sync(
         self,
@@ -527,18 +596,25 @@ class DocumentService:
     ) -> bool:
         """Update document search vector (embeddings) (synchronous)"""
         try:
-            document = self.get_document_sync(document_id)
-            if not document:
-                return False
-
-            document.search_vector = embeddings
+            # Targeted UPDATE ... RETURNING id: no row means not found, and the
+            # document's large text columns are never loaded.
+            values: Dict[str, Any] = {"search_vector": embeddings}
             if embedding_model is not None:
-                document.embedding_model = embedding_model
+                values["embedding_model"] = embedding_model
             if embedding_version is not None:
-                document.embedding_version = embedding_version
+                values["embedding_version"] = embedding_version
             if embedding_provenance is not None:
-                document.embedding_provenance = embedding_provenance
+                values["embedding_provenance"] = embedding_provenance
+
+            updated_id = self.db.execute(
+                sa_update(Document)
+                .where(Document.id == document_id)
+                .values(**values)
+                .returning(Document.id)
+            ).scalar()
             self.db.commit()
+            if updated_id is None:
+                return False
             logger.info(f"Updated embeddings for document {document_id}")
             return True
         except Exception as e:
@@ -552,13 +628,22 @@ class DocumentService:
         self, document_id: int, preview_url: str
     ) -> bool:
         """Update document preview URL"""
-        try:
-            document = await self.get_document(document_id)
-            if not document:
-                return False
+        return self.update_document_preview_url_sync(document_id, preview_url)
 
-            document.preview_url = preview_url
+    def update_document_preview_url_sync(
+        self, document_id: int, preview_url: str
+    ) -> bool:
+        """Update document preview URL (synchronous)"""
+        try:
+            updated_id = self.db.execute(
+                sa_update(Document)
+                .where(Document.id == document_id)
+                .values(preview_url=preview_url)
+                .returning(Document.id)
+            ).scalar()
             self.db.commit()
+            if updated_id is None:
+                return False
             logger.info(f"Updated preview URL for document {document_id}")
             return True
         except Exception as e:
@@ -622,26 +707,6 @@ class DocumentService:
             # Rollback is handled by the calling function
             raise
 
-    def update_document_preview_url_sync(
-        self, document_id: int, preview_url: str
-    ) -> bool:
-        """Update document preview URL (synchronous)"""
-        try:
-            document = self.get_document_sync(document_id)
-            if not document:
-                return False
-
-            document.preview_url = preview_url
-            self.db.commit()
-            logger.info(f"Updated preview URL for document {document_id}")
-            return True
-        except Exception as e:
-            self.db.rollback()
-            logger.error(
-                f"Error updating preview URL for document {document_id}: {str(e)}"
-            )
-            return False
-
     async def reset_document_for_reprocessing(self, document_id: int) -> bool:
         """Reset document to QUEUED status and clear all AI-generated data for full reprocessing"""
         try:
@@ -654,6 +719,7 @@ class DocumentService:
             document.extracted_text = None
             document.ai_analysis = None
             document.keywords = None
+            document.keywords_updated_at = None
             document.search_vector = None
 
             # Clear taxonomy associations
@@ -4,10 +4,11 @@ Preview service - generates image previews from documents and stores them in the
 
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Optional
 import fitz  # PyMuPDF
 from PIL import Image
 import io
+import redis
 
 from config import get_settings
 from services.storage_service import StorageService
@@ -15,6 +16,75 @@ from services.storage_service import StorageService
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+PREVIEW_MAX_SIZE = (300, 400)  # (width, height) bounding box for thumbnails
+PDF_PREVIEW_SUPERSAMPLE = 2.0  # render PDFs at 2x the thumbnail, then downsample
+# How long a queued API preview render suppresses re-queueing for the same
+# preview; long enough to cover a render, short enough to retry a lost task.
+PREVIEW_QUEUE_MARKER_TTL_SECONDS = 300
+# How long a failed render is remembered. Until it expires (or a later render
+# succeeds) the API reports no preview instead of queueing the render again.
+PREVIEW_FAILURE_MARKER_TTL_SECONDS = 60 * 60
+
+
+def _render_pdf_preview(pdf_path: str) -> bytes:
+    """Render the first PDF page to a PNG thumbnail (raises on failure)"""
+    # MuPDF reads the file on demand, so only the first page is decoded.
+    doc = fitz.open(pdf_path, filetype="pdf")
+    try:
+        page = doc[0]
+        # Rasterize close to the thumbnail size instead of at a fixed 2x
+        # zoom, so MuPDF and LANCZOS only handle the pixels we keep.
+        rect = page.rect
+        scale = (
+            min(PREVIEW_MAX_SIZE[0] / rect.width, PREVIEW_MAX_SIZE[1] / rect.height)
+            * PDF_PREVIEW_SUPERSAMPLE
+        )
+        mat = fitz.Matrix(scale, scale)
+        pix = page.get_pixmap(matrix=mat, alpha=False)
+        # Build the PIL image from the raw RGB samples so PNG is only
+        # encoded once, for the final thumbnail.
+        img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    finally:
+        doc.close()
+    img.thumbnail(PREVIEW_MAX_SIZE, Image.Resampling.LANCZOS)
+
+    img_byte_arr = io.BytesIO()
+    img.save(img_byte_arr, format="PNG", optimize=True)
+    return img_byte_arr.getvalue()
+
+
+def _render_image_preview(image_path: str) -> bytes:
+    """Downscale an image to a PNG thumbnail (raises on failure)"""
+    img = Image.open(image_path)
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGB")
+    img.thumbnail(PREVIEW_MAX_SIZE, Image.Resampling.LANCZOS)
+
+    img_byte_arr = io.BytesIO()
+    img.save(img_byte_arr, format="PNG", optimize=True)
+    return img_byte_arr.getvalue()
+
+
+# File extension -> renderer, resolved once per call with a dict lookup.
+# Renderers read from a local path (see StorageService.local_file_sync).
+PREVIEW_RENDERERS: Dict[str, Callable[[str], bytes]] = {
+    ".pdf": _render_pdf_preview,
+    **dict.fromkeys(
+        [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff"], _render_image_preview
+    ),
+}
+
+
+_marker_client: Optional[redis.Redis] = None
+
+
+def _get_marker_client() -> redis.Redis:
+    """Process-wide Redis client for preview markers (connects lazily)"""
+    global _marker_client
+    if _marker_client is None:
+        _marker_client = redis.from_url(settings.redis_url, decode_responses=True)
+    return _marker_client
+
 
 class PreviewService:
     """Service for generating and managing document previews"""
@@ -23,40 +93,13 @@ class PreviewService:
         self.storage = storage_service
         self.preview_prefix = "previews"
 
-    async def _generate_pdf_preview_bytes(self, pdf_content: bytes) -> Optional[bytes]:
-        """Generate a preview image from PDF content and return as bytes"""
+    @staticmethod
+    def _render_preview(file_ext: str, local_path: str) -> Optional[bytes]:
+        """Render preview PNG bytes for a supported file type, or None on failure"""
         try:
-            doc = fitz.open(stream=pdf_content, filetype="pdf")
-            page = doc[0]
-            mat = fitz.Matrix(2.0, 2.0)
-            pix = page.get_pixmap(matrix=mat)
-            img_data = pix.tobytes("png")
-            img = Image.open(io.BytesIO(img_data))
-            img.thumbnail((300, 400), Image.Resampling.LANCZOS)
-
-            img_byte_arr = io.BytesIO()
-            img.save(img_byte_arr, format="PNG", optimize=True)
-            doc.close()
-            return img_byte_arr.getvalue()
+            return PREVIEW_RENDERERS[file_ext](local_path)
         except Exception as e:
-            logger.error(f"Error generating PDF preview bytes: {str(e)}")
-            return None
-
-    async def _generate_image_preview_bytes(
-        self, image_content: bytes
-    ) -> Optional[bytes]:
-        """Generate a preview from image content and return as bytes"""
-        try:
-            img = Image.open(io.BytesIO(image_content))
-            if img.mode in ("RGBA", "LA", "P"):
-                img = img.convert("RGB")
-            img.thumbnail((300, 400), Image.Resampling.LANCZOS)
-
-            img_byte_arr = io.BytesIO()
-            img.save(img_byte_arr, format="PNG", optimize=True)
-            return img_byte_arr.getvalue()
-        except Exception as e:
-            logger.error(f"Error generating image preview bytes: {str(e)}")
+            logger.error(f"Error generating {file_ext} preview bytes: {str(e)}")
             return None
 
     def get_preview_path(self, original_file_path: str) -> str:
@@ -65,116 +108,128 @@ class PreviewService:
         preview_filename = f"{file_name}_preview.png"
         return f"{self.preview_prefix}/{preview_filename}"
 
-    async def generate_preview(self, original_file_path: str) -> Optional[str]:
+    def generate_preview_sync(
+        self, original_file_path: str, overwrite: bool = True
+    ) -> Optional[str]:
         """
-        Generate a preview for a file in storage and save it back to storage.
+        Render a preview for a file in storage and save it back to storage.
         Returns the path of the preview file in storage.
+
+        With overwrite=False an existing preview is returned as is, so
+        duplicate API-triggered renders are cheap no-ops.
         """
+        file_ext = Path(original_file_path).suffix.lower()
+        if file_ext not in PREVIEW_RENDERERS:
+            logger.warning(f"Unsupported file type for preview (sync): {file_ext}")
+            return None
+
         preview_path = self.get_preview_path(original_file_path)
 
-        # Check if preview already exists in storage
-        if await self.storage.check_file_exists(preview_path):
+        # The processing pipeline overwrites the preview so that reprocessing
+        # a document also refreshes it.
+        if not overwrite and self.storage.check_file_exists_sync(preview_path):
             return preview_path
 
-        # Get the original file content from storage
-        file_content = await self.storage.get_file(original_file_path)
-        if not file_content:
-            logger.warning(
-                f"Could not retrieve file from storage: {original_file_path}"
-            )
-            return None
+        with self.storage.local_file_sync(original_file_path) as local_path:
+            if not local_path:
+                logger.warning(
+                    f"Could not retrieve file from storage (sync): {original_file_path}"
+                )
+                self._set_failure_marker(preview_path, failed=True)
+                return None
 
-        file_ext = Path(original_file_path).suffix.lower()
-        preview_bytes = None
-
-        if file_ext == ".pdf":
-            preview_bytes = await self._generate_pdf_preview_bytes(file_content)
-        elif file_ext in [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff"]:
-            preview_bytes = await self._generate_image_preview_bytes(file_content)
-        else:
-            logger.warning(f"Unsupported file type for preview: {file_ext}")
-            return None
+            preview_bytes = self._render_preview(file_ext, local_path)
 
         if preview_bytes:
-            # Save the preview to storage
-            await self.storage.save_file_bytes(preview_bytes, preview_path, "image/png")
+            # Synchronous save
+            # This assumes storage service has a synchronous save_file_bytes method
+            self.storage.save_file_bytes_sync(preview_bytes, preview_path, "image/png")
+            self._set_failure_marker(preview_path, failed=False)
             return preview_path
 
+        self._set_failure_marker(preview_path, failed=True)
         return None
 
-    def generate_preview_sync(self, original_file_path: str) -> Optional[str]:
+    def preview_unavailable(self, original_file_path: str) -> bool:
         """
-        Synchronous version of generate_preview for use in Celery tasks.
+        True when no preview is coming: the file type has no renderer, or the
+        last render failed within PREVIEW_FAILURE_MARKER_TTL_SECONDS.
         """
+        if Path(original_file_path).suffix.lower() not in PREVIEW_RENDERERS:
+            return True
         preview_path = self.get_preview_path(original_file_path)
+        try:
+            return bool(_get_marker_client().exists(f"preview_failed:{preview_path}"))
+        except Exception as e:
+            logger.warning(f"Could not check preview failure for {preview_path}: {e}")
+            return False
 
-        # Synchronous check if preview exists
-        # This assumes storage service has a synchronous check_file_exists method
-        # For this implementation, we'll proceed and overwrite for simplicity,
-        # assuming the check is not critical for the sync worker.
+    async def get_preview_url(
+        self, original_file_path: str, expires_in: int = 3600
+    ) -> Optional[str]:
+        """
+        Get a URL for a document preview. If the preview doesn't exist yet it is
+        queued on the Celery "previews" queue and None is returned; callers poll
+        (GET /api/documents/{id}/preview answers 202 {"status": "pending"}).
+
+        Only the first poll queues a render: later polls within
+        PREVIEW_QUEUE_MARKER_TTL_SECONDS find the Redis marker and just wait.
+        Nothing is queued when preview_unavailable() is true; the endpoint
+        then answers 200 with a null preview_url.
+        """
+        if Path(original_file_path).suffix.lower() not in PREVIEW_RENDERERS:
+            return None
 
-        file_content = self.storage.get_file_sync(original_file_path)
-        if not file_content:
-            logger.warning(
-                f"Could not retrieve file from storage (sync): {original_file_path}"
+        preview_path = self.get_preview_path(original_file_path)
+        if await self.storage.check_file_exists(preview_path):
+            return await self.storage.get_file_url(
+                preview_path, expires_in, content_type="image/png"
             )
+
+        if self.preview_unavailable(original_file_path):
             return None
 
-        file_ext = Path(original_file_path).suffix.lower()
-        preview_bytes = None
-
-        if file_ext == ".pdf":
-            # This part needs to be synchronous
-            try:
-                doc = fitz.open(stream=file_content, filetype="pdf")
-                page = doc[0]
-                mat = fitz.Matrix(2.0, 2.0)
-                pix = page.get_pixmap(matrix=mat)
-                img_data = pix.tobytes("png")
-                img = Image.open(io.BytesIO(img_data))
-                img.thumbnail((300, 400), Image.Resampling.LANCZOS)
-                img_byte_arr = io.BytesIO()
-                img.save(img_byte_arr, format="PNG", optimize=True)
-                doc.close()
-                preview_bytes = img_byte_arr.getvalue()
-            except Exception as e:
-                logger.error(f"Error generating PDF preview bytes (sync): {str(e)}")
-                return None
-        elif file_ext in [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff"]:
-            # This part needs to be synchronous
-            try:
-                img = Image.open(io.BytesIO(file_content))
-                if img.mode in ("RGBA", "LA", "P"):
-                    img = img.convert("RGB")
-                img.thumbnail((300, 400), Image.Resampling.LANCZOS)
-                img_byte_arr = io.BytesIO()
-                img.save(img_byte_arr, format="PNG", optimize=True)
-                preview_bytes = img_byte_arr.getvalue()
-            except Exception as e:
-                logger.error(f"Error generating image preview bytes (sync): {str(e)}")
-                return None
-        else:
-            logger.warning(f"Unsupported file type for preview (sync): {file_ext}")
+        if not self._claim_preview_render(preview_path):
             return None
 
-        if preview_bytes:
-            # Synchronous save
-            # This assumes storage service has a synchronous save_file_bytes method
-            self.storage.save_file_bytes_sync(preview_bytes, preview_path, "image/png")
-            return preview_path
+        try:
+            from worker import generate_preview_task
 
+            generate_preview_task.delay(original_file_path)
+        except Exception as e:
+            logger.error(f"Could not queue preview for {original_file_path}: {str(e)}")
         return None
 
-    async def get_preview_url(
-        self, original_file_path: str, expires_in: int = 3600
-    ) -> Optional[str]:
+    @staticmethod
+    def _claim_preview_render(preview_path: str) -> bool:
         """
-        Get a URL for a document preview. Generates the preview if it doesn't exist.
+        Claim the right to queue a render of preview_path with a short-lived
+        Redis SET NX marker. If Redis is unavailable the render is queued
+        anyway; the task itself skips previews that already exist.
         """
-        preview_path = await self.generate_preview(original_file_path)
-        if preview_path:
-            return await self.storage.get_file_url(
-                preview_path, expires_in, content_type="image/png"
+        try:
+            return bool(
+                _get_marker_client().set(
+                    f"preview_queued:{preview_path}",
+                    "1",
+                    nx=True,
+                    ex=PREVIEW_QUEUE_MARKER_TTL_SECONDS,
+                )
             )
-        return None
+        except Exception as e:
+            logger.warning(f"Could not claim preview render for {preview_path}: {e}")
+            return True
 
+    @staticmethod
+    def _set_failure_marker(preview_path: str, failed: bool) -> None:
+        """Record (or clear, after a successful render) a failed render"""
+        key = f"preview_failed:{preview_path}"
+        try:
+            if failed:
+                _get_marker_client().set(
+                    key, "1", ex=PREVIEW_FAILURE_MARKER_TTL_SECONDS
+                )
+            else:
+                _get_marker_client().delete(key)
+        except Exception as e:
+            logger.warning(f"Could not update preview failure for {preview_path}: {e}")
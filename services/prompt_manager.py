@@ -1,86 +1,180 @@
 # simplified_app/services/prompt_manager.py
+import asyncio
 import os
 import json
+import logging
+import time
+from functools import lru_cache
 
 from services.taxonomy_service import TaxonomyService
 
+logger = logging.getLogger(__name__)
+
+
+def _render_taxonomy_compact(structure):
+    """
+    Render the canonical taxonomy as one line per subcategory:
+    ``Primary Category > Subcategory: term; term; ...``
+
+    Much smaller than the equivalent indented JSON, so every analysis prompt
+    costs fewer input tokens. Subcategories without terms are left out since
+    nothing can be mapped to them.
+    """
+    return "\n".join(
+        f"{primary_category} > {subcategory}: {'; '.join(terms)}"
+        for primary_category, subcategories in structure.items()
+        for subcategory, terms in subcategories.items()
+        if terms
+    )
+
+
+def _format_metadata_context(metadata, include_tone=True):
+    """Prior-analysis context line prepended to the modular prompts ("" without metadata)"""
+    if not metadata:
+        return ""
+    return _build_context(
+        str(metadata.get("document_type", "")),
+        str(metadata.get("election_year", "")),
+        str(metadata.get("document_tone", "")) if include_tone else "",
+        include_tone,
+    )
+
+
+@lru_cache(maxsize=256)
+def _build_context(document_type, election_year, document_tone, include_tone):
+    """Render the context line; a batch repeats the same few metadata combinations"""
+    if include_tone:
+        return f"""Based on prior analysis, this is a {document_type} 
+from {election_year} that appears to be {document_tone}.
+"""
+    return f"""Based on prior analysis, this is a {document_type} 
+from {election_year}.
+"""
 
-class PromptManager:
-    """Manager for document analysis prompts with dynamic taxonomy injection"""
 
-    # Bump this whenever the wording of any prompt template in this class
-    # changes in a way that could plausibly change extracted data (not just
-    # cosmetic edits) — e.g. changing the taxonomy instructions, the output
-    # schema, or the analysis instructions. This is deliberately coarse (one
-    # version for the whole class, not per prompt method): the "unified"
-    # prompt is the only one exercised by the normal document pipeline, and
-    # the modular/specific prompts are reachable only via manual admin
-    # reprocessing, so a single counter is enough to flag "something in the
-    # prompt set changed" for downstream data analysis without the overhead
-    # of tracking each of the ~8 prompt methods independently.
-    #
-    # Changelog:
-    #   1 — initial versioned baseline (2026-07-14). No prompt wording changed
-    #       when this was introduced; this just establishes the starting point.
-    PROMPT_VERSION = 1
+def _get_model_capabilities(model):
+    """Get capabilities based on configured model"""
+    if "claude-sonnet-4" in model:
+        return {"vision": True, "structure": "high", "detail": "high"}
+    elif "claude-3-sonnet" in model:
+        return {"vision": True, "structure": "medium", "detail": "medium"}
+    else:
+        return {"vision": True, "structure": "basic", "detail": "basic"}
 
-    def __init__(self, taxonomy_service=None):
-        self.model_capabilities = self._get_model_capabilities()
-        self.base_system_prompt = """You are an expert document analyzer specializing in political and campaign materials. 
-Provide accurate, objective analysis in the exact JSON format requested."""
-        self.taxonomy_service = taxonomy_service
 
-    def _get_model_capabilities(self):
-        """Get capabilities based on configured model"""
-        model = os.getenv("CLAUDE_MODEL", "claude-sonnet-4-6")
+# CLAUDE_MODEL is fixed for the life of the process, so resolve it once and
+# share the result between PromptManager instances (treat it as read-only)
+MODEL_CAPABILITIES = _get_model_capabilities(
+    os.getenv("CLAUDE_MODEL", "claude-sonnet-4-6")
+)
 
-        if "claude-sonnet-4" in model:
-            return {"vision": True, "structure": "high", "detail": "high"}
-        elif "claude-3-sonnet" in model:
-            return {"vision": True, "structure": "medium", "detail": "medium"}
-        else:
-            return {"vision": True, "structure": "basic", "detail": "basic"}
 
-    async def _get_canonical_taxonomy(self):
-        """Get canonical taxonomy structure from database"""
-        if not self.taxonomy_service:
-            # Fallback to empty structure if no taxonomy service
-            return {}
+# Static bodies of the modular prompts, built once at import. Placeholders are
+# filled with str.format_map, so literal braces in the JSON examples are doubled.
+_CORE_METADATA_TEMPLATE = """
+Analyze the document '{filename}' and extract only the core metadata.
 
-        try:
-            # Get the hierarchical taxonomy structure
-            hierarchy = await self.taxonomy_service.get_taxonomy_hierarchy()
-
-            # Convert to the format needed for prompts
-            canonical_structure = {}
-            for primary_category, subcategories in hierarchy.items():
-                canonical_structure[primary_category] = {}
-                for subcategory, terms in subcategories.items():
-                    # Extract just the term names for the prompt
-                    term_names = (
-                        [term["term"] for term in terms]
-                        if isinstance(terms, list)
-                        else []
-                    )
-                    canonical_structure[primary_category][subcategory] = term_names
-
-            return canonical_structure
-        except Exception as e:
-            print(f"Error getting taxonomy: {e}")
-            return {}
+Return ONLY the following JSON. If a value is not found, it MUST be null.
 
-    async def get_unified_analysis_prompt(self, filename):
-        """
-        A single, robust prompt that uses chain-of-thought to improve accuracy
-        and combines metadata, classification, and keyword extraction.
-        """
-        # Get the canonical taxonomy dynamically
-        canonical_taxonomy_structure = await self._get_canonical_taxonomy()
-        taxonomy_for_prompt = json.dumps(canonical_taxonomy_structure, indent=2)
+{{
+  "document_analysis": {{
+    "summary": "Clear 1-2 sentence overview of the document's purpose.",
+    "document_type": "Choose ONLY from: ['mailer', 'digital ad', 'handout', 'poster', 'letter', 'brochure']",
+    "campaign_type": "Choose ONLY from: ['primary', 'general', 'special', 'runoff']",
+    "election_year": "The four-digit election year (e.g., 2024). MUST be null if not found.",
+    "document_tone": "Choose ONLY from: ['positive', 'negative', 'neutral', 'informational', 'contrast']"
+  }}
+}}
 
-        return {
-            "system": self.base_system_prompt,
-            "user": f"""
+Your response MUST be valid JSON formatted exactly as requested above.
+"""
+
+_CLASSIFICATION_TEMPLATE = """{context}Analyze the document '{filename}' and classify it.
+
+Return ONLY the following JSON. If a value is not found, it MUST be null.
+
+{{
+  "classification": {{
+    "category": "Choose ONLY from: ['GOTV', 'attack', 'comparison', 'endorsement', 'issue', 'biographical']",
+    "subcategory": "A specific, one-to-three word description of the narrower topic (e.g., 'Taxes', 'Healthcare Policy'). MUST be null if not applicable.",
+    "rationale": "Briefly justify the category choice."
+  }}
+}}
+
+Your response MUST be valid JSON formatted exactly as requested above.
+"""
+
+_ENTITY_TEMPLATE = """{context}Analyze the document '{filename}' and extract entity information.
+
+Return ONLY the following JSON. If a value is not found, it MUST be null.
+
+{{
+  "entities": {{
+    "client_name": "Full name of the client/candidate. If not mentioned, this value MUST be null.",
+    "opponent_name": "Full name of any opponent mentioned. If no opponent is mentioned, this value MUST be null.",
+    "creation_date": "The creation or print date shown on the document (YYYY-MM-DD format). If no date is visible, this value MUST be null.",
+    "survey_question": "Any survey questions shown. If not applicable, this value MUST be null.",
+    "file_identifier": "Any naming convention or identifier visible in the document. If not applicable, this value MUST be null."
+  }}
+}}
+
+Your response MUST be valid JSON formatted exactly as requested above.
+"""
+
+_TEXT_EXTRACTION_TEMPLATE = """{context}Analyze the document '{filename}' and extract the text content.
+
+Return ONLY the following JSON. If a value is not found, it MUST be null.
+
+{{
+  "extracted_text": {{
+    "main_message": "Primary headline/slogan as a single string. MUST be null if not found.",
+    "supporting_text": "Secondary messages as a single string. MUST be null if not found.",
+    "call_to_action": "Specific voter instruction if present (e.g., 'Vote on Nov 8'). MUST be null if not found."
+  }}
+}}
+
+Your response MUST be valid JSON formatted exactly as requested above.
+"""
+
+_DESIGN_ELEMENTS_TEMPLATE = """{context}Analyze the visual design elements in the document '{filename}'.
+
+Return ONLY the following JSON. If a value is not found, it MUST be null.
+
+{{
+  "design_elements": {{
+    "color_scheme": "List of up to three primary colors (e.g., ['#FF0000', '#0000FF', '#FFFFFF']). MUST be null if not applicable.",
+    "theme": "Choose ONLY from: ['patriotic', 'conservative', 'progressive', 'modern', 'traditional', 'corporate']. MUST be null if not applicable.",
+    "mail_piece_type": "Choose ONLY from: ['postcard', 'letter', 'brochure', 'door hanger', 'digital ad', 'poster']. MUST be null if not applicable.",
+    "geographic_location": "City, State or State only. MUST be null if not found.",
+    "target_audience": "Specific demographic focus (e.g., 'republicans', 'democrats', 'veterans'). MUST be null if not applicable.",
+    "campaign_name": "Candidate and position sought (e.g., 'Smith for Senate'). MUST be null if not applicable.",
+    "visual_elements": "List of key visual elements (e.g., ['flag', 'candidate photo', 'family']). MUST be null if not applicable."
+  }}
+}}
+
+Your response MUST be valid JSON formatted exactly as requested above.
+"""
+
+_COMMUNICATION_FOCUS_TEMPLATE = """{context}Analyze the document '{filename}' and determine its primary communication focus and strategy.
+
+Return ONLY the following JSON. If a value is not found, it MUST be null.
+
+{{
+  "communication_focus": {{
+    "primary_issue": "The main policy issue or focus of the communication. MUST be null if not applicable.",
+    "secondary_issues": "List of other issues mentioned. MUST be null if not applicable.",
+    "messaging_strategy": "Choose ONLY from: ['attack', 'positive', 'comparison', 'biographical', 'endorsement', 'GOTV', 'informational']",
+    "audience_persuasion": "Describe how the document attempts to persuade its audience. MUST be null if not applicable."
+  }}
+}}
+
+Your response MUST be valid JSON formatted exactly as requested above.
+"""
+
+
+# The two taxonomy-bearing prompts. {taxonomy} is substituted once per taxonomy
+# refresh (see _prerender_taxonomy); {filename}/{context} per call.
+_UNIFIED_ANALYSIS_TEMPLATE = """
 Analyze the document '{filename}'. Think through the following internally before writing your response — do NOT output your reasoning, only the final JSON.
 
 Internal checklist (do not output):
@@ -92,9 +186,9 @@ Internal checklist (do not output):
 - Verbatim keyphrases: identify 10-15 important phrases used in the document.
 - Map each keyphrase to the single most relevant canonical term from the taxonomy below.
 
-**Official Canonical Taxonomy:**
-```json
-{taxonomy_for_prompt}
+**Official Canonical Taxonomy** (one line per subcategory, formatted as `Primary Category > Subcategory: term; term; ...`):
+```
+{taxonomy}
 ```
 
 Output ONLY the following JSON — no explanation, no markdown, no text before or after it:
@@ -128,24 +222,9 @@ Output ONLY the following JSON — no explanation, no markdown, no text before o
 }}
 
 Rules: if you cannot find evidence for a field its value MUST be null. For enum fields use only the listed options. Output raw JSON only — no code fences, no extra text.
-""",
-        }
-
-    async def get_taxonomy_keyword_prompt(self, filename, metadata=None):
-        """Generate a prompt for hierarchical taxonomy keyword extraction with dynamic taxonomy injection"""
-        context = ""
-        if metadata:
-            context = f"""Based on prior analysis, this is a {metadata.get('document_type', '')} 
-from {metadata.get('election_year', '')} that appears to be {metadata.get('document_tone', '')}.
 """
 
-        # Get the canonical taxonomy dynamically
-        canonical_taxonomy_structure = await self._get_canonical_taxonomy()
-        taxonomy_for_prompt = json.dumps(canonical_taxonomy_structure, indent=2)
-
-        return {
-            "system": self.base_system_prompt,
-            "user": f"""
+_TAXONOMY_KEYWORD_TEMPLATE = """
 {context}Analyze the document '{filename}' and perform the following three steps:
 
 **Step 1: Extract Verbatim Keyphrases**
@@ -154,9 +233,9 @@ Identify 10-15 of the most important and specific keywords or keyphrases mention
 **Step 2: Map to Canonical Taxonomy**
 For each verbatim keyphrase you extracted, map it to the single most relevant canonical term from the official taxonomy provided below.
 
-**Official Canonical Taxonomy:**
-```json
-{taxonomy_for_prompt}
+**Official Canonical Taxonomy** (one line per subcategory, formatted as `Primary Category > Subcategory: term; term; ...`):
+```
+{taxonomy}
 ```
 
 **Step 3: Generate JSON Output**
@@ -188,165 +267,207 @@ Provide your response ONLY in the following JSON format. For each verbatim term,
 - Every verbatim_term MUST be an exact phrase from the document
 
 Your response MUST be valid JSON formatted exactly as requested above.
-""",
-        }
+"""
+
+
+def _prerender_taxonomy(template, taxonomy_text):
+    """Fill {taxonomy} ahead of time, leaving the per-call placeholders for format_map"""
+    escaped = taxonomy_text.replace("{", "{{").replace("}", "}}")
+    return template.replace("{taxonomy}", escaped)
+
+
+class PromptManager:
+    """Manager for document analysis prompts with dynamic taxonomy injection"""
+
+    # Bump this whenever the wording of any prompt template in this class
+    # changes in a way that could plausibly change extracted data (not just
+    # cosmetic edits) — e.g. changing the taxonomy instructions, the output
+    # schema, or the analysis instructions. This is deliberately coarse (one
+    # version for the whole class, not per prompt method): the "unified"
+    # prompt is the only one exercised by the normal document pipeline, and
+    # the modular/specific prompts are reachable only via manual admin
+    # reprocessing, so a single counter is enough to flag "something in the
+    # prompt set changed" for downstream data analysis without the overhead
+    # of tracking each of the ~8 prompt methods independently.
+    #
+    # Changelog:
+    #   1 — initial versioned baseline (2026-07-14). No prompt wording changed
+    #       when this was introduced; this just establishes the starting point.
+    #   2 — taxonomy embedded as compact "Primary > Subcategory: terms" lines
+    #       instead of indented JSON (2026-10-17).
+    PROMPT_VERSION = 2
+
+    # The taxonomy changes rarely; reuse the loaded structure and its prompt
+    # rendering for this long before hitting the database again.
+    TAXONOMY_CACHE_TTL_SECONDS = 300
+
+    def __init__(self, taxonomy_service=None):
+        self.model_capabilities = MODEL_CAPABILITIES
+        self.base_system_prompt = """You are an expert document analyzer specializing in political and campaign materials. 
+Provide accurate, objective analysis in the exact JSON format requested."""
+        self.taxonomy_service = taxonomy_service
+        self._taxonomy_cache = None
+        self._taxonomy_templates = None
+        self._taxonomy_expires_at = 0.0
+        # Coalesces concurrent refreshes so a cache miss loads the taxonomy once
+        self._taxonomy_lock = asyncio.Lock()
+
+    async def _get_canonical_taxonomy(self):
+        """Get canonical taxonomy structure from database (cached for TAXONOMY_CACHE_TTL_SECONDS)"""
+        if not self.taxonomy_service:
+            # Fallback to empty structure if no taxonomy service
+            return {}
+
+        if time.monotonic() < self._taxonomy_expires_at:
+            return self._taxonomy_cache
+
+        async with self._taxonomy_lock:
+            # Another caller may have refreshed the cache while we waited
+            if time.monotonic() < self._taxonomy_expires_at:
+                return self._taxonomy_cache
+
+            try:
+                # Get the hierarchical taxonomy structure
+                hierarchy = await self.taxonomy_service.get_taxonomy_hierarchy()
+
+                # Convert to the format needed for prompts: just the term names
+                canonical_structure = {
+                    primary_category: {
+                        subcategory: (
+                            [term["term"] for term in terms]
+                            if isinstance(terms, list)
+                            else []
+                        )
+                        for subcategory, terms in subcategories.items()
+                    }
+                    for primary_category, subcategories in hierarchy.items()
+                }
+
+                taxonomy_text = _render_taxonomy_compact(canonical_structure)
+                self._taxonomy_cache = canonical_structure
+                self._taxonomy_templates = self._build_taxonomy_templates(
+                    taxonomy_text
+                )
+                logger.info(
+                    f"Taxonomy prompt block: {len(taxonomy_text)} chars "
+                    f"(indented JSON would be "
+                    f"{len(json.dumps(canonical_structure, indent=2))})"
+                )
+                self._taxonomy_expires_at = (
+                    time.monotonic() + self.TAXONOMY_CACHE_TTL_SECONDS
+                )
+                return canonical_structure
+            except Exception as e:
+                print(f"Error getting taxonomy: {e}")
+                return {}
+
+    @staticmethod
+    def _build_taxonomy_templates(taxonomy_text):
+        """Pre-render the (unified, taxonomy keyword) prompt templates for a taxonomy"""
+        return (
+            _prerender_taxonomy(_UNIFIED_ANALYSIS_TEMPLATE, taxonomy_text),
+            _prerender_taxonomy(_TAXONOMY_KEYWORD_TEMPLATE, taxonomy_text),
+        )
+
+    async def _get_taxonomy_prompt_templates(self):
+        """Get the taxonomy-bearing prompt templates, rebuilt only on taxonomy refresh"""
+        canonical_taxonomy_structure = await self._get_canonical_taxonomy()
+        if (
+            self._taxonomy_templates is not None
+            and canonical_taxonomy_structure is self._taxonomy_cache
+        ):
+            return self._taxonomy_templates
+        return self._build_taxonomy_templates(
+            _render_taxonomy_compact(canonical_taxonomy_structure)
+        )
+
+    async def get_unified_analysis_prompt(self, filename):
+        """
+        A single, robust prompt that uses chain-of-thought to improve accuracy
+        and combines metadata, classification, and keyword extraction.
+        """
+        # Taxonomy is already rendered into the template; only the filename varies
+        unified_template, _ = await self._get_taxonomy_prompt_templates()
 
-    def get_core_metadata_prompt(self, filename):
-        """Generate a prompt for core metadata extraction"""
         return {
             "system": self.base_system_prompt,
-            "user": f"""
-Analyze the document '{filename}' and extract only the core metadata.
+            "user": unified_template.format_map({"filename": filename}),
+        }
 
-Return ONLY the following JSON. If a value is not found, it MUST be null.
+    async def get_taxonomy_keyword_prompt(self, filename, metadata=None):
+        """Generate a prompt for hierarchical taxonomy keyword extraction with dynamic taxonomy injection"""
+        _, keyword_template = await self._get_taxonomy_prompt_templates()
 
-{{
-  "document_analysis": {{
-    "summary": "Clear 1-2 sentence overview of the document's purpose.",
-    "document_type": "Choose ONLY from: ['mailer', 'digital ad', 'handout', 'poster', 'letter', 'brochure']",
-    "campaign_type": "Choose ONLY from: ['primary', 'general', 'special', 'runoff']",
-    "election_year": "The four-digit election year (e.g., 2024). MUST be null if not found.",
-    "document_tone": "Choose ONLY from: ['positive', 'negative', 'neutral', 'informational', 'contrast']"
-  }}
-}}
+        return {
+            "system": self.base_system_prompt,
+            "user": keyword_template.format_map(
+                {"context": _format_metadata_context(metadata), "filename": filename}
+            ),
+        }
 
-Your response MUST be valid JSON formatted exactly as requested above.
-""",
+    def get_core_metadata_prompt(self, filename):
+        """Generate a prompt for core metadata extraction"""
+        return {
+            "system": self.base_system_prompt,
+            "user": _CORE_METADATA_TEMPLATE.format_map({"filename": filename}),
         }
 
     def get_classification_prompt(self, filename, metadata=None):
         """Generate a prompt for document classification"""
-        context = ""
-        if metadata:
-            context = f"""Based on prior analysis, this is a {metadata.get('document_type', '')} 
-from {metadata.get('election_year', '')} that appears to be {metadata.get('document_tone', '')}.
-"""
-
         return {
             "system": self.base_system_prompt,
-            "user": f"""{context}Analyze the document '{filename}' and classify it.
-
-Return ONLY the following JSON. If a value is not found, it MUST be null.
-
-{{
-  "classification": {{
-    "category": "Choose ONLY from: ['GOTV', 'attack', 'comparison', 'endorsement', 'issue', 'biographical']",
-    "subcategory": "A specific, one-to-three word description of the narrower topic (e.g., 'Taxes', 'Healthcare Policy'). MUST be null if not applicable.",
-    "rationale": "Briefly justify the category choice."
-  }}
-}}
-
-Your response MUST be valid JSON formatted exactly as requested above.
-""",
+            "user": _CLASSIFICATION_TEMPLATE.format_map(
+                {
+                    "context": _format_metadata_context(metadata),
+                    "filename": filename,
+                }
+            ),
         }
 
     def get_entity_prompt(self, filename, metadata=None):
         """Generate a prompt for entity extraction"""
-        context = ""
-        if metadata:
-            context = f"""Based on prior analysis, this is a {metadata.get('document_type', '')} 
-from {metadata.get('election_year', '')} that appears to be {metadata.get('document_tone', '')}.
-"""
-
         return {
             "system": self.base_system_prompt,
-            "user": f"""{context}Analyze the document '{filename}' and extract entity information.
-
-Return ONLY the following JSON. If a value is not found, it MUST be null.
-
-{{
-  "entities": {{
-    "client_name": "Full name of the client/candidate. If not mentioned, this value MUST be null.",
-    "opponent_name": "Full name of any opponent mentioned. If no opponent is mentioned, this value MUST be null.",
-    "creation_date": "The creation or print date shown on the document (YYYY-MM-DD format). If no date is visible, this value MUST be null.",
-    "survey_question": "Any survey questions shown. If not applicable, this value MUST be null.",
-    "file_identifier": "Any naming convention or identifier visible in the document. If not applicable, this value MUST be null."
-  }}
-}}
-
-Your response MUST be valid JSON formatted exactly as requested above.
-""",
+            "user": _ENTITY_TEMPLATE.format_map(
+                {
+                    "context": _format_metadata_context(metadata),
+                    "filename": filename,
+                }
+            ),
         }
 
     def get_text_extraction_prompt(self, filename, metadata=None):
         """Generate a prompt for text extraction"""
-        context = ""
-        if metadata:
-            context = f"""Based on prior analysis, this is a {metadata.get('document_type', '')} 
-from {metadata.get('election_year', '')}.
-"""
-
         return {
             "system": self.base_system_prompt,
-            "user": f"""{context}Analyze the document '{filename}' and extract the text content.
-
-Return ONLY the following JSON. If a value is not found, it MUST be null.
-
-{{
-  "extracted_text": {{
-    "main_message": "Primary headline/slogan as a single string. MUST be null if not found.",
-    "supporting_text": "Secondary messages as a single string. MUST be null if not found.",
-    "call_to_action": "Specific voter instruction if present (e.g., 'Vote on Nov 8'). MUST be null if not found."
-  }}
-}}
-
-Your response MUST be valid JSON formatted exactly as requested above.
-""",
+            "user": _TEXT_EXTRACTION_TEMPLATE.format_map(
+                {
+                    "context": _format_metadata_context(metadata, include_tone=False),
+                    "filename": filename,
+                }
+            ),
         }
 
     def get_design_elements_prompt(self, filename, metadata=None):
         """Generate a prompt for design element analysis"""
-        context = ""
-        if metadata:
-            context = f"""Based on prior analysis, this is a {metadata.get('document_type', '')} 
-from {metadata.get('election_year', '')}.
-"""
-
         return {
             "system": self.base_system_prompt,
-            "user": f"""{context}Analyze the visual design elements in the document '{filename}'.
-
-Return ONLY the following JSON. If a value is not found, it MUST be null.
-
-{{
-  "design_elements": {{
-    "color_scheme": "List of up to three primary colors (e.g., ['#FF0000', '#0000FF', '#FFFFFF']). MUST be null if not applicable.",
-    "theme": "Choose ONLY from: ['patriotic', 'conservative', 'progressive', 'modern', 'traditional', 'corporate']. MUST be null if not applicable.",
-    "mail_piece_type": "Choose ONLY from: ['postcard', 'letter', 'brochure', 'door hanger', 'digital ad', 'poster']. MUST be null if not applicable.",
-    "geographic_location": "City, State or State only. MUST be null if not found.",
-    "target_audience": "Specific demographic focus (e.g., 'republicans', 'democrats', 'veterans'). MUST be null if not applicable.",
-    "campaign_name": "Candidate and position sought (e.g., 'Smith for Senate'). MUST be null if not applicable.",
-    "visual_elements": "List of key visual elements (e.g., ['flag', 'candidate photo', 'family']). MUST be null if not applicable."
-  }}
-}}
-
-Your response MUST be valid JSON formatted exactly as requested above.
-""",
+            "user": _DESIGN_ELEMENTS_TEMPLATE.format_map(
+                {
+                    "context": _format_metadata_context(metadata, include_tone=False),
+                    "filename": filename,
+                }
+            ),
         }
 
     def get_communication_focus_prompt(self, filename, metadata=None):
         """Generate a prompt for communication focus analysis"""
-        context = ""
-        if metadata:
-            context = f"""Based on prior analysis, this is a {metadata.get('document_type', '')} 
-from {metadata.get('election_year', '')} that appears to be {metadata.get('document_tone', '')}.
-"""
-
         return {
             "system": self.base_system_prompt,
-            "user": f"""{context}Analyze the document '{filename}' and determine its primary communication focus and strategy.
-
-Return ONLY the following JSON. If a value is not found, it MUST be null.
-
-{{
-  "communication_focus": {{
-    "primary_issue": "The main policy issue or focus of the communication. MUST be null if not applicable.",
-    "secondary_issues": "List of other issues mentioned. MUST be null if not applicable.",
-    "messaging_strategy": "Choose ONLY from: ['attack', 'positive', 'comparison', 'biographical', 'endorsement', 'GOTV', 'informational']",
-    "audience_persuasion": "Describe how the document attempts to persuade its audience. MUST be null if not applicable."
-  }}
-}}
-
-Your response MUST be valid JSON formatted exactly as requested above.
-""",
+            "user": _COMMUNICATION_FOCUS_TEMPLATE.format_map(
+                {
+                    "context": _format_metadata_context(metadata),
+                    "filename": filename,
+                }
+            ),
         }
@@ -5,39 +5,44 @@ Redis-based session middleware - replaces Starlette's SessionMiddleware
 import logging
 from typing import Dict, Any, Optional
 from starlette.types import ASGIApp, Receive, Scope, Send
-from starlette.requests import Request
-from starlette.responses import Response
-import secrets
 import time
 
 from services.redis_session_service import redis_session_service
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
 
-class RedisSession(dict):
-    """Session object that behaves like a dictionary but persists to Redis"""
+# Unbound dict methods for the session overrides; calling these directly
+# skips building a super() proxy on every session read/write
+_dict_get = dict.get
+_dict_setitem = dict.__setitem__
 
-    def __init__(self, session_id: str = None, initial_data: Dict[str, Any] = None):
-        super().__init__()
-        self._session_id = session_id
-        self._modified = False
-        self._new = session_id is None
+# ASGI scope types that carry a session (lifespan does not)
+_SESSION_SCOPES = frozenset(("http", "websocket"))
 
-        # Load initial data
-        if initial_data:
-            self.update(initial_data)
-            self._modified = False  # Reset modified flag after initial load
 
-    @property
-    def session_id(self) -> Optional[str]:
-        """Get the session ID"""
-        return self._session_id
+def _append_response_header(message: dict, header: tuple) -> None:
+    """Append a header to an http.response.start message in place"""
+    headers = message.setdefault("headers", [])
+    if not isinstance(headers, list):
+        # ASGI allows any iterable here; only copy when it can't be appended to
+        headers = message["headers"] = list(headers)
+    headers.append(header)
 
-    @property
-    def is_new(self) -> bool:
-        """Check if this is a new session"""
-        return self._new
+
+class FallbackSession(dict):
+    """
+    Session dict that tracks whether it has been modified. Used as-is (in
+    memory only) when Redis is unavailable; RedisSession adds persistence.
+    """
+
+    __slots__ = ("_modified",)
+
+    def __init__(self, initial_data: Dict[str, Any] = None):
+        # Load initial data straight into the dict; it is not a modification
+        super().__init__(initial_data or ())
+        self._modified = False
 
     @property
     def is_modified(self) -> bool:
@@ -45,8 +50,15 @@ class RedisSession(dict):
         return self._modified
 
     def __setitem__(self, key, value):
-        """Override to track modifications"""
-        super().__setitem__(key, value)
+        """Override to track modifications (re-setting an equal value is a no-op)"""
+        current = _dict_get(self, key, _MISSING)
+        # Re-assigning the same dict/list may follow an in-place mutation, so
+        # that still counts as a change
+        if current == value and not (
+            current is value and isinstance(value, (dict, list, set))
+        ):
+            return
+        _dict_setitem(self, key, value)
         self._modified = True
 
     def __delitem__(self, key):
@@ -76,10 +88,46 @@ class RedisSession(dict):
         return super().setdefault(key, default)
 
     def update(self, *args, **kwargs):
-        """Override to track modifications"""
-        if args or kwargs:
-            self._modified = True
-        super().update(*args, **kwargs)
+        """Override to track modifications (only keys whose value changes count)"""
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+
+class RedisSession(FallbackSession):
+    """Session object that behaves like a dictionary but persists to Redis"""
+
+    __slots__ = ("_session_id", "_new", "_last_refresh")
+
+    def __init__(
+        self,
+        session_id: str = None,
+        initial_data: Dict[str, Any] = None,
+        last_refresh: int = 0,
+    ):
+        super().__init__(initial_data)
+        self._session_id = session_id
+        self._new = session_id is None
+        self._last_refresh = last_refresh
+
+    @property
+    def session_id(self) -> Optional[str]:
+        """Get the session ID"""
+        return self._session_id
+
+    @property
+    def is_new(self) -> bool:
+        """Check if this is a new session"""
+        return self._new
+
+    @property
+    def last_refresh(self) -> int:
+        """When the session cookie was last sent (epoch seconds, 0 if unknown)"""
+        return self._last_refresh
+
+    def mark_refreshed(self, timestamp: int) -> None:
+        """Record a cookie refresh without rewriting the session body"""
+        if redis_session_service.mark_refreshed(self._session_id, timestamp):
+            self._last_refresh = timestamp
 
     def save(self) -> bool:
         """Save session to Redis"""
@@ -88,24 +136,24 @@ class RedisSession(dict):
 
         try:
             if self._new:
-                # Create new session
-                self._session_id = redis_session_service.create_session(dict(self))
+                # Create new session. The service serializes immediately, so
+                # the session is passed as-is rather than copied; the metadata
+                # key it stamps (_created_at) lands here too.
+                self._session_id = redis_session_service.create_session(self)
                 if self._session_id:
                     self._new = False
                     self._modified = False
-                    logger.debug(f"Created new session: {self._session_id}")
+                    logger.debug("Created new session: %s", self._session_id)
                     return True
                 else:
                     logger.error("Failed to create new session")
                     return False
             else:
                 # Update existing session
-                success = redis_session_service.update_session(
-                    self._session_id, dict(self)
-                )
+                success = redis_session_service.update_session(self._session_id, self)
                 if success:
                     self._modified = False
-                    logger.debug(f"Updated session: {self._session_id}")
+                    logger.debug("Updated session: %s", self._session_id)
                     return True
                 else:
                     logger.error(f"Failed to update session: {self._session_id}")
@@ -134,6 +182,25 @@ class RedisSession(dict):
             return False
 
 
+class _SessionSender:
+    """ASGI send wrapper that saves the session before the response starts"""
+
+    __slots__ = ("middleware", "session", "send")
+
+    def __init__(
+        self, middleware: "RedisSessionMiddleware", session: RedisSession, send: Send
+    ):
+        self.middleware = middleware
+        self.session = session
+        self.send = send
+
+    async def __call__(self, message) -> None:
+        if message["type"] == "http.response.start":
+            # Save session before sending response
+            await self.middleware._save_session(self.session, message)
+        await self.send(message)
+
+
 class RedisSessionMiddleware:
     """Redis-based session middleware"""
 
@@ -151,17 +218,22 @@ class RedisSessionMiddleware:
         self.app = app
         self.secret_key = secret_key
         self.session_cookie = session_cookie
+        self._cookie_bytes = session_cookie.encode("latin1")
         self.max_age = max_age
         self.path = path
         self.same_site = same_site
         self.https_only = https_only
         self.domain = domain
 
+        # Only the session id varies between responses; build the rest once
+        self._cookie_prefix_bytes = self._cookie_bytes + b"="
+        self._cookie_suffix_bytes = self._create_cookie_suffix().encode("latin1")
+
     # Paths that don't need session handling — avoids Redis calls on health checks
     _skip_session_paths = ("/health", "/static", "/favicon.ico")
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        if scope["type"] not in ("http", "websocket"):
+        if scope["type"] not in _SESSION_SCOPES:
             await self.app(scope, receive, send)
             return
 
@@ -177,40 +249,26 @@ class RedisSessionMiddleware:
         scope["session"] = session
 
         # Wrap send to save session on response
-        async def send_wrapper(message):
-            if message["type"] == "http.response.start":
-                # Save session before sending response
-                await self._save_session(session, message)
-            await send(message)
-
-        await self.app(scope, receive, send_wrapper)
+        await self.app(scope, receive, _SessionSender(self, session, send))
 
     async def _load_session(self, scope: Scope) -> RedisSession:
         """Load session from Redis"""
         try:
-            # Get session ID from cookie
-            session_id = None
-            cookies = {}
-
-            # Parse cookies from headers
-            for name, value in scope.get("headers", []):
-                if name == b"cookie":
-                    cookie_header = value.decode("latin1")
-                    for cookie in cookie_header.split(";"):
-                        if "=" in cookie:
-                            key, val = cookie.strip().split("=", 1)
-                            cookies[key] = val
-
-            session_id = cookies.get(self.session_cookie)
+            session_id = self._get_session_id(scope)
 
             if session_id:
                 # Try to load existing session
-                session_data = redis_session_service.get_session(session_id)
+                session_data, last_refresh = redis_session_service.load_session(
+                    session_id
+                )
                 if session_data:
-                    logger.debug(f"Loaded existing session: {session_id}")
-                    return RedisSession(session_id, session_data)
+                    # Older sessions kept the refresh time in the body; drop it
+                    # so it is not written back on the next save
+                    session_data.pop("_last_refresh", None)
+                    logger.debug("Loaded existing session: %s", session_id)
+                    return RedisSession(session_id, session_data, last_refresh)
                 else:
-                    logger.debug(f"Session {session_id} not found or expired")
+                    logger.debug("Session %s not found or expired", session_id)
 
             # Create new session
             logger.debug("Creating new session")
@@ -220,31 +278,56 @@ class RedisSessionMiddleware:
             logger.error(f"Error loading session: {e}")
             return RedisSession()
 
+    def _get_session_id(self, scope: Scope):
+        """Find the session cookie value, stopping at the first match"""
+        for name, value in scope.get("headers", []):
+            if name != b"cookie":
+                continue
+            for part in value.split(b";"):
+                key, sep, val = part.strip().partition(b"=")
+                if sep and key == self._cookie_bytes:
+                    return val.decode("latin1")
+        return None
+
     async def _save_session(self, session: RedisSession, message: dict) -> None:
         """Save session and set cookie"""
         try:
-            # Save session to Redis
-            if session.is_modified or session.is_new:
+            # An unchanged session keeps the cookie the browser already has;
+            # only re-send it periodically so Max-Age keeps sliding forward
+            now = int(time.time())
+            refresh_due = bool(self.max_age) and (
+                now - session.last_refresh > self.max_age // 4
+            )
+            if not (session.is_new or session.is_modified or refresh_due):
+                return
+
+            # Save session to Redis; a refresh alone leaves the body untouched
+            if session.is_new or session.is_modified:
                 success = session.save()
                 if not success:
                     logger.error("Failed to save session")
                     return
 
+            if refresh_due:
+                session.mark_refreshed(now)
+
             # Set session cookie if we have a session ID
             if session.session_id:
-                cookie_value = self._create_session_cookie(session.session_id)
+                cookie_value = (
+                    self._cookie_prefix_bytes
+                    + session.session_id.encode("latin1")
+                    + self._cookie_suffix_bytes
+                )
 
                 # Add Set-Cookie header
-                headers = list(message.get("headers", []))
-                headers.append((b"set-cookie", cookie_value.encode("latin1")))
-                message["headers"] = headers
+                _append_response_header(message, (b"set-cookie", cookie_value))
 
         except Exception as e:
             logger.error(f"Error saving session: {e}")
 
-    def _create_session_cookie(self, session_id: str) -> str:
-        """Create session cookie string"""
-        cookie_parts = [f"{self.session_cookie}={session_id}"]
+    def _create_cookie_suffix(self) -> str:
+        """Create the attribute part of the session cookie (after name=value)"""
+        cookie_parts = [""]  # joins to a leading "; " after name=value
 
         if self.max_age:
             cookie_parts.append(f"Max-Age={self.max_age}")
@@ -266,44 +349,6 @@ class RedisSessionMiddleware:
         return "; ".join(cookie_parts)
 
 
-class FallbackSession(dict):
-    """Fallback session that works in memory when Redis is unavailable"""
-
-    def __init__(self):
-        super().__init__()
-        self._modified = False
-
-    def __setitem__(self, key, value):
-        super().__setitem__(key, value)
-        self._modified = True
-
-    def __delitem__(self, key):
-        super().__delitem__(key)
-        self._modified = True
-
-    def clear(self):
-        super().clear()
-        self._modified = True
-
-    def pop(self, key, default=None):
-        self._modified = True
-        return super().pop(key, default)
-
-    def popitem(self):
-        self._modified = True
-        return super().popitem()
-
-    def setdefault(self, key, default=None):
-        if key not in self:
-            self._modified = True
-        return super().setdefault(key, default)
-
-    def update(self, *args, **kwargs):
-        if args or kwargs:
-            self._modified = True
-        super().update(*args, **kwargs)
-
-
 class FallbackSessionMiddleware:
     """Fallback session middleware when Redis is not available"""
 
@@ -311,7 +356,7 @@ class FallbackSessionMiddleware:
         self.app = app
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        if scope["type"] not in ("http", "websocket"):
+        if scope["type"] not in _SESSION_SCOPES:
             await self.app(scope, receive, send)
             return
 
@@ -321,11 +366,10 @@ class FallbackSessionMiddleware:
         # Add warning header
         async def send_wrapper(message):
             if message["type"] == "http.response.start":
-                headers = list(message.get("headers", []))
-                headers.append(
-                    (b"x-session-warning", b"Fallback session - data will not persist")
+                _append_response_header(
+                    message,
+                    (b"x-session-warning", b"Fallback session - data will not persist"),
                 )
-                message["headers"] = headers
             await send(message)
 
         await self.app(scope, receive, send_wrapper)
@@ -4,20 +4,76 @@ Redis-based session service - replaces SessionMiddleware with Redis storage
 
 import json
 import logging
+import os
 import secrets
+import socket
 import time
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import redis
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import base64
 import hashlib
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
+
 from config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# AES-GCM standard 96-bit nonce, stored in front of each ciphertext
+SESSION_NONCE_BYTES = 12
+
+# Every request loads and often saves its session, so connections are pooled
+# and kept warm rather than reopened. Callers block up to
+# SESSION_POOL_TIMEOUT seconds for a free connection instead of erroring.
+SESSION_POOL_MAX_CONNECTIONS = 64
+SESSION_POOL_TIMEOUT = 5
+
+# Probe idle connections after 60s, every 15s, drop after 4 misses. The
+# constants are Linux names; elsewhere only SO_KEEPALIVE itself is set.
+SESSION_SOCKET_KEEPALIVE_OPTIONS = {
+    getattr(socket, name): value
+    for name, value in (
+        ("TCP_KEEPIDLE", 60),
+        ("TCP_KEEPINTVL", 15),
+        ("TCP_KEEPCNT", 4),
+    )
+    if hasattr(socket, name)
+}
+
+# GET plus TTL reset in one server-side step, also returning the session's
+# plain last-cookie-refresh key (KEYS[2]). Runs via EVALSHA, so only the
+# script's SHA crosses the wire once Redis has cached it.
+GET_AND_TOUCH_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if not value then
+    return {false, false}
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return {value, redis.call('GET', KEYS[2])}
+"""
+
+
+def _dumps_session(session_data: Dict[str, Any]) -> bytes:
+    """Serialize session data to UTF-8 JSON bytes"""
+    if orjson is not None:
+        # NON_STR_KEYS matches json.dumps, which coerces int keys to strings
+        return orjson.dumps(session_data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(session_data).encode()
+
+
+def _loads_session(serialized_data: bytes) -> Dict[str, Any]:
+    """Deserialize session data from UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.loads(serialized_data)
+    return json.loads(serialized_data)
+
 
 class RedisSessionService:
     """Redis-based session management service"""
@@ -25,7 +81,14 @@ class RedisSessionService:
     def __init__(self):
         self.redis_client = None
         self.encryption_key = None
+        self._aead = None
+        self._legacy_fernet = None
         self.session_prefix = "session:"
+        # Last cookie refresh time lives in its own small plain key so that
+        # sliding the cookie forward never re-encrypts the session body.
+        # Kept out of session_prefix so SCAN-based stats don't count it.
+        self.refresh_prefix = "session_refresh:"
+        self._keepttl_supported = True
         self.default_ttl = settings.session_timeout_hours * 3600  # Convert to seconds
         self._initialize_redis()
         self._initialize_encryption()
@@ -37,14 +100,24 @@ class RedisSessionService:
 
         for attempt in range(1, retries + 1):
             try:
-                self.redis_client = redis.from_url(
+                # redis-py parses replies with hiredis when it is installed
+                pool = redis.BlockingConnectionPool.from_url(
                     redis_url,
-                    decode_responses=True,
+                    max_connections=SESSION_POOL_MAX_CONNECTIONS,
+                    timeout=SESSION_POOL_TIMEOUT,
+                    # Session values are raw ciphertext bytes; Redis is 8-bit clean
+                    decode_responses=False,
                     socket_connect_timeout=5,
                     socket_timeout=5,
+                    socket_keepalive=True,
+                    socket_keepalive_options=SESSION_SOCKET_KEEPALIVE_OPTIONS,
                     retry_on_timeout=True,
                     health_check_interval=30,
                 )
+                self.redis_client = redis.Redis(connection_pool=pool)
+                self._get_and_touch_script = self.redis_client.register_script(
+                    GET_AND_TOUCH_SCRIPT
+                )
                 self.redis_client.ping()
                 logger.info(f"Redis connection established successfully (attempt {attempt})")
                 return
@@ -65,52 +138,82 @@ class RedisSessionService:
                 logger.warning("No session secret key configured, using temporary key")
                 session_secret = secrets.token_urlsafe(32)
 
-            # Derive a consistent encryption key from the session secret
+            # Derive a consistent 256-bit key from the session secret
             key_material = hashlib.sha256(session_secret.encode()).digest()
-            self.encryption_key = base64.urlsafe_b64encode(key_material)
+            self.encryption_key = key_material
+
+            # AES-256-GCM goes straight to OpenSSL's AES-NI/PCLMULQDQ path and
+            # authenticates without a separate HMAC pass
+            aead = AESGCM(key_material)
+            # Sessions written before the switch to AES-GCM are Fernet tokens
+            # under the same secret; still readable until they expire
+            self._legacy_fernet = Fernet(base64.urlsafe_b64encode(key_material))
 
             # Test encryption
-            fernet = Fernet(self.encryption_key)
             test_data = "test"
-            encrypted = fernet.encrypt(test_data.encode())
-            decrypted = fernet.decrypt(encrypted).decode()
+            nonce = os.urandom(SESSION_NONCE_BYTES)
+            encrypted = aead.encrypt(nonce, test_data.encode(), None)
+            decrypted = aead.decrypt(nonce, encrypted, None).decode()
 
             if decrypted != test_data:
                 raise ValueError("Encryption test failed")
 
+            # Reused for every encrypt/decrypt instead of re-deriving the keys
+            self._aead = aead
+
             logger.info("Session encryption initialized successfully")
 
         except Exception as e:
             logger.error(f"Failed to initialize session encryption: {e}")
             self.encryption_key = None
+            self._aead = None
+            self._legacy_fernet = None
 
-    def _encrypt_data(self, data: str) -> str:
-        """Encrypt session data"""
+    def _encrypt_data(self, data: bytes) -> bytes:
+        """Encrypt session data (raw nonce + AES-GCM ciphertext)"""
         if not self.encryption_key:
             return data
 
         try:
-            fernet = Fernet(self.encryption_key)
-            encrypted = fernet.encrypt(data.encode())
-            return base64.urlsafe_b64encode(encrypted).decode()
+            nonce = os.urandom(SESSION_NONCE_BYTES)
+            return nonce + self._aead.encrypt(nonce, data, None)
         except Exception as e:
             logger.error(f"Failed to encrypt session data: {e}")
             return data
 
-    def _decrypt_data(self, encrypted_data: str) -> str:
+    def _decrypt_data(self, encrypted_data: bytes) -> bytes:
         """Decrypt session data"""
         if not self.encryption_key:
             return encrypted_data
 
         try:
-            fernet = Fernet(self.encryption_key)
-            decoded = base64.urlsafe_b64decode(encrypted_data.encode())
-            decrypted = fernet.decrypt(decoded)
-            return decrypted.decode()
+            try:
+                return self._aead.decrypt(
+                    encrypted_data[:SESSION_NONCE_BYTES],
+                    encrypted_data[SESSION_NONCE_BYTES:],
+                    None,
+                )
+            except InvalidTag:
+                return self._decrypt_legacy(encrypted_data)
         except Exception as e:
             logger.error(f"Failed to decrypt session data: {e}")
             return encrypted_data
 
+    def _decrypt_legacy(self, encrypted_data: bytes) -> bytes:
+        """
+        Decrypt a value stored as base64 text by an earlier version: either
+        base64(nonce + AES-GCM ciphertext) or base64(Fernet token). Both can
+        go once sessions written before the switch to raw bytes have expired
+        (session_timeout_hours).
+        """
+        decoded = base64.urlsafe_b64decode(encrypted_data)
+        try:
+            return self._aead.decrypt(
+                decoded[:SESSION_NONCE_BYTES], decoded[SESSION_NONCE_BYTES:], None
+            )
+        except InvalidTag:
+            return self._legacy_fernet.decrypt(decoded)
+
     def generate_session_id(self) -> str:
         """Generate a secure session ID"""
         return secrets.token_urlsafe(32)
@@ -119,6 +222,10 @@ class RedisSessionService:
         """Get Redis key for session"""
         return f"{self.session_prefix}{session_id}"
 
+    def _get_refresh_key(self, session_id: str) -> str:
+        """Get Redis key holding the session's last cookie refresh time"""
+        return f"{self.refresh_prefix}{session_id}"
+
     def create_session(self, session_data: Dict[str, Any] = None) -> str:
         """Create a new session and return session ID"""
         if not self.redis_client:
@@ -133,18 +240,24 @@ class RedisSessionService:
             if session_data is None:
                 session_data = {}
 
-            # Add metadata
-            session_data["_created_at"] = datetime.now().isoformat()
-            session_data["_last_accessed"] = datetime.now().isoformat()
+            # Add metadata. _created_at is an integer in milliseconds since
+            # the epoch (sessions written before this stored an ISO-8601
+            # string). Last access is not stored: every load resets the TTL,
+            # so it is default_ttl minus the key's remaining TTL.
+            session_data["_created_at"] = time.time_ns() // 1_000_000
 
             # Serialize and encrypt
-            serialized_data = json.dumps(session_data)
+            serialized_data = _dumps_session(session_data)
             encrypted_data = self._encrypt_data(serialized_data)
 
-            # Store in Redis with TTL
-            self.redis_client.setex(session_key, self.default_ttl, encrypted_data)
+            # Store in Redis with TTL; NX guards against reusing a live ID
+            if not self.redis_client.set(
+                session_key, encrypted_data, ex=self.default_ttl, nx=True
+            ):
+                logger.error(f"Session ID collision for {session_id}")
+                return None
 
-            logger.debug(f"Created session {session_id}")
+            logger.debug("Created session %s", session_id)
             return session_id
 
         except Exception as e:
@@ -153,31 +266,48 @@ class RedisSessionService:
 
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve session data by session ID"""
+        return self.get_and_touch(session_id)
+
+    def get_and_touch(
+        self, session_id: str, ttl_seconds: int = None
+    ) -> Optional[Dict[str, Any]]:
+        """Retrieve session data and reset its TTL in one atomic round-trip"""
+        session_data, _ = self.load_session(session_id, ttl_seconds)
+        return session_data
+
+    def load_session(
+        self, session_id: str, ttl_seconds: int = None
+    ) -> Tuple[Optional[Dict[str, Any]], int]:
+        """
+        Retrieve session data and its last cookie refresh time (epoch seconds,
+        0 if unknown), resetting the session TTL in one atomic round-trip
+        """
         if not self.redis_client or not session_id:
-            return None
+            return None, 0
 
         try:
-            session_key = self._get_session_key(session_id)
-            encrypted_data = self.redis_client.get(session_key)
+            encrypted_data, last_refresh = self._get_and_touch_script(
+                keys=[
+                    self._get_session_key(session_id),
+                    self._get_refresh_key(session_id),
+                ],
+                args=[ttl_seconds or self.default_ttl],
+            )
 
             if not encrypted_data:
-                logger.debug(f"Session {session_id} not found or expired")
-                return None
+                logger.debug("Session %s not found or expired", session_id)
+                return None, 0
 
             # Decrypt and deserialize
             decrypted_data = self._decrypt_data(encrypted_data)
-            session_data = json.loads(decrypted_data)
-
-            # Update last accessed time
-            session_data["_last_accessed"] = datetime.now().isoformat()
-            self.update_session(session_id, session_data)
+            session_data = _loads_session(decrypted_data)
 
-            logger.debug(f"Retrieved session {session_id}")
-            return session_data
+            logger.debug("Retrieved session %s", session_id)
+            return session_data, int(last_refresh or 0)
 
         except Exception as e:
             logger.error(f"Failed to retrieve session {session_id}: {e}")
-            return None
+            return None, 0
 
     def update_session(self, session_id: str, session_data: Dict[str, Any]) -> bool:
         """Update session data"""
@@ -187,33 +317,61 @@ class RedisSessionService:
         try:
             session_key = self._get_session_key(session_id)
 
-            # Check if session exists
-            if not self.redis_client.exists(session_key):
-                logger.debug(f"Session {session_id} does not exist, cannot update")
-                return False
-
-            # Update last accessed time
-            session_data["_last_accessed"] = datetime.now().isoformat()
-
             # Serialize and encrypt
-            serialized_data = json.dumps(session_data)
+            serialized_data = _dumps_session(session_data)
             encrypted_data = self._encrypt_data(serialized_data)
 
-            # Update in Redis, preserving TTL
-            ttl = self.redis_client.ttl(session_key)
-            if ttl > 0:
-                self.redis_client.setex(session_key, ttl, encrypted_data)
-            else:
-                # If no TTL, set default
-                self.redis_client.setex(session_key, self.default_ttl, encrypted_data)
+            # XX only writes if the session still exists (it may have expired
+            # or been deleted since it was loaded); KEEPTTL leaves its expiry,
+            # which the load already reset, untouched
+            if not self._set_existing(session_key, encrypted_data):
+                logger.debug("Session %s does not exist, cannot update", session_id)
+                return False
 
-            logger.debug(f"Updated session {session_id}")
+            logger.debug("Updated session %s", session_id)
             return True
 
         except Exception as e:
             logger.error(f"Failed to update session {session_id}: {e}")
             return False
 
+    def _set_existing(self, session_key: str, value: bytes) -> bool:
+        """SET an existing key in one command, keeping its TTL"""
+        if self._keepttl_supported:
+            try:
+                result = self.redis_client.set(
+                    session_key, value, xx=True, keepttl=True
+                )
+                return result is True
+            except redis.exceptions.ResponseError:
+                # KEEPTTL needs Redis 6.0+
+                logger.warning("Redis does not support KEEPTTL, using TTL + SETEX")
+                self._keepttl_supported = False
+
+        ttl = self.redis_client.ttl(session_key)
+        if ttl == -2:
+            return False
+        result = self.redis_client.set(
+            session_key, value, ex=ttl if ttl > 0 else self.default_ttl, xx=True
+        )
+        return result is True
+
+    def mark_refreshed(self, session_id: str, timestamp: int) -> bool:
+        """Record when the session cookie was last re-sent (epoch seconds)"""
+        if not self.redis_client or not session_id:
+            return False
+
+        try:
+            return bool(
+                self.redis_client.set(
+                    self._get_refresh_key(session_id), timestamp, ex=self.default_ttl
+                )
+            )
+
+        except Exception as e:
+            logger.error(f"Failed to mark session {session_id} refreshed: {e}")
+            return False
+
     def delete_session(self, session_id: str) -> bool:
         """Delete a session"""
         if not self.redis_client or not session_id:
@@ -221,9 +379,11 @@ class RedisSessionService:
 
         try:
             session_key = self._get_session_key(session_id)
-            result = self.redis_client.delete(session_key)
+            result = self.redis_client.delete(
+                session_key, self._get_refresh_key(session_id)
+            )
 
-            logger.debug(f"Deleted session {session_id}")
+            logger.debug("Deleted session %s", session_id)
             return result > 0
 
         except Exception as e:
@@ -238,14 +398,16 @@ class RedisSessionService:
         try:
             session_key = self._get_session_key(session_id)
 
-            if not self.redis_client.exists(session_key):
-                return False
-
             if ttl_seconds is None:
                 ttl_seconds = self.default_ttl
 
+            # EXPIRE is a no-op returning False for a missing key
             result = self.redis_client.expire(session_key, ttl_seconds)
-            logger.debug(f"Extended session {session_id} TTL to {ttl_seconds} seconds")
+            if not result:
+                return False
+            logger.debug(
+                "Extended session %s TTL to %s seconds", session_id, ttl_seconds
+            )
             return result
 
         except Exception as e:
@@ -266,49 +428,23 @@ class RedisSessionService:
             logger.error(f"Failed to get TTL for session {session_id}: {e}")
             return None
 
-    def cleanup_expired_sessions(self) -> int:
-        """Clean up expired sessions (Redis handles this automatically, but useful for stats)"""
-        if not self.redis_client:
-            return 0
-
-        try:
-            # Get all session keys
-            pattern = f"{self.session_prefix}*"
-            keys = self.redis_client.keys(pattern)
-
-            expired_count = 0
-            for key in keys:
-                ttl = self.redis_client.ttl(key)
-                if ttl == -2:  # Key doesn't exist (expired)
-                    expired_count += 1
-
-            logger.info(f"Found {expired_count} expired sessions")
-            return expired_count
-
-        except Exception as e:
-            logger.error(f"Failed to cleanup expired sessions: {e}")
-            return 0
-
     def get_session_stats(self) -> Dict[str, Any]:
         """Get session statistics"""
         if not self.redis_client:
             return {"error": "Redis not available"}
 
         try:
+            # SCAN walks the keyspace incrementally instead of blocking Redis
+            # like KEYS. Expired sessions are evicted by Redis itself, so every
+            # key still present is an active session; no TTL probes needed.
             pattern = f"{self.session_prefix}*"
-            keys = self.redis_client.keys(pattern)
-
-            total_sessions = len(keys)
-            active_sessions = 0
-
-            for key in keys:
-                ttl = self.redis_client.ttl(key)
-                if ttl > 0:
-                    active_sessions += 1
+            total_sessions = sum(
+                1 for _ in self.redis_client.scan_iter(match=pattern, count=1000)
+            )
 
             return {
                 "total_sessions": total_sessions,
-                "active_sessions": active_sessions,
+                "active_sessions": total_sessions,
                 "redis_connected": True,
                 "default_ttl_hours": self.default_ttl / 3600,
             }
@@ -5,9 +5,10 @@ Scheduler service - handles periodic tasks and throttling
 import logging
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, select, update as sa_update
 
 from models.document import Document, DocumentStatus
+from services.document_service import DocumentService
 from config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -73,16 +74,20 @@ class SchedulerService:
                 f"{doc.processing_started_at} with last heartbeat "
                 f"{doc.processing_heartbeat_at}. Resetting to QUEUED."
             )
-            doc.status = DocumentStatus.QUEUED
-            doc.processing_heartbeat_at = None
-            doc.processing_error = (
+
+        # Reset all zombies with a single UPDATE rather than one per row. A
+        # failed update rolls back and reports 0, so log what was really reset.
+        rescued = DocumentService(self.db).bulk_update_status_sync(
+            [doc.id for doc in zombie_docs],
+            DocumentStatus.QUEUED,
+            error=(
                 f"Reset from zombie PROCESSING state by scheduler at "
                 f"{datetime.now(timezone.utc).isoformat()}"
-            )
-
-        self.db.commit()
-        logger.info(f"Rescued {len(zombie_docs)} zombie document(s).")
-        return len(zombie_docs)
+            ),
+            processing_heartbeat_at=None,
+        )
+        logger.info(f"Rescued {rescued} zombie document(s).")
+        return rescued
 
     def enqueue_pending_documents(self):
         """
@@ -117,32 +122,38 @@ class SchedulerService:
                 )
                 return
 
-            # Find documents that are in the QUEUED state, oldest first
-            documents_to_process = (
-                self.db.query(Document)
-                .filter(Document.status == DocumentStatus.QUEUED)
+            # Claim the oldest QUEUED documents and flip them to PENDING in one
+            # statement. SKIP LOCKED lets concurrent schedulers claim disjoint
+            # rows instead of dispatching the same document twice.
+            queued_ids = (
+                select(Document.id)
+                .where(Document.status == DocumentStatus.QUEUED)
                 .order_by(Document.created_at)
                 .limit(available_slots)
-                .all()
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
             )
-
-            if not documents_to_process:
+            claimed = self.db.execute(
+                sa_update(Document)
+                .where(Document.id.in_(queued_ids))
+                .values(status=DocumentStatus.PENDING)
+                .returning(Document.id, Document.created_at)
+            ).all()
+            self.db.commit()
+
+            if not claimed:
                 logger.info("No documents in QUEUED status to process.")
                 return
 
             from worker import process_document_task
 
-            for doc in documents_to_process:
-                # Update status to PENDING to signify it's about to be processed
-                doc.status = DocumentStatus.PENDING
-                self.db.commit()
-
-                # Dispatch the background task
-                process_document_task.delay(doc.id)
-                logger.info(f"Enqueued document {doc.id} for processing.")
+            # RETURNING order is unspecified; dispatch oldest first
+            for document_id, _ in sorted(claimed, key=lambda row: row[1]):
+                process_document_task.delay(document_id)
+                logger.info(f"Enqueued document {document_id} for processing.")
 
             logger.info(
-                f"Successfully enqueued {len(documents_to_process)} documents for processing."
+                f"Successfully enqueued {len(claimed)} documents for processing."
             )
 
         except Exception as e:
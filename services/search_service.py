@@ -3,14 +3,15 @@ Search service - handles document search and filtering
 Simplified search implementation with text-based and category filtering
 """
 
+import asyncio
 import logging
 import re
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
-from sqlalchemy import or_, and_, func, desc, asc, cast, true, text
+from sqlalchemy import or_, and_, func, desc, asc, cast, true, text, Text, literal_column
 from sqlalchemy.dialects.postgresql import JSONB, JSONPATH
 from sqlalchemy.orm import Session, load_only
 
-from database import SessionLocal
 from models.document import Document, DocumentStatus
 from models.taxonomy import TaxonomyTerm
 from models.search_query import SearchQuery
@@ -24,6 +25,169 @@ import json
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+SEARCH_STOP_WORDS = frozenset(
+    ["a", "an", "and", "the", "in", "on", "of", "for", "with"]
+    + ["is", "are", "was", "were"]
+)
+
+
+@lru_cache(maxsize=4096)
+def _extract_search_keywords(query: str) -> tuple:
+    """Keywords of a query minus stop words; cached since queries repeat heavily"""
+    return tuple(
+        keyword for keyword in query.lower().split() if keyword not in SEARCH_STOP_WORDS
+    )
+
+
+def _mapping_terms_array(field: str) -> Any:
+    # Inline jsonpath literal (not a bound parameter) so the expression is
+    # textually identical to the one in idx_documents_mapping_terms_trgm
+    path = literal_column(f"'$.keyword_mappings[*].{field}'").cast(JSONPATH)
+    return func.jsonb_path_query_array(Document.keywords, path)
+
+
+# Lower-cased JSON text of every mapping's verbatim and canonical term. The
+# trigram index on this exact expression (migration s6t7u8v9w0x1) lets a
+# LIKE '%term%' prefilter find candidate rows without reading every keywords
+# document.
+KEYWORD_MAPPING_TERMS_TEXT = func.lower(
+    cast(
+        _mapping_terms_array("verbatim_term").op("||")(
+            _mapping_terms_array("mapped_canonical_term")
+        ),
+        Text,
+    )
+)
+
+
+def _keyword_mapping_match(term: str, fields) -> Any:
+    """
+    True when any keywords.keyword_mappings entry has one of ``fields``
+    containing ``term`` (case-insensitive substring).
+
+    One jsonb_path_exists call per row against a jsonpath built once per
+    search, instead of unnesting the array with jsonb_array_elements.
+    like_regex only takes a literal pattern, so the regex-escaped term is
+    embedded as a JSON string literal and the whole path is a bound parameter.
+
+    like_regex cannot use an index, so terms that appear verbatim in the
+    serialized JSON (no quotes, backslashes, control or non-ASCII characters)
+    are first narrowed with an indexed LIKE on KEYWORD_MAPPING_TERMS_TEXT;
+    jsonb_path_exists then rechecks the exact field match.
+    """
+    pattern = json.dumps(re.escape(term))
+    condition = " || ".join(
+        f'@.{field} like_regex {pattern} flag "i"' for field in fields
+    )
+    match = func.jsonb_path_exists(
+        Document.keywords,
+        cast(f"$.keyword_mappings[*] ? ({condition})", JSONPATH),
+    )
+
+    # Trigrams need at least three characters to narrow anything
+    if len(term) < 3 or json.dumps(term)[1:-1] != term:
+        return match
+    like_term = term.lower().replace("%", "\\%").replace("_", "\\_")
+    return and_(KEYWORD_MAPPING_TERMS_TEXT.like(f"%{like_term}%"), match)
+
+
+# Hybrid relevance = vector similarity * 0.7 + full-text rank * 0.3.
+SEARCH_VECTOR_WEIGHT = 0.7
+SEARCH_TEXT_WEIGHT = 0.3
+
+# ORDER BY clause for every (column, descending) pair a search can sort by,
+# built once so a request resolves its ordering with a single dict lookup.
+SEARCH_SORT_ORDERS = {
+    (attr.key, descending): (desc if descending else asc)(attr.class_attribute)
+    for attr in Document.__mapper__.column_attrs
+    for descending in (True, False)
+}
+
+# Every keyword mapping statistic from a single pass over the unnested
+# keyword_mappings arrays. JSON-null fields count as present (-> IS NOT NULL)
+# but group under a NULL name (->>). Distinct counts are a COUNT(*) over a
+# GROUP BY, which Postgres can hash-aggregate; COUNT(DISTINCT) always sorts.
+MAPPING_STATISTICS_SQL = text("""
+    WITH m AS MATERIALIZED (
+        SELECT
+            elem -> 'mapped_canonical_term' IS NOT NULL AS has_canonical,
+            elem -> 'mapped_primary_category' IS NOT NULL AS has_category,
+            elem ->> 'mapped_canonical_term' AS canonical_term,
+            elem ->> 'mapped_primary_category' AS primary_category,
+            elem ->> 'verbatim_term' AS verbatim_term
+        FROM documents,
+            jsonb_array_elements(
+                COALESCE(documents.keywords #> '{keyword_mappings}', '[]'::jsonb)
+            ) AS elem
+    )
+    SELECT
+        (SELECT COUNT(*) FROM documents
+         WHERE status = 'COMPLETED' AND keywords IS NOT NULL) AS docs_with_keywords,
+        (SELECT COUNT(*) FROM m) AS total_mappings,
+        (SELECT COUNT(*) FROM (
+            SELECT verbatim_term FROM m
+            WHERE verbatim_term IS NOT NULL GROUP BY verbatim_term
+        ) t) AS unique_verbatim_terms,
+        (SELECT COUNT(*) FROM (
+            SELECT canonical_term FROM m
+            WHERE canonical_term IS NOT NULL GROUP BY canonical_term
+        ) t) AS unique_canonical_terms,
+        (SELECT COALESCE(json_agg(t), '[]') FROM (
+            SELECT canonical_term AS term, COUNT(*) AS count
+            FROM m WHERE has_canonical
+            GROUP BY canonical_term ORDER BY count DESC LIMIT 10
+        ) t) AS top_canonical_terms,
+        (SELECT COALESCE(json_agg(t), '[]') FROM (
+            SELECT primary_category AS category, COUNT(*) AS count
+            FROM m WHERE has_category
+            GROUP BY primary_category
+        ) t) AS primary_category_counts
+""")
+
+# Facet cache lifetime. The cache key tracks the COMPLETED corpus version, but
+# taxonomy link changes do not move it, so entries must not live long.
+FACET_CACHE_TTL_SECONDS = 300
+
+# Query-independent pieces of the search fetch. SQLAlchemy expressions and
+# loader options are immutable, so they are built once instead of per search.
+SEARCH_TOTAL_COUNT_COLUMN = func.count(Document.id).over().label("_total_count")
+SEARCH_RESULT_LOAD_ONLY = load_only(
+    Document.id,
+    Document.filename,
+    Document.file_size,
+    Document.status,
+    Document.created_at,
+    Document.ai_analysis,
+    Document.keywords,
+    Document.thumbnail_url,
+    Document.file_path,
+    Document.client_canonical,
+    Document.state,
+    Document.date_created,
+    Document.needs_date_review,
+    Document.has_embeddings,
+)
+
+
+_cache_client: Optional[redis.Redis] = None
+
+
+def _get_cache_client() -> Optional[redis.Redis]:
+    """
+    Process-wide Redis client for the search caches. redis-py pools
+    connections per client, so one client per process means each request
+    borrows a pooled connection instead of opening a fresh pool and paying a
+    PING round trip. A failed connection is not cached, so the next request
+    retries.
+    """
+    global _cache_client
+    if _cache_client is None and settings.redis_url:
+        client = redis.from_url(settings.redis_url, decode_responses=True)
+        client.ping()
+        logger.info("Redis cache connected successfully.")
+        _cache_client = client
+    return _cache_client
+
 
 class SearchService:
     """Service for searching and filtering documents"""
@@ -36,20 +200,24 @@ class SearchService:
         self.storage_service = (
             storage_service  # Store storage service for direct URL generation
         )
-        self.ai_service = AIService(db=self.db)
+        self._ai_service = None
         try:
-            if settings.redis_url:
-                self.redis_client = redis.from_url(
-                    settings.redis_url, decode_responses=True
-                )
-                self.redis_client.ping()
-                logger.info("Redis cache connected successfully.")
-            else:
-                self.redis_client = None
+            self.redis_client = _get_cache_client()
         except redis.exceptions.ConnectionError as e:
             logger.error(f"Could not connect to Redis: {e}")
             self.redis_client = None
 
+    @property
+    def ai_service(self) -> AIService:
+        """
+        AIService used for query embeddings. Built on first use: its
+        constructor sets up storage, taxonomy and API clients, and most
+        requests (cached searches, facets, top queries) never need it.
+        """
+        if self._ai_service is None:
+            self._ai_service = AIService(db=self.db)
+        return self._ai_service
+
     def _create_pagination_info(
         self, page: int, per_page: int, total_count: int
     ) -> Dict[str, Any]:
@@ -72,9 +240,14 @@ class SearchService:
     ) -> List[Dict[str, Any]]:
         """Search documents by canonical term with hybrid search"""
         try:
-            # Use the main search function to get hybrid search results
+            # Use the main search function to get hybrid search results; the
+            # ordering and LIMIT happen in SQL, and only the documents are
+            # returned, so facets are not built
             search_results = await self.search(
-                query=query, canonical_term=canonical_term, per_page=limit
+                query=query,
+                canonical_term=canonical_term,
+                per_page=limit,
+                include_facets=False,
             )
             return search_results.get("documents", [])
 
@@ -89,20 +262,7 @@ class SearchService:
     ) -> List[Dict[str, Any]]:
         """Search documents by verbatim term with hybrid search"""
         try:
-            # Escape the verbatim term for SQL LIKE patterns
-            escaped_term = verbatim_term.replace("'", "''")
-
-            # Use the same approach as canonical term filtering
-            # Note: Cast json to jsonb since the keywords column is json type
-            verbatim_filter = text(
-                f"""
-                EXISTS (
-                    SELECT 1 
-                    FROM jsonb_array_elements(documents.keywords::jsonb->'keyword_mappings') AS mapping
-                    WHERE mapping->>'verbatim_term' ILIKE '%{escaped_term}%'
-                )
-            """
-            )
+            verbatim_filter = _keyword_mapping_match(verbatim_term, ("verbatim_term",))
 
             base_query = self.db.query(Document).filter(
                 Document.status == DocumentStatus.COMPLETED, verbatim_filter
@@ -116,7 +276,9 @@ class SearchService:
                 )
 
             # Order by creation date and limit results
-            results = base_query.order_by(desc(Document.created_at)).limit(limit).all()
+            results = await asyncio.to_thread(
+                base_query.order_by(desc(Document.created_at)).limit(limit).all
+            )
 
             # Format documents for response
             formatted_docs = [doc.to_dict(full_detail=False) for doc in results]
@@ -128,76 +290,15 @@ class SearchService:
 
     async def get_mapping_statistics(self) -> Dict[str, Any]:
         """Get statistics about keyword mappings across all documents"""
-        from sqlalchemy.dialects.postgresql import JSONB
-        from sqlalchemy import cast
-
         try:
-            # Count documents with keywords
-            docs_with_keywords_count = (
-                self.db.query(func.count(Document.id))
-                .filter(
-                    Document.status == DocumentStatus.COMPLETED,
-                    Document.keywords.isnot(None),
-                )
-                .scalar()
-            )
-
-            # Unnest keywords and perform aggregations
-            # Note: Cast json to jsonb since the keywords column is json type
-            keyword_element = func.jsonb_array_elements(
-                func.coalesce(
-                    Document.keywords.op("::jsonb").op("#>")("{keyword_mappings}"),
-                    cast("[]", JSONB),
-                )
-            ).alias("keyword_element")
-
-            # Total mappings
-            total_mappings_query = self.db.query(func.count()).select_from(
-                keyword_element
-            )
-            total_mappings = total_mappings_query.scalar()
-
-            # Canonical term counts
-            canonical_term_counts_query = (
-                self.db.query(
-                    keyword_element.c.value["mapped_canonical_term"].astext,
-                    func.count(),
-                )
-                .filter(keyword_element.c.value["mapped_canonical_term"].isnot(None))
-                .group_by(keyword_element.c.value["mapped_canonical_term"].astext)
-                .order_by(func.count().desc())
-                .limit(10)
-            )
-            top_canonical_terms = canonical_term_counts_query.all()
-
-            # Primary category counts
-            primary_category_counts_query = (
-                self.db.query(
-                    keyword_element.c.value["mapped_primary_category"].astext,
-                    func.count(),
-                )
-                .filter(keyword_element.c.value["mapped_primary_category"].isnot(None))
-                .group_by(keyword_element.c.value["mapped_primary_category"].astext)
-            )
-            primary_category_counts = dict(primary_category_counts_query.all())
-
-            # Unique verbatim and canonical terms
-            unique_verbatim_terms_query = self.db.query(
-                func.count(
-                    func.distinct(keyword_element.c.value["verbatim_term"].astext)
-                )
-            )
-            unique_verbatim_terms = unique_verbatim_terms_query.scalar()
-
-            unique_canonical_terms_query = self.db.query(
-                func.count(
-                    func.distinct(
-                        keyword_element.c.value["mapped_canonical_term"].astext
-                    )
-                )
-            )
-            unique_canonical_terms = unique_canonical_terms_query.scalar()
-
+            # One round-trip and one unnest of keyword_mappings: the CTE is
+            # materialized once and every aggregate reads from it
+            stats = (
+                await asyncio.to_thread(self.db.execute, MAPPING_STATISTICS_SQL)
+            ).one()
+
+            docs_with_keywords_count = stats.docs_with_keywords
+            total_mappings = stats.total_mappings
             return {
                 "total_documents_with_mappings": docs_with_keywords_count,
                 "total_keyword_mappings": total_mappings,
@@ -206,13 +307,16 @@ class SearchService:
                     if docs_with_keywords_count
                     else 0
                 ),
-                "unique_verbatim_terms": unique_verbatim_terms,
-                "unique_canonical_terms": unique_canonical_terms,
+                "unique_verbatim_terms": stats.unique_verbatim_terms,
+                "unique_canonical_terms": stats.unique_canonical_terms,
                 "top_canonical_terms": [
-                    {"term": term, "count": count}
-                    for term, count in top_canonical_terms
+                    {"term": row["term"], "count": row["count"]}
+                    for row in stats.top_canonical_terms
                 ],
-                "primary_category_distribution": primary_category_counts,
+                "primary_category_distribution": {
+                    row["category"]: row["count"]
+                    for row in stats.primary_category_counts
+                },
             }
 
         except Exception as e:
@@ -291,27 +395,24 @@ class SearchService:
                 else:
                     logger.info(f"Skipping embedding generation for short query: '{query}'")
 
-                vector_weight = 0.7
-                text_weight = 0.3
-
                 vector_subquery = None
                 if query_embedding is not None:
                     # LIMIT forces HNSW index usage (ORDER BY distance LIMIT N),
                     # turning O(N) sequential scan into O(log N). Without this,
                     # pgvector ignores the HNSW index entirely.
                     _vector_candidates = max(500, per_page * 20)
+                    # One distance expression for both the score and the ORDER
+                    # BY, so the embedding is bound (and serialized) only once
+                    vector_distance = Document.search_vector.cosine_distance(
+                        query_embedding
+                    )
                     vector_subquery = (
                         select(
                             Document.id.label("id"),
-                            (
-                                1
-                                - Document.search_vector.cosine_distance(
-                                    query_embedding
-                                )
-                            ).label("vector_relevance"),
+                            (1 - vector_distance).label("vector_relevance"),
                         )
                         .filter(Document.search_vector.isnot(None))
-                        .order_by(Document.search_vector.cosine_distance(query_embedding))
+                        .order_by(vector_distance)
                         .limit(_vector_candidates)
                         .subquery()
                     )
@@ -340,8 +441,8 @@ class SearchService:
 
                     relevance_expression = (
                         func.coalesce(vector_subquery.c.vector_relevance, 0)
-                        * vector_weight
-                        + func.coalesce(text_subquery.c.text_relevance, 0) * text_weight
+                        * SEARCH_VECTOR_WEIGHT
+                        + func.coalesce(text_subquery.c.text_relevance, 0) * SEARCH_TEXT_WEIGHT
                     ).label("relevance")
 
                     id_expression = func.coalesce(
@@ -357,7 +458,7 @@ class SearchService:
                     # Fallback to only text search
                     search_subquery = select(
                         text_subquery.c.id.label("id"),
-                        (text_subquery.c.text_relevance * text_weight).label(
+                        (text_subquery.c.text_relevance * SEARCH_TEXT_WEIGHT).label(
                             "relevance"
                         ),
                     ).subquery()
@@ -394,29 +495,9 @@ class SearchService:
                     )
             if canonical_term:
                 logger.info(f"Applying canonical term filter for: {canonical_term}")
-
-                # Use a simpler and more reliable approach with JSONB operators
-                # This avoids the SQLAlchemy parameter binding issues with JSONPath
-
-                # Escape the canonical term for SQL LIKE patterns
-                escaped_term = canonical_term.replace("'", "''")
-
-                # Create a raw SQL filter that searches within the keyword_mappings array
-                # This uses jsonb_array_elements to unnest the array and then searches within it
-                # Note: Cast json to jsonb since the keywords column is json type
-                canonical_filter = text(
-                    f"""
-                    EXISTS (
-                        SELECT 1 
-                        FROM jsonb_array_elements(documents.keywords::jsonb->'keyword_mappings') AS mapping
-                        WHERE (
-                            mapping->>'mapped_canonical_term' ILIKE '%{escaped_term}%'
-                            OR mapping->>'verbatim_term' ILIKE '%{escaped_term}%'
-                        )
-                    )
-                """
+                canonical_filter = _keyword_mapping_match(
+                    canonical_term, ("mapped_canonical_term", "verbatim_term")
                 )
-
                 logger.info(f"Applied canonical term filter for: {canonical_term}")
                 final_query = final_query.filter(canonical_filter)
 
@@ -438,41 +519,25 @@ class SearchService:
                 order_clause = desc("relevance")
             else:
                 sort_column_name = "created_at" if sort_by == "relevance" else sort_by
-                sort_column = getattr(Document, sort_column_name, Document.created_at)
-                order_clause = (
-                    desc(sort_column)
-                    if sort_direction.lower() == "desc"
-                    else asc(sort_column)
-                )
+                descending = sort_direction.lower() == "desc"
+                order_clause = SEARCH_SORT_ORDERS.get((sort_column_name, descending))
+                if order_clause is None:
+                    order_clause = SEARCH_SORT_ORDERS[("created_at", descending)]
 
             # 4. Fetch documents + total count in a single query using window function.
             # COUNT(*) OVER() returns the full result set size regardless of LIMIT/OFFSET.
             _t_fetch = time.perf_counter()
             offset = (page - 1) * per_page
-            count_col = func.count(Document.id).over().label("_total_count")
-            all_rows = (
+            # The Session is synchronous; run the round trip on a worker
+            # thread so other requests keep being served meanwhile
+            all_rows = await asyncio.to_thread(
                 final_query
-                .add_columns(count_col)
-                .options(
-                    load_only(
-                        Document.id,
-                        Document.filename,
-                        Document.file_size,
-                        Document.status,
-                        Document.created_at,
-                        Document.ai_analysis,
-                        Document.keywords,
-                        Document.thumbnail_url,
-                        Document.file_path,
-                        Document.client_canonical,
-                        Document.state,
-                        Document.date_created,
-                    )
-                )
+                .add_columns(SEARCH_TOTAL_COUNT_COLUMN)
+                .options(SEARCH_RESULT_LOAD_ONLY)
                 .order_by(order_clause)
                 .offset(offset)
                 .limit(per_page)
-                .all()
+                .all
             )
             logger.info(f"[PERF] Document fetch + count query: {(time.perf_counter()-_t_fetch)*1000:.0f}ms")
 
@@ -484,24 +549,19 @@ class SearchService:
                 total_count = 0
                 results = []
 
-            # 6. Normalize relevance scores to better utilize (0, 1) range
-            # Collect all relevance scores first
-            relevance_scores = [relevance for _, relevance in results]
-            
-            # Calculate min/max for normalization (if we have scores)
-            if relevance_scores and any(score > 0 for score in relevance_scores):
+            # 6. Normalize relevance scores to better utilize (0, 1) range.
+            # Only when some score is positive and they are not all equal.
+            if results:
+                relevance_scores = [relevance for _, relevance in results]
                 min_score = min(relevance_scores)
                 max_score = max(relevance_scores)
-                
-                # Apply min-max normalization if there's a range
-                if max_score > min_score:
-                    normalized_results = []
-                    for doc, relevance in results:
-                        # Normalize to (0, 1) range
-                        normalized_score = (relevance - min_score) / (max_score - min_score)
-                        normalized_results.append((doc, normalized_score))
-                    results = normalized_results
-            
+                if max_score > 0 and max_score > min_score:
+                    score_range = max_score - min_score
+                    results = [
+                        (doc, (relevance - min_score) / score_range)
+                        for doc, relevance in results
+                    ]
+
             # 7. Format documents for response with storage service for direct URLs
             formatted_docs = []
             for doc, relevance in results:
@@ -566,11 +626,18 @@ class SearchService:
 
     async def _generate_enhanced_facets(self) -> Dict[str, Any]:
         """Generate enhanced facets including canonical terms using efficient queries with caching."""
-        # Check cache first
-        facet_cache_key = "facets:enhanced:all"
-        if self.redis_client:
+        # Check cache first. The key carries the COMPLETED corpus version, so
+        # a completed/updated/deleted document moves readers to a fresh entry.
+        # The category facets also count links from other statuses, and
+        # taxonomy re-mapping leaves updated_at alone, so the version does not
+        # cover every change; the short TTL bounds how stale those can get.
+        facet_version = await asyncio.to_thread(self._facet_version)
+        facet_cache_key = f"facets:enhanced:{facet_version}"
+        # Without a version there is nothing safe to key on; skip the cache
+        cache_client = self.redis_client if facet_version else None
+        if cache_client:
             try:
-                cached_facets = self.redis_client.get(facet_cache_key)
+                cached_facets = cache_client.get(facet_cache_key)
                 if cached_facets:
                     logger.info("Cache HIT for enhanced facets")
                     return json.loads(cached_facets)
@@ -579,50 +646,11 @@ class SearchService:
                 logger.error(f"Redis GET error for facets: {e}")
 
         try:
-            # Facets for primary categories
-            primary_category_facets = (
-                self.db.query(TaxonomyTerm.primary_category, func.count(Document.id))
-                .join(Document.taxonomy_terms)
-                .group_by(TaxonomyTerm.primary_category)
-                .order_by(desc(func.count(Document.id)))
-                .all()
-            )
-
-            # Facets for subcategories
-            subcategory_facets = (
-                self.db.query(TaxonomyTerm.subcategory, func.count(Document.id))
-                .join(Document.taxonomy_terms)
-                .filter(TaxonomyTerm.subcategory.isnot(None))
-                .group_by(TaxonomyTerm.subcategory)
-                .order_by(desc(func.count(Document.id)))
-                .all()
-            )
-
-            # Use jsonb_array_elements to unnest the keyword_mappings array
-            # Note: Cast json to jsonb since the keywords column is json type
-            keyword_element = func.jsonb_array_elements(
-                func.coalesce(
-                    Document.keywords.op("::jsonb").op("#>")("{keyword_mappings}"),
-                    func.cast("[]", JSONB),
-                )
-            ).alias("keyword_element")
-
-            # Then query the unnested elements
-            canonical_term_facets = (
-                self.db.query(
-                    keyword_element.c.value["mapped_canonical_term"].astext,
-                    func.count(Document.id),
-                )
-                .select_from(Document, keyword_element)
-                .filter(
-                    Document.status == DocumentStatus.COMPLETED,
-                    keyword_element.c.value["mapped_canonical_term"].isnot(None),
-                )
-                .group_by(keyword_element.c.value["mapped_canonical_term"].astext)
-                .order_by(func.count(Document.id).desc())
-                .limit(20)
-                .all()
-            )
+            (
+                primary_category_facets,
+                subcategory_facets,
+                canonical_term_facets,
+            ) = await asyncio.to_thread(self._query_facets)
 
             facets = {
                 "primary_categories": [
@@ -638,13 +666,16 @@ class SearchService:
                 ],
             }
 
-            # Cache the results for 24 hours (facets are expensive to regenerate)
-            if self.redis_client:
+            # Cache for 5 minutes as a backstop for changes the version misses;
+            # superseded versions simply age out
+            if cache_client:
                 try:
-                    self.redis_client.set(
-                        facet_cache_key, json.dumps(facets), ex=86400  # 24 hours
+                    cache_client.set(
+                        facet_cache_key,
+                        json.dumps(facets),
+                        ex=FACET_CACHE_TTL_SECONDS,
                     )
-                    logger.info("Cached enhanced facets for 24 hours")
+                    logger.info("Cached enhanced facets")
                 except redis.exceptions.RedisError as e:
                     logger.error(f"Redis SET error for facets: {e}")
 
@@ -658,30 +689,77 @@ class SearchService:
                 "canonical_terms": [],
             }
 
+    def _query_facets(self) -> tuple:
+        """Run the three facet aggregates; blocking, so called via to_thread"""
+        # Facets for primary categories
+        primary_category_facets = (
+            self.db.query(TaxonomyTerm.primary_category, func.count(Document.id))
+            .join(Document.taxonomy_terms)
+            .group_by(TaxonomyTerm.primary_category)
+            .order_by(desc(func.count(Document.id)))
+            .all()
+        )
+
+        # Facets for subcategories
+        subcategory_facets = (
+            self.db.query(TaxonomyTerm.subcategory, func.count(Document.id))
+            .join(Document.taxonomy_terms)
+            .filter(TaxonomyTerm.subcategory.isnot(None))
+            .group_by(TaxonomyTerm.subcategory)
+            .order_by(desc(func.count(Document.id)))
+            .all()
+        )
+
+        # Use jsonb_array_elements to unnest the keyword_mappings array
+        # Note: Cast json to jsonb since the keywords column is json type
+        keyword_element = func.jsonb_array_elements(
+            func.coalesce(
+                Document.keywords.op("::jsonb").op("#>")("{keyword_mappings}"),
+                func.cast("[]", JSONB),
+            )
+        ).alias("keyword_element")
+
+        # Then query the unnested elements
+        canonical_term_facets = (
+            self.db.query(
+                keyword_element.c.value["mapped_canonical_term"].astext,
+                func.count(Document.id),
+            )
+            .select_from(Document, keyword_element)
+            .filter(
+                Document.status == DocumentStatus.COMPLETED,
+                keyword_element.c.value["mapped_canonical_term"].isnot(None),
+            )
+            .group_by(keyword_element.c.value["mapped_canonical_term"].astext)
+            .order_by(func.count(Document.id).desc())
+            .limit(20)
+            .all()
+        )
+        return primary_category_facets, subcategory_facets, canonical_term_facets
+
+    def _facet_version(self) -> Optional[str]:
+        """
+        Version of the COMPLETED corpus the facets are computed from: document
+        count and latest updated_at. Computed on every facet request, cache
+        hits included, by an index-only scan over every COMPLETED entry of
+        idx_status_updated — cheaper than the facets' joins and unnest, but
+        still linear in the number of completed documents.
+        """
+        try:
+            count, last_updated = (
+                self.db.query(func.count(Document.id), func.max(Document.updated_at))
+                .filter(Document.status == DocumentStatus.COMPLETED)
+                .one()
+            )
+            stamp = last_updated.timestamp() if last_updated else 0
+            return f"{count}:{stamp}"
+        except Exception as e:
+            logger.error(f"Error computing facet version: {str(e)}")
+            return None
+
     def _get_search_keywords(self, query: str) -> List[str]:
         """Extracts keywords from a search query, filtering out stop words."""
-        stop_words = set(
-            [
-                "a",
-                "an",
-                "and",
-                "the",
-                "in",
-                "on",
-                "of",
-                "for",
-                "with",
-                "is",
-                "are",
-                "was",
-                "were",
-            ]
-        )
-        return [
-            keyword
-            for keyword in query.lower().split()
-            if keyword.strip() and keyword not in stop_words
-        ]
+        return list(_extract_search_keywords(query))
 
     async def log_search_query(
         self,
@@ -703,24 +781,49 @@ class SearchService:
                 result_count=result_count,
             )
             self.db.add(search_query)
-            self.db.commit()
+            await asyncio.to_thread(self.db.commit)
         except Exception as e:
             logger.error(f"Error logging search query: {str(e)}")
             self.db.rollback()
 
     async def get_top_queries(self, limit: int = 8) -> List[Dict[str, Any]]:
-        """Gets the most frequent search queries."""
+        """
+        Gets the most frequent search queries.
+        Read from the popular_search_queries materialized view (top 500,
+        refreshed by the refresh_rollups cron job) rather than grouping
+        the whole search_queries log; cached for a minute on top of that.
+        """
+        cache_key = f"top_queries:{limit}"
+        if self.redis_client:
+            try:
+                cached_queries = self.redis_client.get(cache_key)
+                if cached_queries:
+                    return json.loads(cached_queries)
+            except redis.exceptions.RedisError as e:
+                logger.error(f"Redis GET error for top queries: {e}")
+
         try:
             top_queries = (
-                self.db.query(
-                    SearchQuery.query, func.count(SearchQuery.query).label("count")
+                await asyncio.to_thread(
+                    self.db.execute,
+                    text("""
+                        SELECT query, count
+                        FROM popular_search_queries
+                        ORDER BY count DESC
+                        LIMIT :limit
+                    """),
+                    {"limit": limit},
                 )
-                .group_by(SearchQuery.query)
-                .order_by(desc("count"))
-                .limit(limit)
-                .all()
-            )
-            return [{"query": q, "count": c} for q, c in top_queries]
+            ).fetchall()
+            result = [{"query": q, "count": c} for q, c in top_queries]
         except Exception as e:
             logger.error(f"Error getting top queries: {str(e)}")
             return []
+
+        if self.redis_client:
+            try:
+                self.redis_client.set(cache_key, json.dumps(result), ex=60)
+            except redis.exceptions.RedisError as e:
+                logger.error(f"Redis SET error for top queries: {e}")
+
+        return result
@@ -5,9 +5,12 @@ Supports local storage, Render disk storage, and S3-compatible storage
 
 import os
 import shutil
+import tempfile
+import time
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, BinaryIO
+from typing import Dict, Iterator, Optional, BinaryIO, Tuple
 import logging
 from fastapi import UploadFile
 import aiofiles
@@ -23,6 +26,13 @@ settings = get_settings()
 class StorageService:
     """Unified storage service supporting multiple backends"""
 
+    # Presigned URLs are shared across instances in this process as
+    # (key, expires_in, content_type) -> (url, expires_at) and reused while at
+    # least half their lifetime remains, so a results page or a burst of
+    # preview redirects signs each object once rather than on every request.
+    PRESIGNED_URL_CACHE_MAX_ENTRIES = 10000
+    _presigned_url_cache: Dict[tuple, Tuple[str, float]] = {}
+
     def __init__(self):
         self.storage_type = settings.storage_type
         self.storage_path = settings.storage_path
@@ -246,6 +256,44 @@ class StorageService:
             logger.error(f"Error getting file sync {file_path}: {str(e)}")
             return None
 
+    @contextmanager
+    def local_file_sync(self, file_path: str) -> Iterator[Optional[str]]:
+        """
+        Yield a local filesystem path for a stored file, or None if it's missing.
+
+        Local files are used in place. S3 objects are streamed in chunks to a
+        temporary file, which is removed on exit, so callers that can read
+        from a path never hold the whole object in memory.
+        """
+        if self.storage_type != "s3":
+            full_path = Path(self.storage_path) / Path(file_path).name
+            if not full_path.exists():
+                logger.warning(f"File not found: {full_path}")
+                yield None
+            else:
+                yield str(full_path)
+            return
+
+        # Like get_file_sync, any storage failure (missing key, connection
+        # error, timeout, no temp space) yields None rather than raising.
+        # Exceptions from the caller's with-block still propagate.
+        try:
+            tmp = tempfile.NamedTemporaryFile(suffix=Path(file_path).suffix)
+        except Exception as e:
+            logger.error(f"Error creating temp file for {file_path}: {str(e)}")
+            yield None
+            return
+
+        with tmp:
+            try:
+                self.s3_client.download_fileobj(settings.s3_bucket, file_path, tmp)
+                tmp.flush()
+                local_path = tmp.name
+            except Exception as e:
+                logger.error(f"S3 error downloading file {file_path}: {str(e)}")
+                local_path = None
+            yield local_path
+
     async def delete_file(self, file_path: str) -> bool:
         """Delete file from storage"""
         try:
@@ -316,6 +364,12 @@ class StorageService:
         self, s3_key: str, expires_in: int, content_type: Optional[str] = None
     ) -> Optional[str]:
         """Get presigned URL for S3 file with proper headers for browser viewing"""
+        cache_key = (s3_key, expires_in, content_type)
+        cached = StorageService._presigned_url_cache.get(cache_key)
+        now = time.time()
+        if cached and cached[1] - now > expires_in / 2:
+            return cached[0]
+
         try:
             params = {
                 "Bucket": settings.s3_bucket,
@@ -344,6 +398,9 @@ class StorageService:
             logger.debug(
                 f"Generated presigned URL for {s3_key} with content_type={content_type}, expires in {expires_in}s"
             )
+            if len(StorageService._presigned_url_cache) >= self.PRESIGNED_URL_CACHE_MAX_ENTRIES:
+                StorageService._presigned_url_cache.clear()
+            StorageService._presigned_url_cache[cache_key] = (url, now + expires_in)
             return url
         except ClientError as e:
             error_code = e.response.get("Error", {}).get("Code", "Unknown")
@@ -366,6 +423,10 @@ class StorageService:
 
     async def check_file_exists(self, file_path: str) -> bool:
         """Check if file exists in storage"""
+        return self.check_file_exists_sync(file_path)
+
+    def check_file_exists_sync(self, file_path: str) -> bool:
+        """Check if file exists in storage (synchronous)"""
         try:
             if self.storage_type == "s3":
                 try:
@@ -7,6 +7,7 @@ import logging
 import csv
 import os
 from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -101,8 +102,15 @@ class TaxonomyService:
         Get the complete taxonomy hierarchy organized by primary category
         """
         try:
-            terms = (
-                self.db.query(TaxonomyTerm)
+            # Plain column tuples grouped in one pass; no ORM entities needed
+            rows = (
+                self.db.query(
+                    TaxonomyTerm.id,
+                    TaxonomyTerm.primary_category,
+                    TaxonomyTerm.subcategory,
+                    TaxonomyTerm.term,
+                    TaxonomyTerm.description,
+                )
                 .order_by(
                     TaxonomyTerm.primary_category,
                     TaxonomyTerm.subcategory,
@@ -112,21 +120,10 @@ class TaxonomyService:
             )
 
             hierarchy = {}
-            for term in terms:
-                if term.primary_category not in hierarchy:
-                    hierarchy[term.primary_category] = {}
-
-                subcategory = term.subcategory or "General"
-                if subcategory not in hierarchy[term.primary_category]:
-                    hierarchy[term.primary_category][subcategory] = []
-
-                hierarchy[term.primary_category][subcategory].append(
-                    {
-                        "id": term.id,
-                        "term": term.term,
-                        "description": term.description,
-                    }
-                )
+            for term_id, primary_category, subcategory, term, description in rows:
+                hierarchy.setdefault(primary_category, {}).setdefault(
+                    subcategory or "General", []
+                ).append({"id": term_id, "term": term, "description": description})
 
             return hierarchy
 
@@ -140,8 +137,13 @@ class TaxonomyService:
         Returns a nested dictionary: {primary_category: {subcategory: [terms]}}
         """
         try:
-            terms = (
-                self.db.query(TaxonomyTerm)
+            # Plain column tuples: only the names are needed, not ORM entities
+            rows = (
+                self.db.query(
+                    TaxonomyTerm.primary_category,
+                    TaxonomyTerm.subcategory,
+                    TaxonomyTerm.term,
+                )
                 .order_by(
                     TaxonomyTerm.primary_category,
                     TaxonomyTerm.subcategory,
@@ -151,15 +153,10 @@ class TaxonomyService:
             )
 
             hierarchy = {}
-            for term in terms:
-                if term.primary_category not in hierarchy:
-                    hierarchy[term.primary_category] = {}
-
-                subcategory = term.subcategory or "General"
-                if subcategory not in hierarchy[term.primary_category]:
-                    hierarchy[term.primary_category][subcategory] = []
-
-                hierarchy[term.primary_category][subcategory].append(term.term)
+            for primary_category, subcategory, term in rows:
+                hierarchy.setdefault(primary_category, {}).setdefault(
+                    subcategory or "General", []
+                ).append(term)
 
             return hierarchy
 
@@ -167,19 +164,21 @@ class TaxonomyService:
             logger.error(f"Error getting filter taxonomy data: {str(e)}")
             return {}
 
+    def _count_terms_by_primary_category(self) -> List[Tuple[str, int]]:
+        """(primary_category, term count) pairs from a single GROUP BY"""
+        return (
+            self.db.query(TaxonomyTerm.primary_category, func.count(TaxonomyTerm.id))
+            .group_by(TaxonomyTerm.primary_category)
+            .all()
+        )
+
     async def get_primary_categories(self) -> List[Dict[str, Any]]:
         """Get all primary categories with counts"""
         try:
-            categories = TaxonomyTerm.get_categories(self.db)
-
-            category_data = []
-            for category in categories:
-                count = (
-                    self.db.query(TaxonomyTerm)
-                    .filter(TaxonomyTerm.primary_category == category)
-                    .count()
-                )
-                category_data.append({"name": category, "count": count})
+            category_data = [
+                {"name": category, "count": count}
+                for category, count in self._count_terms_by_primary_category()
+            ]
 
             return sorted(category_data, key=lambda x: x["name"])
 
@@ -190,19 +189,20 @@ class TaxonomyService:
     async def get_subcategories(self, primary_category: str) -> List[Dict[str, Any]]:
         """Get subcategories for a primary category"""
         try:
-            subcategories = TaxonomyTerm.get_subcategories(self.db, primary_category)
-
-            subcategory_data = []
-            for subcategory in subcategories:
-                count = (
-                    self.db.query(TaxonomyTerm)
-                    .filter(
-                        TaxonomyTerm.primary_category == primary_category,
-                        TaxonomyTerm.subcategory == subcategory,
-                    )
-                    .count()
+            rows = (
+                self.db.query(TaxonomyTerm.subcategory, func.count(TaxonomyTerm.id))
+                .filter(
+                    TaxonomyTerm.primary_category == primary_category,
+                    TaxonomyTerm.subcategory.isnot(None),
+                    TaxonomyTerm.subcategory != "",
                 )
-                subcategory_data.append({"name": subcategory, "count": count})
+                .group_by(TaxonomyTerm.subcategory)
+                .all()
+            )
+
+            subcategory_data = [
+                {"name": subcategory, "count": count} for subcategory, count in rows
+            ]
 
             return sorted(subcategory_data, key=lambda x: x["name"])
 
@@ -241,23 +241,14 @@ class TaxonomyService:
         """Get taxonomy statistics"""
         try:
             total_terms = self.db.query(TaxonomyTerm).count()
-            total_categories = len(TaxonomyTerm.get_categories(self.db))
             total_synonyms = self.db.query(TaxonomySynonym).count()
 
             # Get category breakdown
-            category_counts = {}
-            categories = TaxonomyTerm.get_categories(self.db)
-            for category in categories:
-                count = (
-                    self.db.query(TaxonomyTerm)
-                    .filter(TaxonomyTerm.primary_category == category)
-                    .count()
-                )
-                category_counts[category] = count
+            category_counts = dict(self._count_terms_by_primary_category())
 
             return {
                 "total_terms": total_terms,
-                "total_categories": total_categories,
+                "total_categories": len(category_counts),
                 "total_synonyms": total_synonyms,
                 "category_breakdown": category_counts,
             }
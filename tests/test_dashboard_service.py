@@ -0,0 +1,109 @@
+"""
+Tests for DashboardService metric assembly.
+
+Like test_worker_recovery.py, these run against a mocked SQLAlchemy Session:
+the Document model uses Postgres-only column types, so the aggregate SQL
+itself is not exercised here — only how its result rows are shaped into the
+dashboard payload.
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+from services.dashboard_service import DashboardService
+
+
+def make_aggregate_row(**overrides):
+    values = {
+        "pending": 1,
+        "processing": 2,
+        "completed": 3,
+        "failed": 0,
+        "analysis_completion_rate": 33.3333,
+        "keyword_mapping_success_rate": 66.6666,
+        "embedding_generation_rate": 100.0,
+    }
+    values.update(overrides)
+    row = MagicMock()
+    row._mapping = values
+    return row
+
+
+class TestDocumentAggregates:
+    def test_status_breakdown_and_ai_metrics_share_one_query(self):
+        db = MagicMock()
+        db.query.return_value.select_from.return_value.one.return_value = (
+            make_aggregate_row()
+        )
+        service = DashboardService(db)
+
+        status_breakdown = asyncio.run(service._get_status_breakdown())
+        ai_metrics = asyncio.run(service._get_ai_analysis_metrics())
+
+        assert status_breakdown == {
+            "pending": 1,
+            "processing": 2,
+            "completed": 3,
+            "failed": 0,
+        }
+        assert ai_metrics == {
+            "analysis_completion_rate": 33.33,
+            "keyword_mapping_success_rate": 66.67,
+            "embedding_generation_rate": 100.0,
+        }
+        assert db.query.call_count == 1
+
+    def test_ai_metrics_default_to_zero_without_completed_documents(self):
+        db = MagicMock()
+        db.query.return_value.select_from.return_value.one.return_value = (
+            make_aggregate_row(
+                completed=0,
+                analysis_completion_rate=None,
+                keyword_mapping_success_rate=None,
+                embedding_generation_rate=None,
+            )
+        )
+        service = DashboardService(db)
+
+        ai_metrics = asyncio.run(service._get_ai_analysis_metrics())
+
+        assert ai_metrics == {
+            "analysis_completion_rate": 0,
+            "keyword_mapping_success_rate": 0,
+            "embedding_generation_rate": 0,
+        }
+
+    def test_search_service_not_built_for_status_breakdown(self):
+        db = MagicMock()
+        db.query.return_value.select_from.return_value.one.return_value = (
+            make_aggregate_row()
+        )
+        service = DashboardService(db)
+
+        asyncio.run(service._get_status_breakdown())
+
+        assert service._search_service is None
+
+
+class TestReviewQueue:
+    def test_all_reasons_come_from_one_query(self):
+        counts = {
+            "needs_review_flagged": 2,
+            "missing_embeddings": 1,
+            "missing_text": 0,
+            "missing_keywords": None,
+            "has_errors": 3,
+            "low_date_confidence": 4,
+            "low_client_confidence": 5,
+            "low_state_confidence": 6,
+        }
+        db = MagicMock()
+        db.query.return_value.select_from.return_value.one.return_value = MagicMock(
+            _mapping=counts
+        )
+        service = DashboardService(db)
+
+        review_queue = asyncio.run(service.get_review_queue())
+
+        assert review_queue == {**counts, "missing_keywords": 0}
+        assert db.query.call_count == 1
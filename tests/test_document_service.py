@@ -0,0 +1,95 @@
+"""
+Tests for DocumentService statistics caching and document creation.
+
+Runs against a mocked SQLAlchemy Session (see test_dashboard_service.py).
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from models.document import DocumentStatus
+from services.document_service import DocumentService
+
+
+def make_statistics_row():
+    row = MagicMock()
+    row._mapping = {"pending": 1, "processing": 0, "completed": 4, "failed": 1}
+    row.recent_uploads = 2
+    row.avg_size = 1024
+    row.total_size = 6144
+    row.total = 6
+    return row
+
+
+@pytest.fixture
+def service():
+    DocumentService._invalidate_statistics_cache()
+    db = MagicMock()
+    db.query.return_value.select_from.return_value.one.return_value = (
+        make_statistics_row()
+    )
+    yield DocumentService(db)
+    DocumentService._invalidate_statistics_cache()
+
+
+class TestStatisticsCache:
+    def test_repeated_calls_reuse_cached_result(self, service):
+        first = asyncio.run(service.get_statistics())
+        second = asyncio.run(service.get_statistics())
+
+        assert first == second
+        assert first["status_counts"]["completed"] == 4
+        assert service.db.query.call_count == 1
+
+    def test_total_comes_from_the_same_exact_aggregate(self, service):
+        stats = asyncio.run(service.get_statistics())
+
+        assert stats["total_documents"] == 6
+        service.db.execute.assert_not_called()
+
+    def test_cache_is_shared_across_instances(self, service):
+        asyncio.run(service.get_statistics())
+
+        other = DocumentService(MagicMock())
+        asyncio.run(other.get_statistics())
+
+        other.db.query.assert_not_called()
+
+    def test_status_update_invalidates_cache(self, service):
+        asyncio.run(service.get_statistics())
+        service.update_document_status_sync(1, DocumentStatus.COMPLETED)
+        asyncio.run(service.get_statistics())
+
+        assert service.db.query.call_count == 2
+
+    def test_expired_entry_is_recomputed(self, service, monkeypatch):
+        monkeypatch.setattr(DocumentService, "STATISTICS_CACHE_TTL_SECONDS", -1)
+
+        asyncio.run(service.get_statistics())
+        asyncio.run(service.get_statistics())
+
+        assert service.db.query.call_count == 2
+
+
+class TestCreateDocument:
+    def test_inserts_with_on_conflict_on_file_path(self):
+        db = MagicMock()
+        created = MagicMock(id=7)
+        db.scalars.return_value.one.return_value = created
+        service = DocumentService(db)
+
+        document = asyncio.run(
+            service.create_document("a.pdf", "uploads/a.pdf", 10, page_count=2)
+        )
+
+        assert document is created
+        stmt = db.scalars.call_args[0][0]
+        compiled = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (file_path) DO UPDATE" in compiled
+        assert stmt.compile(dialect=postgresql.dialect()).params["file_metadata"] == {
+            "page_count": 2
+        }
+        db.commit.assert_called_once()
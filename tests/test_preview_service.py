@@ -0,0 +1,134 @@
+"""
+Tests for PreviewService preview lookup, API-triggered render queueing and
+failed-render markers.
+
+Storage and Redis are MagicMocks; no files are rendered.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import services.preview_service as preview_module
+from services.preview_service import PreviewService
+
+
+@pytest.fixture
+def marker_client(monkeypatch):
+    client = MagicMock()
+    client.exists.return_value = 0
+    monkeypatch.setattr(preview_module, "_get_marker_client", lambda: client)
+    return client
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    import worker
+
+    task = MagicMock()
+    monkeypatch.setattr(worker, "generate_preview_task", task)
+    return task
+
+
+def make_service(preview_exists):
+    storage = MagicMock()
+    storage.check_file_exists = AsyncMock(return_value=preview_exists)
+    storage.get_file_url = AsyncMock(return_value="https://signed/preview.png")
+    storage.check_file_exists_sync.return_value = preview_exists
+    return PreviewService(storage)
+
+
+class TestGetPreviewUrl:
+    def test_existing_preview_returns_url_without_queueing(self, marker_client, queued):
+        service = make_service(preview_exists=True)
+
+        url = asyncio.run(service.get_preview_url("uploads/a.pdf"))
+
+        assert url == "https://signed/preview.png"
+        marker_client.set.assert_not_called()
+        queued.delay.assert_not_called()
+
+    def test_first_poll_queues_a_render(self, marker_client, queued):
+        marker_client.set.return_value = True
+        service = make_service(preview_exists=False)
+
+        url = asyncio.run(service.get_preview_url("uploads/a.pdf"))
+
+        assert url is None
+        queued.delay.assert_called_once_with("uploads/a.pdf")
+        args, kwargs = marker_client.set.call_args
+        assert args[0] == "preview_queued:previews/a_preview.png"
+        assert kwargs["nx"] is True
+
+    def test_repeat_poll_while_pending_does_not_requeue(self, marker_client, queued):
+        marker_client.set.return_value = None  # SET NX lost: already queued
+        service = make_service(preview_exists=False)
+
+        url = asyncio.run(service.get_preview_url("uploads/a.pdf"))
+
+        assert url is None
+        queued.delay.assert_not_called()
+
+    def test_redis_outage_still_queues(self, marker_client, queued):
+        marker_client.set.side_effect = ConnectionError("redis down")
+        service = make_service(preview_exists=False)
+
+        asyncio.run(service.get_preview_url("uploads/a.pdf"))
+
+        queued.delay.assert_called_once_with("uploads/a.pdf")
+
+    def test_unsupported_type_is_not_queued(self, marker_client, queued):
+        service = make_service(preview_exists=False)
+
+        url = asyncio.run(service.get_preview_url("uploads/notes.txt"))
+
+        assert url is None
+        assert service.preview_unavailable("uploads/notes.txt")
+        service.storage.check_file_exists.assert_not_called()
+        queued.delay.assert_not_called()
+
+    def test_failed_render_is_not_requeued(self, marker_client, queued):
+        marker_client.exists.return_value = 1
+        service = make_service(preview_exists=False)
+
+        url = asyncio.run(service.get_preview_url("uploads/a.pdf"))
+
+        assert url is None
+        assert service.preview_unavailable("uploads/a.pdf")
+        marker_client.set.assert_not_called()
+        queued.delay.assert_not_called()
+
+
+class TestGeneratePreviewSync:
+    def test_no_overwrite_skips_existing_preview(self):
+        service = make_service(preview_exists=True)
+
+        path = service.generate_preview_sync("uploads/a.pdf", overwrite=False)
+
+        assert path == "previews/a_preview.png"
+        service.storage.local_file_sync.assert_not_called()
+        service.storage.save_file_bytes_sync.assert_not_called()
+
+    def test_render_failure_records_marker(self, marker_client, monkeypatch):
+        service = make_service(preview_exists=False)
+        service.storage.local_file_sync.return_value.__enter__.return_value = "/tmp/a"
+        monkeypatch.setattr(PreviewService, "_render_preview", lambda *args: None)
+
+        assert service.generate_preview_sync("uploads/a.pdf") is None
+
+        args, kwargs = marker_client.set.call_args
+        assert args[0] == "preview_failed:previews/a_preview.png"
+        assert kwargs["ex"] == preview_module.PREVIEW_FAILURE_MARKER_TTL_SECONDS
+
+    def test_successful_render_clears_marker(self, marker_client, monkeypatch):
+        service = make_service(preview_exists=False)
+        service.storage.local_file_sync.return_value.__enter__.return_value = "/tmp/a"
+        monkeypatch.setattr(PreviewService, "_render_preview", lambda *args: b"png")
+
+        assert service.generate_preview_sync("uploads/a.pdf") == "previews/a_preview.png"
+
+        marker_client.delete.assert_called_once_with(
+            "preview_failed:previews/a_preview.png"
+        )
+        marker_client.set.assert_not_called()
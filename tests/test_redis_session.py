@@ -0,0 +1,203 @@
+"""
+Tests for Redis session encryption, legacy session formats and the
+middleware's save path.
+
+Redis is a MagicMock. A regression in the decrypt path logs every user out on
+deploy, so every on-disk format written by an earlier version is covered.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import time
+from unittest import mock
+from unittest.mock import MagicMock
+
+import pytest
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+# Importing the module builds the global service, which retries Redis with
+# sleeps between attempts; skip the waiting
+with mock.patch("time.sleep"):
+    import services.redis_session_middleware as middleware_module
+    from services.redis_session_middleware import RedisSession, RedisSessionMiddleware
+    from services.redis_session_service import (
+        SESSION_NONCE_BYTES,
+        RedisSessionService,
+    )
+
+
+SESSION = {"user": "alice", "roles": ["admin"], "_created_at": 1700000000000}
+
+
+@pytest.fixture
+def service():
+    service = RedisSessionService.__new__(RedisSessionService)
+    service.redis_client = MagicMock()
+    service.session_prefix = "session:"
+    service.refresh_prefix = "session_refresh:"
+    service.default_ttl = 3600
+    service._keepttl_supported = True
+    service._get_and_touch_script = MagicMock()
+    service._initialize_encryption()
+    return service
+
+
+def stored(service, value, last_refresh=None):
+    """Make the get-and-touch script return value as the stored session body"""
+    service._get_and_touch_script.return_value = [value, last_refresh]
+
+
+def legacy_fernet_value(service, session):
+    """base64(Fernet token), as written before the switch to AES-GCM"""
+    token = Fernet(base64.urlsafe_b64encode(service.encryption_key)).encrypt(
+        json.dumps(session).encode()
+    )
+    return base64.urlsafe_b64encode(token)
+
+
+def legacy_aesgcm_value(service, session):
+    """base64(nonce + AES-GCM ciphertext), as written before raw-bytes storage"""
+    nonce = os.urandom(SESSION_NONCE_BYTES)
+    ciphertext = AESGCM(service.encryption_key).encrypt(
+        nonce, json.dumps(session).encode(), None
+    )
+    return base64.urlsafe_b64encode(nonce + ciphertext)
+
+
+class TestEncryption:
+    def test_aes_gcm_round_trip(self, service):
+        encrypted = service._encrypt_data(b'{"user": "alice"}')
+
+        assert encrypted[SESSION_NONCE_BYTES:] != b'{"user": "alice"}'
+        assert service._decrypt_data(encrypted) == b'{"user": "alice"}'
+
+    def test_each_encryption_uses_a_fresh_nonce(self, service):
+        first = service._encrypt_data(b"same")
+        second = service._encrypt_data(b"same")
+
+        assert first[:SESSION_NONCE_BYTES] != second[:SESSION_NONCE_BYTES]
+
+    def test_created_session_loads_back(self, service):
+        service.redis_client.set.return_value = True
+
+        session_id = service.create_session(dict(SESSION))
+        written = service.redis_client.set.call_args[0][1]
+        stored(service, written, b"1700000000")
+
+        session_data, last_refresh = service.load_session(session_id)
+
+        # create_session restamps _created_at (epoch milliseconds)
+        assert isinstance(session_data.pop("_created_at"), int)
+        assert session_data == {"user": "alice", "roles": ["admin"]}
+        assert last_refresh == 1700000000
+
+
+class TestLegacyFormats:
+    def test_legacy_fernet_session_is_readable(self, service):
+        stored(service, legacy_fernet_value(service, SESSION))
+
+        session_data, last_refresh = service.load_session("sid")
+
+        assert session_data == SESSION
+        assert last_refresh == 0
+
+    def test_legacy_base64_aes_gcm_session_is_readable(self, service):
+        stored(service, legacy_aesgcm_value(service, SESSION))
+
+        session_data, _ = service.load_session("sid")
+
+        assert session_data == SESSION
+
+
+class TestTampering:
+    @pytest.mark.parametrize("index", [0, SESSION_NONCE_BYTES - 1])
+    def test_tampered_nonce_is_rejected(self, service, index):
+        encrypted = bytearray(service._encrypt_data(json.dumps(SESSION).encode()))
+        encrypted[index] ^= 0x01
+        stored(service, bytes(encrypted))
+
+        session_data, _ = service.load_session("sid")
+
+        assert session_data is None
+
+    @pytest.mark.parametrize("index", [SESSION_NONCE_BYTES, -1])
+    def test_tampered_ciphertext_is_rejected(self, service, index):
+        encrypted = bytearray(service._encrypt_data(json.dumps(SESSION).encode()))
+        encrypted[index] ^= 0x01
+        stored(service, bytes(encrypted))
+
+        session_data, _ = service.load_session("sid")
+
+        assert session_data is None
+
+    def test_other_secret_cannot_read_session(self, service):
+        encrypted = service._encrypt_data(json.dumps(SESSION).encode())
+        other_key = b"k" * 32
+        service.encryption_key = other_key
+        service._aead = AESGCM(other_key)
+        service._legacy_fernet = Fernet(base64.urlsafe_b64encode(other_key))
+        stored(service, encrypted)
+
+        session_data, _ = service.load_session("sid")
+
+        assert session_data is None
+
+
+@pytest.fixture
+def session_store(monkeypatch):
+    store = MagicMock()
+    store.mark_refreshed.return_value = True
+    store.update_session.return_value = True
+    store.create_session.return_value = "new-sid"
+    monkeypatch.setattr(middleware_module, "redis_session_service", store)
+    return store
+
+
+def save(session, max_age=14 * 24 * 60 * 60):
+    middleware = RedisSessionMiddleware(app=None, secret_key="x", max_age=max_age)
+    message = {"type": "http.response.start", "headers": []}
+    asyncio.run(middleware._save_session(session, message))
+    return [value for name, value in message["headers"] if name == b"set-cookie"]
+
+
+class TestMiddlewareSave:
+    def test_unchanged_session_is_not_rewritten_or_reissued(self, session_store):
+        session = RedisSession("sid", dict(SESSION), last_refresh=int(time.time()))
+        session["user"] = "alice"  # equal value: not a modification
+
+        cookies = save(session)
+
+        assert cookies == []
+        session_store.update_session.assert_not_called()
+        session_store.create_session.assert_not_called()
+        session_store.mark_refreshed.assert_not_called()
+
+    def test_due_refresh_reissues_cookie_without_rewriting_body(self, session_store):
+        session = RedisSession("sid", dict(SESSION), last_refresh=0)
+
+        cookies = save(session)
+
+        assert len(cookies) == 1 and cookies[0].startswith(b"session=sid;")
+        session_store.update_session.assert_not_called()
+        session_store.mark_refreshed.assert_called_once()
+
+    def test_modified_session_is_written_once(self, session_store):
+        session = RedisSession("sid", dict(SESSION), last_refresh=int(time.time()))
+        session["user"] = "bob"
+
+        cookies = save(session)
+
+        session_store.update_session.assert_called_once_with("sid", session)
+        session_store.mark_refreshed.assert_not_called()
+        assert len(cookies) == 1
+
+    def test_new_session_is_created_and_cookie_issued(self, session_store):
+        session = RedisSession()
+
+        cookies = save(session)
+
+        session_store.create_session.assert_called_once()
+        assert cookies[0].startswith(b"session=new-sid;")
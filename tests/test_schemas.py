@@ -0,0 +1,34 @@
+"""
+Tests for the typed JSONB schemas in models/schemas.py.
+"""
+
+import pytest
+
+from models.schemas import AIAnalysis
+
+
+class TestSummaryFromRaw:
+    @pytest.mark.parametrize(
+        "raw",
+        [
+            None,
+            {},
+            "not a dict",
+            {"summary": "current schema"},
+            {"summary": "", "document_analysis": {"summary": "fallback"}},
+            {"document_analysis": {"summary": "pre-versioning"}},
+            {"schema_version": 1, "document_analysis": {"summary": "nested"}},
+            {"summary": "top", "document_analysis": {"summary": "nested"}},
+            {"document_analysis": {"title": "no summary"}},
+            {
+                "summary": "with mappings",
+                "keyword_mappings": [
+                    {"verbatim_term": "tax", "mapped_canonical_term": "Taxes"}
+                ],
+            },
+        ],
+    )
+    def test_matches_full_validation(self, raw):
+        assert AIAnalysis.summary_from_raw(raw) == AIAnalysis.from_raw(
+            raw
+        ).get_summary()
@@ -0,0 +1,136 @@
+"""
+Tests for SearchService's keyword mapping search and statistics.
+
+Expressions are compiled against the Postgres dialect and statistics run
+against a mocked Session; no database is involved (see test_worker_recovery.py
+for why the Document model can't run on SQLite).
+"""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from services.search_service import SearchService, _keyword_mapping_match
+
+
+def compile_match(term, fields=("verbatim_term",)):
+    return _keyword_mapping_match(term, fields).compile(dialect=postgresql.dialect())
+
+
+class TestKeywordMappingMatch:
+    def test_plain_term_adds_indexed_like_prefilter(self):
+        compiled = compile_match("Healthcare")
+
+        sql = str(compiled)
+        assert sql.startswith("lower(CAST(jsonb_path_query_array(documents.keywords")
+        assert "'$.keyword_mappings[*].mapped_canonical_term'" in sql
+        assert "jsonb_path_exists" in sql
+        assert compiled.params["lower_1"] == "%healthcare%"
+
+    def test_like_wildcards_in_term_are_escaped(self):
+        compiled = compile_match("tax_cut 100%")
+
+        assert compiled.params["lower_1"] == "%tax\\_cut 100\\%%"
+
+    def test_terms_json_would_escape_skip_the_prefilter(self):
+        for term in ('say "hi"', "café", "ab"):
+            sql = str(compile_match(term))
+
+            assert sql.startswith("jsonb_path_exists"), term
+            assert "LIKE" not in sql, term
+
+
+class TestMappingStatistics:
+    def test_all_statistics_come_from_one_statement(self):
+        row = MagicMock(
+            docs_with_keywords=4,
+            total_mappings=10,
+            unique_verbatim_terms=7,
+            unique_canonical_terms=5,
+            top_canonical_terms=[{"term": "Taxes", "count": 6}],
+            primary_category_counts=[
+                {"category": "Policy", "count": 8},
+                {"category": None, "count": 2},
+            ],
+        )
+        service = SearchService.__new__(SearchService)
+        service.db = MagicMock()
+        service.db.execute.return_value.one.return_value = row
+
+        stats = asyncio.run(service.get_mapping_statistics())
+
+        service.db.execute.assert_called_once()
+        service.db.query.assert_not_called()
+        assert stats == {
+            "total_documents_with_mappings": 4,
+            "total_keyword_mappings": 10,
+            "average_mappings_per_document": 2.5,
+            "unique_verbatim_terms": 7,
+            "unique_canonical_terms": 5,
+            "top_canonical_terms": [{"term": "Taxes", "count": 6}],
+            "primary_category_distribution": {"Policy": 8, None: 2},
+        }
+
+
+class TestBlockingQueries:
+    def test_top_queries_run_off_the_event_loop_thread(self):
+        loop_thread = threading.get_ident()
+        query_threads = []
+
+        def execute(*args, **kwargs):
+            query_threads.append(threading.get_ident())
+            result = MagicMock()
+            result.fetchall.return_value = [("taxes", 3)]
+            return result
+
+        service = SearchService.__new__(SearchService)
+        service.db = MagicMock()
+        service.db.execute.side_effect = execute
+        service.redis_client = None
+
+        top = asyncio.run(service.get_top_queries(limit=1))
+
+        assert top == [{"query": "taxes", "count": 3}]
+        assert query_threads and loop_thread not in query_threads
+
+
+class TestSearchByCanonicalTerm:
+    def test_delegates_to_search_without_facets(self):
+        service = SearchService.__new__(SearchService)
+        calls = []
+
+        async def search(**kwargs):
+            calls.append(kwargs)
+            return {"documents": [{"id": 1}]}
+
+        service.search = search
+
+        documents = asyncio.run(service.search_by_canonical_term("Taxes", limit=5))
+
+        assert documents == [{"id": 1}]
+        assert calls == [
+            {
+                "query": "",
+                "canonical_term": "Taxes",
+                "per_page": 5,
+                "include_facets": False,
+            }
+        ]
+
+
+class TestFacetCache:
+    def test_facets_are_cached_under_the_version_with_a_short_ttl(self):
+        service = SearchService.__new__(SearchService)
+        service.redis_client = MagicMock()
+        service.redis_client.get.return_value = None
+        service._facet_version = lambda: "4:1700000000.0"
+        service._query_facets = lambda: ([("Policy", 3)], [], [])
+
+        facets = asyncio.run(service._generate_enhanced_facets())
+
+        assert facets["primary_categories"] == [{"name": "Policy", "count": 3}]
+        args, kwargs = service.redis_client.set.call_args
+        assert args[0] == "facets:enhanced:4:1700000000.0"
+        assert kwargs["ex"] == 300
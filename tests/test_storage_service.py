@@ -0,0 +1,81 @@
+"""
+Tests for StorageService presigned URL reuse and local file staging.
+
+The S3 client is a MagicMock, so no bucket or credentials are needed.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.storage_service import StorageService
+
+
+@pytest.fixture
+def service():
+    StorageService._presigned_url_cache.clear()
+    service = StorageService.__new__(StorageService)
+    service.storage_type = "s3"
+    service.s3_client = MagicMock()
+    service.s3_client.generate_presigned_url.side_effect = (
+        lambda *args, **kwargs: f"https://signed/{kwargs['Params']['Key']}"
+    )
+    yield service
+    StorageService._presigned_url_cache.clear()
+
+
+class TestPresignedUrlCache:
+    def test_repeated_requests_sign_once(self, service):
+        first = service._get_s3_presigned_url("a.pdf", 3600, "application/pdf")
+        second = service._get_s3_presigned_url("a.pdf", 3600, "application/pdf")
+
+        assert first == second == "https://signed/a.pdf"
+        assert service.s3_client.generate_presigned_url.call_count == 1
+
+    def test_different_content_type_is_signed_separately(self, service):
+        service._get_s3_presigned_url("a.pdf", 3600, "application/pdf")
+        service._get_s3_presigned_url("a.pdf", 3600, None)
+
+        assert service.s3_client.generate_presigned_url.call_count == 2
+
+    def test_url_past_half_its_lifetime_is_resigned(self, service):
+        service._get_s3_presigned_url("a.pdf", 3600)
+        url, expires_at = StorageService._presigned_url_cache[("a.pdf", 3600, None)]
+        StorageService._presigned_url_cache[("a.pdf", 3600, None)] = (
+            url,
+            expires_at - 1801,
+        )
+
+        service._get_s3_presigned_url("a.pdf", 3600)
+
+        assert service.s3_client.generate_presigned_url.call_count == 2
+
+
+class TestLocalFileSync:
+    def test_download_connection_error_yields_none(self, service):
+        from botocore.exceptions import EndpointConnectionError
+
+        service.s3_client.download_fileobj.side_effect = EndpointConnectionError(
+            endpoint_url="https://s3.example"
+        )
+
+        with service.local_file_sync("a.pdf") as local_path:
+            assert local_path is None
+
+    def test_temp_file_failure_yields_none(self, service, monkeypatch):
+        import tempfile
+
+        def no_space(*args, **kwargs):
+            raise OSError("No space left on device")
+
+        monkeypatch.setattr(tempfile, "NamedTemporaryFile", no_space)
+
+        with service.local_file_sync("a.pdf") as local_path:
+            assert local_path is None
+        service.s3_client.download_fileobj.assert_not_called()
+
+    def test_errors_inside_the_block_still_propagate(self, service):
+        with pytest.raises(ValueError):
+            with service.local_file_sync("a.pdf") as local_path:
+                assert local_path
+                raise ValueError("render failed")
@@ -0,0 +1,82 @@
+"""
+Tests for TaxonomyService category counts and hierarchy.
+
+Runs against a mocked SQLAlchemy Session (see test_dashboard_service.py).
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+from services.taxonomy_service import TaxonomyService
+
+
+def make_service(group_rows):
+    db = MagicMock()
+    db.query.return_value.group_by.return_value.all.return_value = group_rows
+    db.query.return_value.filter.return_value.group_by.return_value.all.return_value = (
+        group_rows
+    )
+    db.query.return_value.count.return_value = 7
+    return TaxonomyService(db)
+
+
+class TestCategoryCounts:
+    def test_primary_categories_come_from_one_grouped_query(self):
+        service = make_service([("Policy", 3), ("Candidate", 4)])
+
+        categories = asyncio.run(service.get_primary_categories())
+
+        assert categories == [
+            {"name": "Candidate", "count": 4},
+            {"name": "Policy", "count": 3},
+        ]
+        assert service.db.query.call_count == 1
+
+    def test_subcategories_come_from_one_grouped_query(self):
+        service = make_service([("Taxes", 2), ("Healthcare", 5)])
+
+        subcategories = asyncio.run(service.get_subcategories("Policy"))
+
+        assert subcategories == [
+            {"name": "Healthcare", "count": 5},
+            {"name": "Taxes", "count": 2},
+        ]
+        assert service.db.query.call_count == 1
+
+    def test_statistics_breakdown_and_category_total_share_one_query(self):
+        service = make_service([("Policy", 3), ("Candidate", 4)])
+
+        stats = asyncio.run(service.get_statistics())
+
+        assert stats["category_breakdown"] == {"Policy": 3, "Candidate": 4}
+        assert stats["total_categories"] == 2
+        # total_terms, total_synonyms and the grouped breakdown
+        assert service.db.query.call_count == 3
+
+
+class TestTaxonomyHierarchy:
+    def test_hierarchy_groups_subcategories_from_one_query(self):
+        db = MagicMock()
+        db.query.return_value.order_by.return_value.all.return_value = [
+            (1, "Policy", "Healthcare", "Medicare", "desc a"),
+            (2, "Policy", "Healthcare", "Medicaid", None),
+            (3, "Policy", None, "Budget", None),
+            (4, "Candidate", "Biography", "Veteran", None),
+        ]
+        service = TaxonomyService(db)
+
+        hierarchy = asyncio.run(service.get_taxonomy_hierarchy())
+
+        assert hierarchy == {
+            "Policy": {
+                "Healthcare": [
+                    {"id": 1, "term": "Medicare", "description": "desc a"},
+                    {"id": 2, "term": "Medicaid", "description": None},
+                ],
+                "General": [{"id": 3, "term": "Budget", "description": None}],
+            },
+            "Candidate": {
+                "Biography": [{"id": 4, "term": "Veteran", "description": None}],
+            },
+        }
+        assert db.query.call_count == 1
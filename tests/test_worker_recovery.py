@@ -44,14 +44,18 @@ class TestRescueZombieDocuments:
 
         db = MagicMock()
         db.query.return_value.filter.return_value.all.return_value = [zombie]
+        db.execute.return_value.rowcount = 1
 
         service = SchedulerService(db)
         rescued = service._rescue_zombie_documents()
 
         assert rescued == 1
-        assert zombie.status == DocumentStatus.QUEUED
-        assert zombie.processing_heartbeat_at is None
-        assert "zombie" in zombie.processing_error.lower()
+        db.execute.assert_called_once()
+        params = db.execute.call_args[0][0].compile().params
+        assert params["id_1"] == [1]
+        assert params["status"] == DocumentStatus.QUEUED
+        assert params["processing_heartbeat_at"] is None
+        assert "zombie" in params["processing_error"].lower()
         db.commit.assert_called_once()
 
     def test_noop_when_no_zombies_found(self):
@@ -70,14 +74,33 @@ class TestRescueZombieDocuments:
 
         db = MagicMock()
         db.query.return_value.filter.return_value.all.return_value = zombies
+        db.execute.return_value.rowcount = 3
 
         service = SchedulerService(db)
         rescued = service._rescue_zombie_documents()
 
         assert rescued == 3
-        assert all(z.status == DocumentStatus.QUEUED for z in zombies)
+        # All zombies are reset by one UPDATE ... WHERE id IN (...)
+        db.execute.assert_called_once()
+        params = db.execute.call_args[0][0].compile().params
+        assert params["id_1"] == [1, 2, 3]
+        assert params["status"] == DocumentStatus.QUEUED
         db.commit.assert_called_once()
 
+    def test_failed_reset_reports_zero_rescued(self):
+        stale = datetime.now(timezone.utc) - timedelta(seconds=ZOMBIE_THRESHOLD_SECONDS + 5)
+        zombies = [make_fake_document(id=i, processing_heartbeat_at=stale) for i in (1, 2)]
+
+        db = MagicMock()
+        db.query.return_value.filter.return_value.all.return_value = zombies
+        db.execute.side_effect = Exception("deadlock detected")
+
+        service = SchedulerService(db)
+        rescued = service._rescue_zombie_documents()
+
+        assert rescued == 0
+        db.rollback.assert_called_once()
+
 
 class TestEnqueuePendingDocuments:
     def test_throttle_blocks_enqueue_when_slots_full(self, monkeypatch):
@@ -96,17 +119,19 @@ class TestEnqueuePendingDocuments:
 
         service.enqueue_pending_documents()
 
-        # Should never get as far as querying/dispatching QUEUED documents.
-        db.query.return_value.filter.return_value.order_by.assert_not_called()
+        # Should never get as far as claiming/dispatching QUEUED documents.
+        db.execute.assert_not_called()
 
     def test_enqueues_available_slots_oldest_first(self, monkeypatch):
         db = MagicMock()
-        # First call chain: count() of PROCESSING docs -> 0 (no throttle).
+        # count() of PROCESSING docs -> 0 (no throttle).
         db.query.return_value.filter.return_value.count.return_value = 0
-        queued_docs = [make_fake_document(id=10), make_fake_document(id=11)]
-        db.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = (
-            queued_docs
-        )
+        now = datetime.now(timezone.utc)
+        # RETURNING rows come back in no particular order.
+        db.execute.return_value.all.return_value = [
+            (11, now),
+            (10, now - timedelta(minutes=5)),
+        ]
 
         import services.scheduler_service as scheduler_module
         monkeypatch.setattr(scheduler_module, "settings", Mock(max_concurrent_document_processing=3))
@@ -121,8 +146,30 @@ class TestEnqueuePendingDocuments:
 
         assert fake_task.delay.call_count == 2
         fake_task.delay.assert_has_calls([call(10), call(11)], any_order=False)
-        for doc in queued_docs:
-            assert doc.status == DocumentStatus.PENDING
+        db.commit.assert_called_once()
+
+    def test_claims_queued_documents_in_one_skip_locked_update(self, monkeypatch):
+        from sqlalchemy.dialects import postgresql
+
+        db = MagicMock()
+        db.query.return_value.filter.return_value.count.return_value = 1
+        db.execute.return_value.all.return_value = []
+
+        import services.scheduler_service as scheduler_module
+        monkeypatch.setattr(scheduler_module, "settings", Mock(max_concurrent_document_processing=3))
+
+        service = SchedulerService(db)
+        service._rescue_zombie_documents = Mock(return_value=0)
+        service.enqueue_pending_documents()
+
+        db.execute.assert_called_once()
+        compiled = db.execute.call_args[0][0].compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+        assert sql.startswith("UPDATE documents SET status=")
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "RETURNING documents.id" in sql
+        assert compiled.params["status"] == DocumentStatus.PENDING
+        assert compiled.params["param_1"] == 2  # 3 slots - 1 processing
 
 
 class TestEmitHeartbeat:
@@ -152,7 +199,7 @@ class TestEmitHeartbeat:
 
 
 class TestPdfCheckpointResume:
-    def test_resumes_from_checkpoint_and_skips_already_processed_pages(self, monkeypatch):
+    def test_resumes_from_checkpoint_and_skips_already_processed_pages(self):
         import worker
 
         document = Mock()
@@ -177,13 +224,6 @@ class TestPdfCheckpointResume:
         document_service = Mock()
 
         db = MagicMock()
-        checkpoint_doc = Mock()
-        db.get.return_value = checkpoint_doc
-
-        heartbeat_calls = []
-        monkeypatch.setattr(
-            worker, "_emit_heartbeat", lambda doc_id, db: heartbeat_calls.append(doc_id)
-        )
 
         worker._process_pdf_document_by_page(
             document_id=99,
@@ -200,11 +240,15 @@ class TestPdfCheckpointResume:
         analyzed_page_text = ai_service.analyze_text_chunk_sync.call_args[0][0]
         assert analyzed_page_text == "page three text"
 
-        # Heartbeat should only fire for the page actually processed.
-        assert heartbeat_calls == [99]
+        # Heartbeat and checkpoint should only be written for the page actually
+        # processed, together with its progress update in a single call.
+        document_service.update_document_bulk_sync.assert_called_once()
+        args, kwargs = document_service.update_document_bulk_sync.call_args
+        assert args == (99,)
+        assert "processing_heartbeat_at" in kwargs
 
         # Checkpoint should advance to the last processed page.
-        checkpoint_doc.set_metadata.assert_called_once_with(processing_checkpoint=3)
+        assert kwargs["metadata"] == {"processing_checkpoint": 3}
 
         # Final persisted text/analysis should not include the skipped pages.
         _, kwargs = document_service.update_document_content_sync.call_args
@@ -1,6 +1,7 @@
 import os
 import redis
 from celery import Celery
+from celery.signals import worker_ready
 from config import get_settings
 from services.document_service import DocumentService
 from services.ai_service import AIService
@@ -61,7 +62,8 @@ def _release_processing_lock(document_id: int, redis_client) -> None:
 def _emit_heartbeat(document_id: int, db) -> None:
     """
     Update processing_heartbeat_at to signal the worker is still alive.
-    Called at task start and periodically during long PDF processing runs.
+    Called at task start; during long PDF runs the periodic heartbeat rides
+    along with the per-page progress update instead.
     The scheduler uses this timestamp to detect zombie PROCESSING documents.
     """
     try:
@@ -88,9 +90,11 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    # Preview rendering is CPU-bound; keep it off the document processing queue.
+    task_routes={"generate_preview_task": {"queue": "previews"}},
     beat_schedule={
         "enqueue-documents-every-two-minutes": {
-            "task": "worker.enqueue_documents_task",
+            "task": "enqueue_documents_task",
             "schedule": 120.0,  # 2 minutes
         },
     },
@@ -176,34 +180,24 @@ def _process_pdf_document_by_page(
             if summary:
                 page_summaries.append(summary)
 
-        # --- FIX-001: Emit heartbeat every N pages so the scheduler knows we're alive ---
-        if db and page_num % HEARTBEAT_INTERVAL_PAGES == 0:
-            _emit_heartbeat(document_id, db)
-
-        # --- FIX-002: Persist checkpoint so a retry can resume from here ---
-        # Use read-modify-write (not a raw SQL || operator) so SQLAlchemy correctly
-        # handles the JSONB dict serialisation without a manual CAST.
+        # Progress, heartbeat (FIX-001) and checkpoint (FIX-002) go out as one
+        # UPDATE/commit per page rather than three separate transactions.
+        page_fields: Dict[str, Any] = {}
         if db:
-            try:
-                from models.document import Document as _Document
-                _doc = db.get(_Document, document_id)
-                if _doc is not None:
-                    _doc.set_metadata(processing_checkpoint=page_num)
-                    db.commit()
-            except Exception as cp_err:
-                logger.warning(f"Checkpoint write failed for page {page_num}: {cp_err}")
-                try:
-                    db.rollback()
-                except Exception:
-                    pass
-
-        document_service.update_document_status_sync(
-            document_id, DocumentStatus.PROCESSING, progress=50
+            # --- FIX-002: Persist checkpoint so a retry can resume from here ---
+            page_fields["metadata"] = {"processing_checkpoint": page_num}
+            # --- FIX-001: Emit heartbeat every N pages so the scheduler knows we're alive ---
+            if page_num % HEARTBEAT_INTERVAL_PAGES == 0:
+                page_fields["processing_heartbeat_at"] = datetime.now(timezone.utc)
+
+        document_service.update_document_bulk_sync(
+            document_id, progress=50, **page_fields
         )
 
     # Consolidate results
-    final_keywords = list(set(aggregated_results["keywords"]))
-    final_categories = list(set(aggregated_results["categories"]))
+    # Dedupe in first-seen page order; list(set(...)) order varied per process
+    final_keywords = list(dict.fromkeys(aggregated_results["keywords"]))
+    final_categories = list(dict.fromkeys(aggregated_results["categories"]))
     final_mappings = aggregated_results["mappings"]
     final_summary = "\n".join(page_summaries)
     final_extracted_text = "\n\n".join(full_extracted_text)
@@ -309,6 +303,44 @@ def enqueue_documents_task():
             db.close()
 
 
+@worker_ready.connect
+def _log_imaging_build(**kwargs):
+    """Log which Pillow build renders previews, to confirm SIMD codecs are present."""
+    try:
+        import PIL
+        from PIL import features
+
+        logger.info(
+            f"Preview imaging: Pillow {PIL.__version__}, "
+            f"libjpeg-turbo={features.check_feature('libjpeg_turbo')}, "
+            f"zlib={features.check('zlib')}"
+        )
+    except Exception as e:
+        logger.warning(f"Could not inspect Pillow build: {e}")
+
+
+@celery_app.task(name="generate_preview_task")
+def generate_preview_task(original_file_path: str):
+    """
+    Celery task to render and store a document preview requested by the API.
+    """
+    try:
+        preview_service = PreviewService(StorageService())
+        # Polls can deliver the same request more than once; an existing
+        # preview makes the repeat a no-op instead of a full re-render
+        preview_path = preview_service.generate_preview_sync(
+            original_file_path, overwrite=False
+        )
+        if preview_path:
+            logger.info(f"Preview available at: {preview_path}")
+        else:
+            logger.warning(f"Failed to generate preview for {original_file_path}")
+        return preview_path
+    except Exception as e:
+        logger.error(f"Error in generate_preview_task for {original_file_path}: {e}")
+        return None
+
+
 @celery_app.task(
     name="process_document_task",
     bind=True,